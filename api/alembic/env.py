@@ -6,6 +6,7 @@ from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 import babytroc.domains  # noqa: F401 — registers all domain models with SQLAlchemy metadata
+import babytroc.infrastructure.event_outbox  # noqa: F401 — registers the event outbox
 from alembic import context
 from babytroc.infrastructure.config import DatabaseConfig
 from babytroc.shared.models import Base
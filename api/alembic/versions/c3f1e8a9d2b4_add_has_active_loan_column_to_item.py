@@ -0,0 +1,111 @@
+"""add has_active_loan column to item
+
+Materializes the former `has_active_loan` subquery over `loan`. The column is
+kept in sync by a trigger on `loan`, so that the cascading deletes of loans
+are covered as well.
+
+Revision ID: c3f1e8a9d2b4
+Revises: 6ad2aafcd197
+Create Date: 2026-10-18 10:12:43.518204
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f1e8a9d2b4"
+down_revision: str | None = "6ad2aafcd197"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "item",
+        sa.Column(
+            "has_active_loan",
+            sa.Boolean(),
+            server_default="false",
+            nullable=False,
+        ),
+    )
+
+    # --- backfill ---
+    op.execute(
+        text(
+            "UPDATE item SET has_active_loan = true "
+            "WHERE EXISTS ("
+            "    SELECT 1 FROM loan "
+            "    WHERE loan.item_id = item.id AND upper(loan.during) IS NULL"
+            ")"
+        )
+    )
+
+    # --- keep has_active_loan in sync with loans ---
+    op.execute(
+        text(
+            "CREATE OR REPLACE FUNCTION refresh_item_has_active_loan("
+            "    target_item_id INTEGER"
+            ") "
+            "RETURNS VOID AS $$ "
+            "    UPDATE item SET has_active_loan = NOT has_active_loan "
+            "    WHERE item.id = target_item_id "
+            "    AND has_active_loan <> EXISTS ("
+            "        SELECT 1 FROM loan "
+            "        WHERE loan.item_id = target_item_id "
+            "        AND upper(loan.during) IS NULL"
+            "    ); "
+            "$$ LANGUAGE sql;"
+        )
+    )
+
+    op.execute(
+        text(
+            "CREATE OR REPLACE FUNCTION update_item_has_active_loan() "
+            "RETURNS TRIGGER AS $$ "
+            "BEGIN "
+            "    IF TG_OP <> 'INSERT' THEN "
+            "        PERFORM refresh_item_has_active_loan(OLD.item_id); "
+            "    END IF; "
+            "    IF TG_OP <> 'DELETE' THEN "
+            "        PERFORM refresh_item_has_active_loan(NEW.item_id); "
+            "    END IF; "
+            "    RETURN NULL; "
+            "END; "
+            "$$ LANGUAGE plpgsql;"
+        )
+    )
+
+    op.execute(
+        text(
+            "CREATE OR REPLACE TRIGGER update_item_has_active_loan "
+            "AFTER INSERT OR DELETE OR UPDATE OF item_id, during ON loan "
+            "FOR EACH ROW "
+            "EXECUTE FUNCTION update_item_has_active_loan();"
+        )
+    )
+
+    # --- available items ---
+    op.create_index(
+        "idx_item_available",
+        "item",
+        ["id"],
+        unique=False,
+        postgresql_where=text("NOT has_active_loan AND NOT blocked"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "idx_item_available",
+        table_name="item",
+        postgresql_where=text("NOT has_active_loan AND NOT blocked"),
+    )
+    op.execute(text("DROP TRIGGER IF EXISTS update_item_has_active_loan ON loan"))
+    op.execute(text("DROP FUNCTION IF EXISTS update_item_has_active_loan"))
+    op.execute(text("DROP FUNCTION IF EXISTS refresh_item_has_active_loan"))
+    op.drop_column("item", "has_active_loan")
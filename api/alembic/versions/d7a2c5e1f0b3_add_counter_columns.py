@@ -0,0 +1,65 @@
+"""add likes and items counter columns
+
+Revision ID: d7a2c5e1f0b3
+Revises: c3f1e8a9d2b4
+Create Date: 2026-10-18 11:04:27.906314
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy import text
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7a2c5e1f0b3"
+down_revision: str | None = "c3f1e8a9d2b4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "item",
+        sa.Column("likes_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "user",
+        sa.Column("items_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "user",
+        sa.Column("likes_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    # --- backfill ---
+    op.execute(
+        text(
+            "UPDATE item SET likes_count = counts.likes_count "
+            "FROM ("
+            "    SELECT item_id, count(*) AS likes_count "
+            "    FROM item_like GROUP BY item_id"
+            ") AS counts "
+            "WHERE item.id = counts.item_id"
+        )
+    )
+    op.execute(
+        text(
+            'UPDATE "user" SET '
+            "    items_count = counts.items_count, "
+            "    likes_count = counts.likes_count "
+            "FROM ("
+            "    SELECT owner_id, count(*) AS items_count, "
+            "    sum(likes_count) AS likes_count "
+            "    FROM item GROUP BY owner_id"
+            ") AS counts "
+            'WHERE "user".id = counts.owner_id'
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("user", "likes_count")
+    op.drop_column("user", "items_count")
+    op.drop_column("item", "likes_count")
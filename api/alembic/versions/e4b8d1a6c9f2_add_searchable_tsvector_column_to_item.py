@@ -0,0 +1,50 @@
+"""add searchable_tsvector column to item
+
+Revision ID: e4b8d1a6c9f2
+Revises: d7a2c5e1f0b3
+Create Date: 2026-10-18 13:26:51.447120
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b8d1a6c9f2"
+down_revision: str | None = "d7a2c5e1f0b3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "item",
+        sa.Column(
+            "searchable_tsvector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('french'::regconfig, "
+                "normalize_text(name || ' ' || description))",
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "idx_item_searchable_tsvector",
+        "item",
+        ["searchable_tsvector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "idx_item_searchable_tsvector",
+        table_name="item",
+        postgresql_using="gin",
+    )
+    op.drop_column("item", "searchable_tsvector")
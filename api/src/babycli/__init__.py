@@ -1,10 +1,12 @@
 from cyclopts import App
 
+from .bench import bench_app
 from .cache import cache_app
 from .check import check_app
 from .config import config_app
 from .danger import danger_mode_app
 from .db import db_app
+from .images import images_app
 from .lint import lint_app
 from .logs import logs_app
 from .server import server_app
@@ -17,11 +19,13 @@ app = App(
     help="Babytroc API operations CLI.",
 )
 
+app.command(bench_app)
 app.command(cache_app)
 app.command(check_app)
 app.command(config_app)
 app.command(danger_mode_app)
 app.command(db_app)
+app.command(images_app)
 app.command(lint_app)
 app.command(logs_app)
 app.command(server_app)
@@ -0,0 +1,1077 @@
+# babycli/bench.py
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from collections.abc import AsyncGenerator, Sequence
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Any, NamedTuple
+from uuid import uuid4
+
+from cyclopts import App, Parameter
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ._utils import async_db_session, console_err, console_ok
+
+if TYPE_CHECKING:
+    from httpx import AsyncClient
+    from redis.asyncio import Redis
+
+    from babytroc.domains.item.schemas.query import (
+        ItemMatchingWordsQueryPageCursor,
+        ItemQueryPageCursor,
+        ItemReadQueryFilter,
+    )
+    from babytroc.infrastructure.config import Config
+
+bench_app = App(
+    name="bench",
+    help="Performance benchmarks.",
+)
+
+# number of items inserted per statement when building a catalogue
+CATALOGUE_BATCH_SIZE = 1000
+
+# number of distinct words, taken from generated item names, used in queries
+QUERY_WORDS_COUNT = 500
+
+# plan nodes reading rows from a relation
+_SCAN_NODE_TYPES = {
+    "Seq Scan",
+    "Index Scan",
+    "Index Only Scan",
+    "Bitmap Heap Scan",
+}
+
+
+class SearchScenario(NamedTuple):
+    """A kind of `list_items` query, measured at a given pagination depth."""
+
+    name: str
+    words: bool
+    regions: bool = False
+    categories: bool = False
+    age: bool = False
+    depth: int = 0
+
+
+SEARCH_SCENARIOS = tuple(
+    scenario._replace(depth=depth)
+    for scenario in (
+        SearchScenario(name="browse", words=False),
+        SearchScenario(name="words", words=True),
+        SearchScenario(name="regions", words=False, regions=True),
+        SearchScenario(name="categories", words=False, categories=True),
+        SearchScenario(name="age", words=False, age=True),
+        SearchScenario(name="words+regions+age", words=True, regions=True, age=True),
+    )
+    for depth in (0, 5)
+)
+
+
+class SearchCatalogue(NamedTuple):
+    """Reference data the synthetic items are built from."""
+
+    owner_ids: list[int]
+    image_names: dict[int, str]
+    region_ids: list[int]
+    category_slugs: list[str]
+    words: list[str]
+
+
+class _StatementRecorder:
+    """Record the statements sent to the database, with their parameters."""
+
+    def __init__(self) -> None:
+        self.statements: list[tuple[str, Any]] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile `q` (between 0 and 1) of `values`."""
+
+    if not values:
+        msg = "No values"
+        raise ValueError(msg)
+
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+
+def rows_examined(plan: dict) -> int:
+    """Number of rows read from relations by an `EXPLAIN ANALYZE` plan node.
+
+    Rows discarded by a filter or an index recheck are included.
+    """
+
+    rows = 0
+
+    if plan["Node Type"] in _SCAN_NODE_TYPES:
+        rows += round(
+            (
+                plan.get("Actual Rows", 0)
+                + plan.get("Rows Removed by Filter", 0)
+                + plan.get("Rows Removed by Index Recheck", 0)
+            )
+            * plan.get("Actual Loops", 1)
+        )
+
+    return rows + sum(rows_examined(child) for child in plan.get("Plans", []))
+
+
+def explain_totals(plans: Sequence[dict]) -> tuple[int, float]:
+    """Rows examined and time (ms) of `EXPLAIN ANALYZE` results, summed.
+
+    Both the planning and the execution times are counted.
+    """
+
+    rows = sum(rows_examined(plan["Plan"]) for plan in plans)
+    duration = sum(
+        plan.get("Planning Time", 0) + plan.get("Execution Time", 0) for plan in plans
+    )
+
+    return rows, duration
+
+
+@bench_app.command(name="search")
+async def bench_search(
+    sizes: Annotated[
+        list[int],
+        Parameter(
+            name=["--sizes", "-s"],
+            help="Catalogue sizes (number of items) to measure, in increasing order.",
+        ),
+    ] = [10_000, 100_000, 1_000_000],  # noqa: B006
+    samples: Annotated[
+        int,
+        Parameter(
+            name=["--samples", "-n"],
+            help="Number of measured queries per scenario.",
+        ),
+    ] = 50,
+    page_size: Annotated[
+        int,
+        Parameter(name="--page-size", help="Number of items per page."),
+    ] = 32,
+    seed: Annotated[
+        int,
+        Parameter(name="--seed", help="Random seed, for reproducible runs."),
+    ] = 0,
+    output: Annotated[
+        Path | None,
+        Parameter(
+            name=["--output", "-o"],
+            help="JSON report file (default: stdout).",
+        ),
+    ] = None,
+):
+    """Benchmark `list_items` over synthetic catalogues.
+
+    Items are generated with the seed generators, on top of the existing users,
+    regions and categories. Everything runs in a single transaction which is
+    rolled back at the end: the database is left untouched.
+    """
+    from babytroc.infrastructure.config import DatabaseConfig
+    from babytroc.infrastructure.database import create_session_maker
+
+    if sorted(sizes) != sizes:
+        console_err("Catalogue sizes must be given in increasing order")
+        sys.exit(1)
+
+    random.seed(seed)
+
+    session_maker = create_session_maker(DatabaseConfig.from_env().url)
+
+    async with session_maker() as db:
+        try:
+            catalogue = await _prepare_catalogue(db)
+            if catalogue is None:
+                console_err("Users, regions and categories must be seeded first")
+                sys.exit(1)
+
+            results = []
+            count = 0
+            for size in sizes:
+                print(f"  Growing catalogue to {size} items", file=sys.stderr)
+                await _grow_catalogue(db, catalogue, count=size - count)
+                count = size
+
+                for scenario in SEARCH_SCENARIOS:
+                    print(
+                        f"  Measuring {scenario.name} (depth {scenario.depth})",
+                        file=sys.stderr,
+                    )
+                    result = await _measure_scenario(
+                        db,
+                        catalogue,
+                        scenario,
+                        samples=samples,
+                        page_size=page_size,
+                    )
+                    results.append({"catalogue_size": size, **result})
+
+        finally:
+            await db.rollback()
+
+    report = json.dumps(
+        {
+            "benchmark": "search",
+            "created_at": datetime.now(tz=UTC).isoformat(),
+            "parameters": {
+                "sizes": sizes,
+                "samples": samples,
+                "page_size": page_size,
+                "seed": seed,
+            },
+            "results": results,
+        },
+        indent=2,
+    )
+
+    if output is None:
+        print(report)
+    else:
+        output.write_text(report)
+        console_ok(f"Report written to {output}")
+
+
+async def _prepare_catalogue(db: AsyncSession) -> SearchCatalogue | None:
+    """Gather the reference data and create one image per owner."""
+    from babytroc.domains.category.services import list_categories
+    from babytroc.domains.item.models import ItemImage
+    from babytroc.domains.region.services import list_regions
+    from babytroc.domains.user.services import list_users
+    from babytroc.infrastructure.cache_client import NullCache
+
+    users = await list_users(db)
+    regions = await list_regions(db, NullCache())
+    categories = await list_categories(db, NullCache())
+
+    if not users or not regions or all(cat.parent_slug is None for cat in categories):
+        return None
+
+    # images are only referenced, they are not uploaded
+    image_names = {user.id: f"bench-{uuid4().hex}" for user in users}
+    await db.execute(
+        insert(ItemImage),
+        [
+            {"name": name, "owner_id": owner_id}
+            for owner_id, name in image_names.items()
+        ],
+    )
+
+    return SearchCatalogue(
+        owner_ids=list(image_names),
+        image_names=image_names,
+        region_ids=[region.id for region in regions],
+        category_slugs=[cat.slug for cat in categories if cat.parent_slug is not None],
+        words=[],
+    )
+
+
+async def _grow_catalogue(
+    db: AsyncSession,
+    catalogue: SearchCatalogue,
+    *,
+    count: int,
+) -> None:
+    """Insert `count` random items, then refresh the planner statistics."""
+    from sqlalchemy import text
+
+    from babytroc.domains.item.models import (
+        Item,
+        ItemCategoryAssociation,
+        ItemImageAssociation,
+        ItemRegionAssociation,
+    )
+    from babytroc.domains.item.services.counters import add_users_items
+
+    from .seed.items import (
+        random_item_categories,
+        random_item_description,
+        random_item_name,
+        random_item_regions,
+        random_item_targeted_age_months,
+    )
+
+    for start in range(0, count, CATALOGUE_BATCH_SIZE):
+        owner_ids = [
+            random.choice(catalogue.owner_ids)  # noqa: S311
+            for _ in range(min(CATALOGUE_BATCH_SIZE, count - start))
+        ]
+        names = [random_item_name() for _ in owner_ids]
+
+        # keep some of the generated words to query them
+        for name in names:
+            if len(catalogue.words) < QUERY_WORDS_COUNT:
+                catalogue.words.extend(name.lower().split()[:1])
+
+        res = await db.execute(
+            insert(Item).returning(Item.id, sort_by_parameter_order=True),
+            [
+                {
+                    "owner_id": owner_id,
+                    "name": name,
+                    "description": random_item_description(),
+                    "targeted_age_months": (
+                        random_item_targeted_age_months().as_sql_range
+                    ),
+                    "blocked": False,
+                }
+                for owner_id, name in zip(owner_ids, names, strict=True)
+            ],
+        )
+        item_ids = res.scalars().all()
+
+        await db.execute(
+            insert(ItemRegionAssociation),
+            [
+                {"item_id": item_id, "region_id": region_id}
+                for item_id in item_ids
+                for region_id in random_item_regions(catalogue.region_ids)
+            ],
+        )
+        await db.execute(
+            insert(ItemCategoryAssociation),
+            [
+                {"item_id": item_id, "category_slug": slug}
+                for item_id in item_ids
+                for slug in random_item_categories(catalogue.category_slugs)
+            ],
+        )
+        await db.execute(
+            insert(ItemImageAssociation),
+            [
+                {
+                    "item_id": item_id,
+                    "image_name": catalogue.image_names[owner_id],
+                    "order": 0,
+                }
+                for item_id, owner_id in zip(item_ids, owner_ids, strict=True)
+            ],
+        )
+        await add_users_items(db, owner_ids=owner_ids)
+
+    # the statistics account for the uncommitted rows of this transaction
+    await db.execute(text("ANALYZE item, item_region, item_category"))
+
+
+def _random_query(
+    catalogue: SearchCatalogue,
+    scenario: SearchScenario,
+):
+    """Random words and query filter of a `scenario` query."""
+    from babytroc.domains.item.enums import ItemQueryAvailability
+    from babytroc.domains.item.schemas.base import MonthRange
+    from babytroc.domains.item.schemas.query import ItemReadQueryFilter
+
+    words = (
+        random.sample(catalogue.words, k=random.randint(1, 2))  # noqa: S311
+        if scenario.words
+        else None
+    )
+
+    query_filter = ItemReadQueryFilter(
+        availability=ItemQueryAvailability.yes,
+        regions=(
+            random.sample(catalogue.region_ids, k=1) if scenario.regions else None
+        ),
+        categories=(
+            random.sample(catalogue.category_slugs, k=1)
+            if scenario.categories
+            else None
+        ),
+        targeted_age_months=(
+            MonthRange.from_values(
+                lower=(lower := random.randint(0, 24)),  # noqa: S311
+                upper=lower + 6,
+            )
+            if scenario.age
+            else None
+        ),
+    )
+
+    return words, query_filter
+
+
+async def _list_items_page(
+    db: AsyncSession,
+    words: list[str] | None,
+    *,
+    query_filter: "ItemReadQueryFilter",
+    limit: int,
+    cursor: "ItemQueryPageCursor | ItemMatchingWordsQueryPageCursor",
+) -> "ItemQueryPageCursor | ItemMatchingWordsQueryPageCursor | None":
+    """List the page of items at `cursor`, returning the cursor of the next one."""
+    from babytroc.domains.item.schemas.query import (
+        ItemMatchingWordsQueryPageCursor,
+        ItemQueryPageCursor,
+    )
+    from babytroc.domains.item.services import list_items
+    from babytroc.shared.pagination import QueryPageOptions
+
+    if words is None:
+        if not isinstance(cursor, ItemQueryPageCursor):
+            msg = f"Cursor is expected to be {ItemQueryPageCursor}"
+            raise TypeError(msg)
+
+        result = await list_items(
+            db,
+            query_filter=query_filter,
+            page_options=QueryPageOptions(limit=limit, cursor=cursor),
+        )
+        return result.next_page_cursor
+
+    if not isinstance(cursor, ItemMatchingWordsQueryPageCursor):
+        msg = f"Cursor is expected to be {ItemMatchingWordsQueryPageCursor}"
+        raise TypeError(msg)
+
+    words_result = await list_items(
+        db,
+        words,
+        query_filter=query_filter,
+        page_options=QueryPageOptions(limit=limit, cursor=cursor),
+    )
+    return words_result.next_page_cursor
+
+
+async def _measure_scenario(
+    db: AsyncSession,
+    catalogue: SearchCatalogue,
+    scenario: SearchScenario,
+    *,
+    samples: int,
+    page_size: int,
+) -> dict:
+    """Run `samples` random queries of `scenario` and summarize them."""
+    from babytroc.domains.item.schemas.query import (
+        ItemMatchingWordsQueryPageCursor,
+        ItemQueryPageCursor,
+    )
+
+    engine = db.get_bind()
+
+    latencies: list[float] = []
+    examined: list[int] = []
+    durations: list[float] = []
+    statements: list[int] = []
+    plans: list[dict] | None = None
+
+    for _ in range(samples):
+        words, query_filter = _random_query(catalogue, scenario)
+        cursor: ItemQueryPageCursor | ItemMatchingWordsQueryPageCursor = (
+            ItemQueryPageCursor()
+            if words is None
+            else ItemMatchingWordsQueryPageCursor()
+        )
+
+        # walk to the measured page
+        for _ in range(scenario.depth):
+            next_cursor = await _list_items_page(
+                db,
+                words,
+                query_filter=query_filter,
+                limit=page_size,
+                cursor=cursor,
+            )
+            if next_cursor is None:
+                break
+            cursor = next_cursor
+
+        recorder = _StatementRecorder()
+        event.listen(engine, "before_cursor_execute", recorder)
+        try:
+            start = time.perf_counter()
+            await _list_items_page(
+                db,
+                words,
+                query_filter=query_filter,
+                limit=page_size,
+                cursor=cursor,
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+        finally:
+            event.remove(engine, "before_cursor_execute", recorder)
+
+        # the page may take several statements, all of them are explained
+        sample_plans = [
+            await _explain(db, statement, parameters)
+            for statement, parameters in recorder.statements
+        ]
+        rows, duration = explain_totals(sample_plans)
+        examined.append(rows)
+        durations.append(duration)
+        statements.append(len(sample_plans))
+        plans = plans or sample_plans
+
+    return {
+        "scenario": scenario.name,
+        "depth": scenario.depth,
+        "samples": samples,
+        "statements": max(statements),
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": max(latencies),
+        },
+        "explain_ms": {
+            "p50": percentile(durations, 0.50),
+            "p95": percentile(durations, 0.95),
+            "max": max(durations),
+        },
+        "rows_examined": {
+            "p50": percentile(examined, 0.50),
+            "p95": percentile(examined, 0.95),
+            "max": max(examined),
+        },
+        "plans": plans,
+    }
+
+
+async def _explain(db: AsyncSession, statement: str, parameters: Any) -> dict:
+    """`EXPLAIN ANALYZE` a recorded statement."""
+
+    conn = await db.connection()
+    res = await conn.exec_driver_sql(
+        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}",
+        parameters,
+    )
+
+    plans = res.scalar_one()
+    if isinstance(plans, str):
+        plans = json.loads(plans)
+
+    return plans[0]
+
+
+class WebSocketChat(NamedTuple):
+    """A chat in which benchmark messages are sent."""
+
+    chat_id: str
+    borrower_id: int
+    owner_id: int
+
+
+@bench_app.command(name="websocket")
+async def bench_websocket(
+    sockets: Annotated[
+        int,
+        Parameter(
+            name=["--sockets", "-n"],
+            help="Number of websockets, spread over the members of the chats.",
+        ),
+    ] = 1000,
+    rate: Annotated[
+        float,
+        Parameter(name="--rate", help="Chat messages sent per second."),
+    ] = 50,
+    duration: Annotated[
+        float,
+        Parameter(name="--duration", help="Sending duration, in seconds."),
+    ] = 10,
+    drain: Annotated[
+        float,
+        Parameter(
+            name="--drain",
+            help="Time left to the deliveries after the last message, in seconds.",
+        ),
+    ] = 2,
+    url: Annotated[
+        str | None,
+        Parameter(
+            name="--url",
+            help="Base URL of a running server (default: in-process app).",
+        ),
+    ] = None,
+    redis_url: Annotated[
+        str | None,
+        Parameter(
+            name="--redis-url",
+            help="Redis used instead of the configured one, e.g. a local server.",
+        ),
+    ] = None,
+    server_pid: Annotated[
+        int | None,
+        Parameter(
+            name="--server-pid",
+            help="Process whose memory is measured, with --url.",
+        ),
+    ] = None,
+    seed: Annotated[
+        int,
+        Parameter(name="--seed", help="Random seed, for reproducible runs."),
+    ] = 0,
+    output: Annotated[
+        Path | None,
+        Parameter(
+            name=["--output", "-o"],
+            help="JSON report file (default: stdout).",
+        ),
+    ] = None,
+):
+    """Benchmark the delivery of chat messages to websockets.
+
+    Authenticated websockets are opened for the members of the existing chats,
+    then text messages are sent through the API, in random chats. The delivery
+    latency is measured from the request to the reception by each websocket.
+
+    The sent messages are persisted. Without --url, the app runs in-process and
+    the measured memory includes the clients.
+    """
+    from babytroc.infrastructure.config import Config, PubsubConfig, RedisConfig
+
+    random.seed(seed)
+
+    config = Config.from_env()
+    if redis_url is not None:
+        redis = RedisConfig.from_env(url=redis_url)
+        config = config._replace(redis=redis, pubsub=PubsubConfig(url=redis.url))
+
+    chats = await _list_websocket_chats()
+    if not chats:
+        console_err("Chats must be seeded first")
+        sys.exit(1)
+
+    async with _bench_client(config, url=url) as client:
+        result = await _measure_websocket(
+            client,
+            config,
+            chats,
+            sockets=sockets,
+            rate=rate,
+            duration=duration,
+            drain=drain,
+            pid=os.getpid() if url is None else server_pid,
+        )
+
+    report = json.dumps(
+        {
+            "benchmark": "websocket",
+            "created_at": datetime.now(tz=UTC).isoformat(),
+            "parameters": {
+                "sockets": sockets,
+                "rate": rate,
+                "duration": duration,
+                "drain": drain,
+                "url": url,
+                "seed": seed,
+            },
+            "results": result,
+        },
+        indent=2,
+    )
+
+    if output is None:
+        print(report)
+    else:
+        output.write_text(report)
+        console_ok(f"Report written to {output}")
+
+
+async def _list_websocket_chats() -> list[WebSocketChat]:
+    from sqlalchemy import select
+
+    from babytroc.domains.chat.models import Chat
+    from babytroc.domains.chat.schemas.base import ChatId
+    from babytroc.domains.item.models import Item
+
+    async with async_db_session() as db:
+        rows = await db.execute(
+            select(Chat.item_id, Chat.borrower_id, Item.owner_id).join(
+                Item, Item.id == Chat.item_id
+            )
+        )
+
+    return [
+        WebSocketChat(
+            chat_id=ChatId.from_values(item_id=item_id, borrower_id=borrower_id).root,
+            borrower_id=borrower_id,
+            owner_id=owner_id,
+        )
+        for item_id, borrower_id, owner_id in rows
+    ]
+
+
+@asynccontextmanager
+async def _bench_client(
+    config: "Config",
+    *,
+    url: str | None,
+) -> AsyncGenerator["AsyncClient"]:
+    """HTTP client to the server at `url`, or to an in-process app."""
+    from httpx import AsyncClient, Limits
+
+    if url is not None:
+        # websockets hold their connection
+        async with AsyncClient(
+            base_url=url,
+            limits=Limits(max_connections=None),
+        ) as client:
+            yield client
+        return
+
+    from asgi_lifespan import LifespanManager
+    from httpx_ws.transport import ASGIWebSocketTransport
+
+    from babytroc.app import create_app
+
+    app = create_app(config)
+    async with (
+        LifespanManager(app),
+        AsyncClient(
+            base_url=f"https://{config.host_name}{config.root_path}",
+            transport=ASGIWebSocketTransport(app=app, root_path=config.root_path),
+        ) as client,
+    ):
+        yield client
+
+
+async def _measure_websocket(
+    client: "AsyncClient",
+    config: "Config",
+    chats: list[WebSocketChat],
+    *,
+    sockets: int,
+    rate: float,
+    duration: float,
+    drain: float,
+    pid: int | None,
+) -> dict:
+    """Open `sockets` websockets, send chat messages and summarize deliveries."""
+    import redis.asyncio as redis_async
+    from httpx_ws import AsyncWebSocketSession, WebSocketDisconnect, aconnect_ws
+
+    from babytroc.domains.auth.services import create_access_token
+    from babytroc.domains.chat.schemas.websocket import (
+        WebSocketMessageNewChatMessage,
+        WebSocketMessageTypeAdapter,
+    )
+
+    members = sorted(
+        {user_id for chat in chats for user_id in (chat.borrower_id, chat.owner_id)}
+    )
+    random.shuffle(members)
+    socket_users = [members[i % len(members)] for i in range(sockets)]
+    sockets_per_user = Counter(socket_users)
+
+    # the websocket endpoint only reads the access token from the cookies
+    cookies = {
+        user_id: "Authorization=Bearer "
+        + create_access_token(user_id=user_id, validated=True, config=config.auth)
+        for user_id in members
+    }
+
+    sent: dict[int, float] = {}
+    received: list[tuple[int, float]] = []
+    expected = 0
+    errors = 0
+    disconnected = 0
+
+    async def listen(websocket) -> None:
+        nonlocal disconnected
+        try:
+            while True:
+                message = WebSocketMessageTypeAdapter.validate_json(
+                    await websocket.receive_text()
+                )
+                if isinstance(message, WebSocketMessageNewChatMessage):
+                    received.append((message.message.id, time.perf_counter()))
+        except WebSocketDisconnect:
+            disconnected += 1
+
+    async def send(chat: WebSocketChat) -> None:
+        nonlocal expected, errors
+        sender_id = random.choice((chat.borrower_id, chat.owner_id))  # noqa: S311
+        start = time.perf_counter()
+        resp = await client.post(
+            f"/v1/me/chats/{chat.chat_id}/messages",
+            json={"text": "bench"},
+            headers={"cookie": cookies[sender_id]},
+        )
+        if resp.is_error:
+            errors += 1
+            return
+        sent[resp.json()["id"]] = start
+        expected += sockets_per_user[chat.borrower_id]
+        expected += sockets_per_user[chat.owner_id]
+
+    redis = redis_async.Redis.from_url(config.pubsub.url)
+    try:
+        before = await _websocket_resources(redis, pid)
+
+        async with AsyncExitStack() as stack:
+            print(f"  Opening {sockets} websockets", file=sys.stderr)
+            start = time.perf_counter()
+            websockets: list[AsyncWebSocketSession] = [
+                await stack.enter_async_context(
+                    aconnect_ws(
+                        "/v1/me/websocket",
+                        client,
+                        headers={"cookie": cookies[user_id]},
+                    )
+                )
+                for user_id in socket_users
+            ]
+            connect_seconds = time.perf_counter() - start
+
+            listeners = [asyncio.create_task(listen(ws)) for ws in websockets]
+            await asyncio.sleep(1)
+            after = await _websocket_resources(redis, pid)
+
+            print(f"  Sending {round(rate * duration)} messages", file=sys.stderr)
+            send_start = time.perf_counter()
+            async with asyncio.TaskGroup() as task_group:
+                for i in range(round(rate * duration)):
+                    await asyncio.sleep(
+                        max(0, send_start + i / rate - time.perf_counter())
+                    )
+                    task_group.create_task(send(random.choice(chats)))  # noqa: S311
+            send_seconds = time.perf_counter() - send_start
+
+            await asyncio.sleep(drain)
+            for listener in listeners:
+                listener.cancel()
+            await asyncio.gather(*listeners, return_exceptions=True)
+
+    finally:
+        await redis.aclose()
+
+    latencies = [
+        (received_at - sent[message_id]) * 1000
+        for message_id, received_at in received
+        if message_id in sent
+    ]
+    delivery_seconds = (
+        max(received_at for _, received_at in received) - send_start
+        if received
+        else None
+    )
+
+    return {
+        "sockets": sockets,
+        "users": len(sockets_per_user),
+        "connect_seconds": connect_seconds,
+        "messages": {
+            "sent": len(sent),
+            "errors": errors,
+            "per_second": len(sent) / send_seconds,
+        },
+        "deliveries": {
+            "expected": expected,
+            "delivered": len(latencies),
+            "per_second": (
+                len(latencies) / delivery_seconds if delivery_seconds else None
+            ),
+            "disconnected_sockets": disconnected,
+        },
+        "latency_ms": (
+            {
+                "p50": percentile(latencies, 0.50),
+                "p95": percentile(latencies, 0.95),
+                "p99": percentile(latencies, 0.99),
+                "max": max(latencies),
+            }
+            if latencies
+            else None
+        ),
+        "memory": {
+            "rss_before_bytes": before["rss_bytes"],
+            "rss_after_bytes": after["rss_bytes"],
+            "per_socket_bytes": (
+                (after["rss_bytes"] - before["rss_bytes"]) / sockets
+                if before["rss_bytes"] is not None and after["rss_bytes"] is not None
+                else None
+            ),
+        },
+        "redis": {
+            "before": before["redis"],
+            "after": after["redis"],
+        },
+    }
+
+
+async def _websocket_resources(redis: "Redis", pid: int | None) -> dict:
+    """Memory of process `pid` and Redis connections."""
+
+    info = await redis.info("clients")
+
+    return {
+        "rss_bytes": rss_bytes(pid) if pid is not None else None,
+        "redis": {
+            "connected_clients": info["connected_clients"],
+            "pubsub_patterns": await redis.pubsub_numpat(),
+            "pubsub_channels": len(await redis.pubsub_channels()),
+        },
+    }
+
+
+def rss_bytes(pid: int) -> int | None:
+    """Resident memory of process `pid`, None if it cannot be read."""
+
+    try:
+        resident_pages = int(Path(f"/proc/{pid}/statm").read_text().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+@bench_app.command(name="images")
+async def bench_images(
+    corpus: Annotated[
+        Path,
+        Parameter(
+            name=["--corpus", "-c"],
+            help="Directory of images, e.g. photos taken with phones.",
+        ),
+    ],
+    repeat: Annotated[
+        int,
+        Parameter(
+            name=["--repeat", "-n"],
+            help="Number of measurements per image and decoding mode.",
+        ),
+    ] = 3,
+    output: Annotated[
+        Path | None,
+        Parameter(
+            name=["--output", "-o"],
+            help="JSON report file (default: stdout).",
+        ),
+    ] = None,
+):
+    """Benchmark the generation of the variants of uploaded images.
+
+    Each image of the corpus is processed with full-resolution decoding and with
+    draft decoding. Every measurement runs in a fresh process, with the
+    configured pixel limit, so that its peak memory is its own.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    from babytroc.infrastructure.config import ImageConfig
+    from babytroc.shared.image import configure_pillow_pixel_limit
+
+    paths = sorted(path for path in corpus.iterdir() if path.is_file())
+    if not paths:
+        console_err(f"No image found in {corpus}")
+        sys.exit(1)
+
+    loop = asyncio.get_running_loop()
+    results = []
+
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("forkserver"),
+        max_tasks_per_child=1,
+        initializer=configure_pillow_pixel_limit,
+        initargs=(ImageConfig.from_env().max_pixels,),
+    ) as executor:
+        for draft in (False, True):
+            mode = "draft" if draft else "full"
+            print(f"  Measuring {mode} decoding", file=sys.stderr)
+            measurements = [
+                await loop.run_in_executor(
+                    executor,
+                    measure_image_variants,
+                    str(path),
+                    draft,
+                )
+                for path in paths
+                for _ in range(repeat)
+            ]
+            results.append({"mode": mode, **summarize_image_variants(measurements)})
+
+    report = json.dumps(
+        {
+            "benchmark": "images",
+            "created_at": datetime.now(tz=UTC).isoformat(),
+            "parameters": {
+                "corpus": str(corpus),
+                "images": len(paths),
+                "repeat": repeat,
+            },
+            "results": results,
+        },
+        indent=2,
+    )
+
+    if output is None:
+        print(report)
+    else:
+        output.write_text(report)
+        console_ok(f"Report written to {output}")
+
+
+def measure_image_variants(path: str, draft: bool) -> dict:
+    """Generate the variants of the image at `path`, measuring CPU and memory.
+
+    Meant to run in a fresh process: the peak memory increase is the one of the
+    generation.
+    """
+    import resource
+    from io import BytesIO
+
+    from babytroc.shared.image import generate_webp_variants
+
+    data = Path(path).read_bytes()
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    wall = time.perf_counter()
+    error_name: str | None
+    try:
+        generate_webp_variants(BytesIO(data), draft=draft)
+    except Exception as error:  # noqa: BLE001
+        error_name = type(error).__name__
+    else:
+        error_name = None
+    wall = time.perf_counter() - wall
+    after = resource.getrusage(resource.RUSAGE_SELF)
+
+    return {
+        "path": path,
+        "error": error_name,
+        "wall_seconds": wall,
+        "cpu_seconds": (
+            after.ru_utime + after.ru_stime - usage.ru_utime - usage.ru_stime
+        ),
+        # kilobytes on Linux
+        "peak_rss_increase_bytes": (after.ru_maxrss - usage.ru_maxrss) * 1024,
+    }
+
+
+def summarize_image_variants(measurements: list[dict]) -> dict:
+    """Aggregate `measure_image_variants` measurements of a decoding mode."""
+
+    succeeded = [m for m in measurements if m["error"] is None]
+    errors = Counter(m["error"] for m in measurements if m["error"] is not None)
+
+    if not succeeded:
+        return {"measurements": len(measurements), "errors": dict(errors)}
+
+    cpu = [m["cpu_seconds"] for m in succeeded]
+    memory = [m["peak_rss_increase_bytes"] for m in succeeded]
+
+    return {
+        "measurements": len(measurements),
+        "errors": dict(errors),
+        "cpu_seconds": {
+            "total": sum(cpu),
+            "p50": percentile(cpu, 0.5),
+            "p95": percentile(cpu, 0.95),
+        },
+        "wall_seconds_p50": percentile([m["wall_seconds"] for m in succeeded], 0.5),
+        "peak_rss_increase_bytes": {
+            "p50": percentile(memory, 0.5),
+            "max": max(memory),
+        },
+    }
@@ -5,7 +5,13 @@ from typing import Annotated
 
 from cyclopts import App, Parameter
 
-from ._utils import confirm_prompt, console_err, console_ok, run_subprocess
+from ._utils import (
+    async_db_session,
+    confirm_prompt,
+    console_err,
+    console_ok,
+    run_subprocess,
+)
 from .danger import require_danger
 
 db_app = App(
@@ -92,6 +98,21 @@ def reset(
         console_ok("Seed data populated")
 
 
+@db_app.command(name="reconcile-counters")
+async def reconcile_counters():
+    """Recompute item likes and user items/likes counters, fixing drift."""
+    from babytroc.domains.item.services.counters import (
+        reconcile_counters as _reconcile_counters,
+    )
+
+    async with async_db_session() as db:
+        reconciled = await _reconcile_counters(db)
+
+    console_ok(
+        f"Counters reconciled ({reconciled.items} items, {reconciled.users} users)"
+    )
+
+
 @seed_app.command(name="all")
 async def seed_all(
     data_file: Annotated[
@@ -0,0 +1,96 @@
+# src/babycli/images.py
+import sys
+from typing import TYPE_CHECKING, Annotated
+
+from cyclopts import App, Parameter
+
+from ._utils import confirm_prompt, console_err, console_ok
+
+if TYPE_CHECKING:
+    from babytroc.domains.image.services.gc import ImageGarbageCollection
+
+images_app = App(
+    name="images",
+    help="Uploaded images management.",
+)
+
+
+@images_app.command(name="gc")
+async def images_gc(
+    grace_hours: Annotated[
+        float | None,
+        Parameter(
+            name="--grace-hours",
+            help="Minimum age of the collected images "
+            "(default: IMAGE_ORPHAN_GRACE_PERIOD_HOURS).",
+        ),
+    ] = None,
+    batch_size: Annotated[
+        int | None,
+        Parameter(
+            name="--batch-size",
+            help="Images per transaction (default: as many as one S3 request).",
+        ),
+    ] = None,
+    dry_run: Annotated[
+        bool,
+        Parameter(name="--dry-run", help="Only count the orphaned images."),
+    ] = False,
+    yes: Annotated[
+        bool,
+        Parameter(name=["--yes", "-y"], help="Skip confirmation prompt."),
+    ] = False,
+):
+    """Delete the uploaded images attached to no item, and their S3 objects."""
+    from datetime import timedelta
+
+    from babytroc.domains.image.services.gc import GC_BATCH_SIZE, collect_orphan_images
+    from babytroc.infrastructure.config import DatabaseConfig, ImageConfig, S3Config
+    from babytroc.infrastructure.database import create_session_maker
+    from babytroc.infrastructure.storage import create_s3_client
+
+    grace_period = (
+        ImageConfig.from_env().orphan_grace_period
+        if grace_hours is None
+        else timedelta(hours=grace_hours)
+    )
+
+    if not dry_run and not yes:
+        prompt = f"This will DELETE the images orphaned for more than {grace_period}."
+        if not confirm_prompt(f"{prompt} Continue?"):
+            print("Aborted.")
+            return
+
+    session_maker = create_session_maker(DatabaseConfig.from_env().url)
+    s3 = create_s3_client(S3Config.from_env())
+    try:
+        collection = await collect_orphan_images(
+            session_maker,
+            s3,
+            grace_period=grace_period,
+            batch_size=batch_size or GC_BATCH_SIZE,
+            dry_run=dry_run,
+        )
+    except Exception as e:  # noqa: BLE001
+        console_err(f"Image garbage collection failed — {e}")
+        sys.exit(1)
+    finally:
+        await s3.close()
+
+    print_collection_report(collection)
+
+    if collection.failed_images:
+        console_err(f"{collection.failed_images} images could not be deleted")
+        sys.exit(1)
+
+
+def print_collection_report(collection: "ImageGarbageCollection") -> None:
+    verb = "to delete" if collection.dry_run else "deleted"
+    print(f"\n  Orphaned images {verb}: {collection.images}")
+    print(f"  S3 objects {verb}:      {collection.objects}")
+    print(f"  Batches:                {collection.batches}")
+    print(f"  Duration:               {collection.duration:.2f} s")
+    print(f"  Throughput:             {collection.images_per_second:.1f} images/s")
+    print(f"                          {collection.objects_per_second:.1f} objects/s")
+    print()
+    console_ok("Dry run, nothing deleted" if collection.dry_run else "Done")
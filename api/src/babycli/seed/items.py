@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from collections.abc import Sequence
 from pathlib import Path as SyncPath
@@ -22,6 +21,9 @@ from babytroc.domains.region.services import list_regions
 from babytroc.domains.user.services import list_users
 from babytroc.infrastructure.cache_client import NullCache
 from babytroc.infrastructure.config import Config
+from babytroc.infrastructure.events import batch_events
+from babytroc.infrastructure.image_processing import ImageEngine, create_image_engine
+from babytroc.infrastructure.storage import S3Client, create_s3_client
 from babytroc.shared.image import configure_pillow_pixel_limit
 
 from .config import get_config
@@ -52,7 +54,8 @@ async def check_items(
 async def upload_image(
     db: AsyncSession,
     config: Config,
-    semaphore: asyncio.Semaphore,
+    engine: ImageEngine,
+    s3: S3Client,
     fp: Path,
     owner_id: int,
 ) -> str:
@@ -62,7 +65,8 @@ async def upload_image(
     image = await _upload_image(
         config=config,
         db=db,
-        semaphore=semaphore,
+        engine=engine,
+        s3=s3,
         owner_id=owner_id,
         data=data,
     )
@@ -133,9 +137,6 @@ async def populate_items(
 
     config = get_config()
     configure_pillow_pixel_limit(config.image.max_pixels)
-    semaphore = asyncio.Semaphore(
-        config.image.max_concurrent_processing_per_worker,
-    )
     users = await list_users(db)
     regions = await list_regions(db, _cache)
     categories = await list_categories(db, _cache)
@@ -149,37 +150,49 @@ async def populate_items(
 
     # upload images
     logger.info("Uploading all images.")
-    for user in tqdm(users, leave=False):
-        # upload images
-        logger.info("Uploading images for user %i (%s).", user.id, user.name)
-        images[user.id] = [
-            await upload_image(
+    engine = create_image_engine(
+        processes=config.image.max_concurrent_processing_per_worker,
+        queue_size=config.image.max_queued_processing_per_worker,
+        max_pixels=config.image.max_pixels,
+    )
+    s3 = create_s3_client(config.s3)
+    try:
+        for user in tqdm(users, leave=False):
+            # upload images
+            logger.info("Uploading images for user %i (%s).", user.id, user.name)
+            images[user.id] = [
+                await upload_image(
+                    db=db,
+                    config=config,
+                    engine=engine,
+                    s3=s3,
+                    fp=fp,
+                    owner_id=user.id,
+                )
+                for fp in tqdm(images_fp)
+            ]
+    finally:
+        engine.shutdown()
+        await s3.close()
+
+    # create items, coalescing their invalidations
+    logger.debug("Generating %i items", count)
+    async with batch_events():
+        for _ in tqdm(list(range(count))):
+            user = choice(users)  # noqa: S311
+
+            await create_item(
                 db=db,
-                config=config,
-                semaphore=semaphore,
-                fp=fp,
                 owner_id=user.id,
+                item_create=Item(
+                    name=random_item_name(),
+                    description=random_item_description(),
+                    images=random_item_images(images[user.id]),
+                    targeted_age_months=random_item_targeted_age_months(),
+                    regions=set(random_item_regions([reg.id for reg in regions])),
+                    categories=set(random_item_categories(child_category_slugs)),
+                    blocked=False,
+                ),
             )
-            for fp in tqdm(images_fp)
-        ]
-
-    # create items
-    logger.debug("Generating %i items", count)
-    for _ in tqdm(list(range(count))):
-        user = choice(users)  # noqa: S311
-
-        await create_item(
-            db=db,
-            owner_id=user.id,
-            item_create=Item(
-                name=random_item_name(),
-                description=random_item_description(),
-                images=random_item_images(images[user.id]),
-                targeted_age_months=random_item_targeted_age_months(),
-                regions=set(random_item_regions([reg.id for reg in regions])),
-                categories=set(random_item_categories(child_category_slugs)),
-                blocked=False,
-            ),
-        )
 
     logger.debug("Populating items: done")
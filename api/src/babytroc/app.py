@@ -1,5 +1,5 @@
 import asyncio
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 import redis.asyncio as redis_async
 from broadcaster import Broadcast
@@ -12,21 +12,41 @@ from fastapi_mail import FastMail
 from starlette.middleware.base import BaseHTTPMiddleware
 
 import babytroc.domains
+import babytroc.domains.auth.jobs
 import babytroc.domains.chat.handlers
+import babytroc.domains.image.jobs
 import babytroc.domains.item.handlers
+import babytroc.domains.item.jobs
 import babytroc.domains.loan.handlers
 import babytroc.domains.user.handlers  # noqa: F401
 from babytroc.shared.errors import ApiError
 from babytroc.shared.image import configure_pillow_pixel_limit
 
 from .infrastructure.cache import init_cache_dependency
-from .infrastructure.cache_client import RedisCache
+from .infrastructure.cache_client import Cache, RedisCache
+from .infrastructure.cache_keys import local_key_prefixes
+from .infrastructure.cache_local import LocalCache, TieredCache
+from .infrastructure.cap import create_cap_verifier
 from .infrastructure.config import Config
 from .infrastructure.database import create_session_maker, init_db_session_dependency
 from .infrastructure.email import init_email_dependency
-from .infrastructure.image_processing import init_image_processing_dependency
-from .infrastructure.pubsub import init_broadcast_dependency
+from .infrastructure.event_outbox import run_event_outbox_relay
+from .infrastructure.events import (
+    EventHandlerExecutor,
+    init_event_handler_executor_dependency,
+)
+from .infrastructure.image_processing import (
+    create_image_engine,
+    init_image_engine_dependency,
+)
+from .infrastructure.pubsub import (
+    cache_invalidation_channel,
+    init_broadcast_dependency,
+)
 from .infrastructure.redis import create_redis_client
+from .infrastructure.scheduler import JobContext, MaintenanceScheduler
+from .infrastructure.storage import create_s3_client
+from .infrastructure.websocket_hub import WebSocketHub, init_websocket_hub_dependency
 from .routers.v1 import router
 
 
@@ -34,8 +54,50 @@ from .routers.v1 import router
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     async with app.state.broadcast:
-        yield
+        websocket_listener = asyncio.create_task(app.state.websocket_hub.run())
+        cache_listener = (
+            asyncio.create_task(app.state.cache.listen_for_invalidations())
+            if isinstance(app.state.cache, TieredCache)
+            else None
+        )
+        executor = app.state.event_handler_executor
+        outbox_relay = (
+            asyncio.create_task(
+                run_event_outbox_relay(
+                    app.state.db_session_maker,
+                    executor,
+                    interval=app.state.config.events.outbox_relay_interval,
+                )
+            )
+            if executor is not None and executor.outbox_session_maker is not None
+            else None
+        )
+        scheduler = app.state.maintenance_scheduler
+        maintenance = (
+            asyncio.create_task(scheduler.run()) if scheduler is not None else None
+        )
+        try:
+            yield
+        finally:
+            for task in (outbox_relay, maintenance):
+                if task is not None:
+                    task.cancel()
+                    with suppress(asyncio.CancelledError):
+                        await task
+            # pending cache invalidations may publish through broadcast
+            if executor is not None:
+                await executor.drain()
+            websocket_listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await websocket_listener
+            if cache_listener is not None:
+                cache_listener.cancel()
+                with suppress(asyncio.CancelledError):
+                    await cache_listener
     await app.state.redis.aclose()
+    await app.state.s3_client.close()
+    await app.state.cap_verifier.close()
+    await asyncio.to_thread(app.state.image_engine.shutdown)
 
 
 class RootPathMiddleware:
@@ -74,11 +136,15 @@ def create_app(
 
     app.state.config = config
 
-    # Image processing setup
+    # Image processing setup, in a pool of processes not to hold the GIL
     configure_pillow_pixel_limit(config.image.max_pixels)
-    init_image_processing_dependency(
-        asyncio.Semaphore(config.image.max_concurrent_processing_per_worker),
+    image_engine = create_image_engine(
+        processes=config.image.max_concurrent_processing_per_worker,
+        queue_size=config.image.max_queued_processing_per_worker,
+        max_pixels=config.image.max_pixels,
     )
+    app.state.image_engine = image_engine
+    init_image_engine_dependency(image_engine)
 
     # database session maker
     pool_kwargs: dict = {}
@@ -95,6 +161,23 @@ def create_app(
     app.state.db_session_maker = db_session_maker
     init_db_session_dependency(db_session_maker)
 
+    # non-critical event handlers (e.g. cache invalidations) run after commit,
+    # off the request, optionally logged in the outbox to survive a crash
+    event_handler_executor = (
+        EventHandlerExecutor(
+            concurrency=config.events.handler_concurrency,
+            max_attempts=config.events.handler_max_attempts,
+            retry_delay=config.events.handler_retry_delay,
+            outbox_session_maker=(
+                db_session_maker if config.events.outbox_relay_interval > 0 else None
+            ),
+        )
+        if config.events.handler_concurrency > 0
+        else None
+    )
+    app.state.event_handler_executor = event_handler_executor
+    init_event_handler_executor_dependency(event_handler_executor)
+
     # broadcaster — provide a custom redis connection with socket_timeout=None
     # so the pubsub listener's blocking read() doesn't time out and crash the
     # listener task during quiet periods. redis-py defaults socket_timeout to
@@ -107,15 +190,65 @@ def create_app(
     )
     broadcast = Broadcast(backend=RedisBackend(conn=pubsub_redis))
     app.state.broadcast = broadcast
-    init_broadcast_dependency(broadcast, channel_prefix=pubsub_channel_prefix)
+    init_broadcast_dependency(
+        broadcast,
+        channel_prefix=pubsub_channel_prefix,
+        redis=pubsub_redis,
+        event_log_max_length=config.websocket.event_log_max_length,
+        event_log_ttl=config.websocket.event_log_ttl,
+    )
 
-    # redis client and cache
+    # websockets share a single pattern subscription per worker
+    websocket_hub = WebSocketHub(
+        pubsub_redis,
+        queue_size=config.websocket.queue_size,
+        send_timeout=config.websocket.send_timeout,
+    )
+    app.state.websocket_hub = websocket_hub
+    init_websocket_hub_dependency(websocket_hub)
+
+    # redis client and cache, fronted by a per-worker in-process tier whose
+    # invalidations are propagated to the other workers through broadcast
     redis_client = create_redis_client(config.redis)
     app.state.redis = redis_client
-    cache = RedisCache(redis_client)
+    cache: Cache = RedisCache(redis_client)
+    if config.cache.local_max_entries > 0:
+        cache = TieredCache(
+            cache,
+            local=LocalCache(
+                max_entries=config.cache.local_max_entries,
+                max_bytes=config.cache.local_max_bytes,
+            ),
+            local_ttl=config.cache.local_ttl,
+            local_key_prefixes=local_key_prefixes(),
+            broadcast=broadcast,
+            channel=cache_invalidation_channel(),
+        )
     app.state.cache = cache
     init_cache_dependency(cache)
 
+    # S3 client, whose connections are reused across uploads
+    s3_client = create_s3_client(config.s3)
+    app.state.s3_client = s3_client
+
+    # cap verifier, whose connections and results are reused across submissions
+    app.state.cap_verifier = create_cap_verifier(config.cap)
+
+    # periodic maintenance jobs, each run by a single worker of the cluster
+    app.state.maintenance_scheduler = (
+        MaintenanceScheduler(
+            JobContext(
+                config=config,
+                session_maker=db_session_maker,
+                redis=redis_client,
+                s3=s3_client,
+            ),
+            tick=config.maintenance.tick,
+        )
+        if config.maintenance.tick > 0
+        else None
+    )
+
     # email_client
     email_client = FastMail(
         EmailConnectionConfig(
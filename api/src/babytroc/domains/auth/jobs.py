@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+from babytroc.infrastructure.scheduler import JobContext, job
+
+
+@job(
+    "auth.purge_expired_refresh_tokens",
+    interval=lambda config: config.auth.refresh_token_purge_interval,
+)
+async def purge_expired_refresh_tokens(context: JobContext) -> dict[str, int]:
+    from babytroc.domains.auth.services import (
+        purge_expired_refresh_tokens as purge,
+    )
+
+    async with context.session_maker.begin() as db:
+        deleted = await purge(db, config=context.config.auth)
+
+    return {"deleted": deleted}
+
+
+@job(
+    "auth.purge_expired_account_password_reset_authorizations",
+    interval=timedelta(hours=1),
+)
+async def purge_expired_account_password_reset_authorizations(
+    context: JobContext,
+) -> dict[str, int]:
+    from babytroc.domains.auth.services import (
+        purge_expired_account_password_reset_authorizations as purge,
+    )
+
+    async with context.session_maker.begin() as db:
+        deleted = await purge(db, config=context.config.auth)
+
+    return {"deleted": deleted}
@@ -2,27 +2,31 @@ from .access_token import create_access_token, verify_access_token
 from .credentials import create_user_credentials, login_user, refresh_user_credentials
 from .password import verify_user_password
 from .refresh_token import (
-    clean_user_refresh_tokens,
     create_refresh_token,
     is_refresh_token_expired,
+    purge_expired_refresh_tokens,
+    revoke_refresh_token,
     verify_refresh_token,
 )
 from .reset import (
     apply_account_password_reset,
     create_account_password_reset_authrorization,
+    purge_expired_account_password_reset_authorizations,
 )
 from .validation import send_validation_email, validate_user_account
 
 __all__ = [
     "apply_account_password_reset",
-    "clean_user_refresh_tokens",
     "create_access_token",
     "create_account_password_reset_authrorization",
     "create_refresh_token",
     "create_user_credentials",
     "is_refresh_token_expired",
     "login_user",
+    "purge_expired_account_password_reset_authorizations",
+    "purge_expired_refresh_tokens",
     "refresh_user_credentials",
+    "revoke_refresh_token",
     "send_validation_email",
     "validate_user_account",
     "verify_access_token",
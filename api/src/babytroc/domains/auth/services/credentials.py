@@ -1,16 +1,16 @@
+from redis.asyncio import Redis
 from sqlalchemy import select
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from babytroc.domains.auth.errors import InvalidCredentialError
 from babytroc.domains.auth.schemas.credentials import UserCredentials
-from babytroc.domains.user.errors import UserNotFoundError
 from babytroc.domains.user.models import User
 from babytroc.infrastructure.config import AuthConfig
 
 from .access_token import create_access_token
 from .password import verify_user_password
 from .refresh_token import (
-    clean_user_refresh_tokens,
     create_refresh_token,
     verify_refresh_token,
 )
@@ -18,6 +18,7 @@ from .refresh_token import (
 
 async def login_user(
     db: AsyncSession,
+    redis: Redis,
     email: str,
     password: str,
     config: AuthConfig,
@@ -32,6 +33,7 @@ async def login_user(
 
     return await create_user_credentials(
         db=db,
+        redis=redis,
         user_id=user.id,
         validated=user.validated,
         config=config,
@@ -40,6 +42,7 @@ async def login_user(
 
 async def refresh_user_credentials(
     db: AsyncSession,
+    redis: Redis,
     refresh_token: str,
     config: AuthConfig,
 ) -> UserCredentials:
@@ -47,6 +50,7 @@ async def refresh_user_credentials(
 
     refresh_token_read = await verify_refresh_token(
         db=db,
+        redis=redis,
         token=refresh_token,
         config=config,
     )
@@ -56,10 +60,11 @@ async def refresh_user_credentials(
         user = (await db.execute(stmt)).unique().scalars().one()
 
     except NoResultFound as error:
-        raise UserNotFoundError({"id": refresh_token_read.user_id}) from error
+        raise InvalidCredentialError() from error
 
     return await create_user_credentials(
         db=db,
+        redis=redis,
         user_id=refresh_token_read.user_id,
         validated=user.validated,
         config=config,
@@ -69,6 +74,7 @@ async def refresh_user_credentials(
 
 async def create_user_credentials(
     db: AsyncSession,
+    redis: Redis,
     user_id: int,
     *,
     validated: bool,
@@ -88,7 +94,9 @@ async def create_user_credentials(
     if refresh_token is None:
         refresh_token = await create_refresh_token(
             db=db,
+            redis=redis,
             user_id=user_id,
+            config=config,
         )
 
     if access_token is None:
@@ -98,12 +106,6 @@ async def create_user_credentials(
             validated=validated,
         )
 
-    await clean_user_refresh_tokens(
-        db=db,
-        user_id=user_id,
-        config=config,
-    )
-
     return UserCredentials(
         refresh_token=refresh_token,
         access_token=access_token,
@@ -1,8 +1,10 @@
 import secrets
 from datetime import UTC, datetime
+from functools import partial
 from uuid import UUID
 
-from sqlalchemy import delete, insert, select
+from redis.asyncio import Redis
+from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -18,14 +20,27 @@ from babytroc.domains.auth.models import (
 from babytroc.domains.auth.schemas.query import AuthRefreshTokenReadQueryFilter
 from babytroc.domains.auth.schemas.read import AuthRefreshTokenRead
 from babytroc.infrastructure.config import AuthConfig
+from babytroc.infrastructure.database import after_commit
+
+from .refresh_token_store import (
+    read_stored_refresh_token,
+    revoke_stored_refresh_token,
+    store_refresh_token,
+)
 
 
 async def create_refresh_token(
     db: AsyncSession,
+    redis: Redis,
     user_id: int,
-    invalidated: bool = False,
+    *,
+    config: AuthConfig,
 ) -> str:
-    """Create a new refresh token for user with user_id."""
+    """Create a new refresh token for user with user_id.
+
+    The token is also recorded in Redis, where it is verified from, once the
+    session has committed. Until then, it is verified from the database.
+    """
 
     stmt = (
         insert(AuthRefreshToken)
@@ -34,59 +49,118 @@ async def create_refresh_token(
             user_id=user_id,
             invalidated=False,
         )
-        .returning(AuthRefreshToken.token)
+        .returning(AuthRefreshToken)
+    )
+
+    refresh_token = (await db.execute(stmt)).unique().scalars().one()
+    refresh_token_read = AuthRefreshTokenRead.model_validate(refresh_token)
+
+    after_commit(
+        db,
+        partial(
+            store_refresh_token,
+            redis,
+            refresh_token_read,
+            duration=config.refresh_token_duration,
+        ),
     )
 
-    return (await db.execute(stmt)).unique().scalars().one()
+    return refresh_token_read.token
 
 
 async def verify_refresh_token(
     db: AsyncSession,
+    redis: Redis,
     token: str,
     config: AuthConfig,
 ) -> AuthRefreshTokenRead:
     """Check if given token exist, is not invalidated and is not expired.
 
+    The token is verified from its Redis record and the revoked tokens set. The
+    database is only read if the token is not recorded in Redis, the record is
+    then restored.
+
     Raises InvalidCredentialError if token is not found, is invalidated or is expired.
 
     Returns the refresh token.
     """
 
-    refresh_token = await get_refresh_token(
-        db=db,
-        token=token,
-    )
+    refresh_token_read, revoked = await read_stored_refresh_token(redis, token)
 
-    if refresh_token.invalidated:
+    if revoked:
         raise InvalidCredentialError()
 
+    if refresh_token_read is None:
+        refresh_token = await get_refresh_token(
+            db=db,
+            token=token,
+        )
+
+        if refresh_token.invalidated:
+            raise InvalidCredentialError()
+
+        refresh_token_read = AuthRefreshTokenRead.model_validate(refresh_token)
+
+        await store_refresh_token(
+            redis,
+            refresh_token_read,
+            duration=config.refresh_token_duration,
+        )
+
     if is_refresh_token_expired(
-        token_creation_date=refresh_token.creation_date,
+        token_creation_date=refresh_token_read.creation_date,
         config=config,
     ):
         raise InvalidCredentialError()
 
-    return AuthRefreshTokenRead.model_validate(refresh_token)
+    return refresh_token_read
 
 
-async def clean_user_refresh_tokens(
+async def revoke_refresh_token(
     db: AsyncSession,
-    user_id: int,
+    redis: Redis,
+    token: str,
     *,
     config: AuthConfig,
 ) -> None:
-    """Remove all expired refresh tokens for the user with `user_id`."""
+    """Revoke `token`, effective immediately.
 
-    tokens = await list_refresh_tokens(
-        db=db,
-        query_filter=AuthRefreshTokenReadQueryFilter(
-            user_id=user_id,
-        ),
+    The token is added to the revoked tokens set in Redis, then marked as
+    invalidated in the database.
+    """
+
+    await revoke_stored_refresh_token(
+        redis,
+        token,
+        duration=config.refresh_token_duration,
+    )
+
+    stmt = (
+        update(AuthRefreshToken)
+        .where(AuthRefreshToken.token == token)
+        .values(invalidated=True)
     )
 
-    for token in tokens:
-        if is_refresh_token_expired(token.creation_date, config):
-            await delete_refresh_token(db, token.token)
+    await db.execute(stmt)
+
+
+async def purge_expired_refresh_tokens(
+    db: AsyncSession,
+    *,
+    config: AuthConfig,
+) -> int:
+    """Delete all expired refresh tokens, in a single statement.
+
+    Returns the number of deleted tokens.
+    """
+
+    stmt = delete(AuthRefreshToken).where(
+        AuthRefreshToken.creation_date < func.now() - config.refresh_token_duration
+    )
+
+    result = await db.execute(stmt)
+
+    return result.rowcount  # type: ignore[attr-defined]
 
 
 def is_refresh_token_expired(
@@ -0,0 +1,95 @@
+import hashlib
+import math
+from datetime import UTC, datetime, timedelta
+
+from redis.asyncio import Redis
+
+from babytroc.domains.auth.schemas.read import AuthRefreshTokenRead
+
+# Prefix of the keys holding "<user_id>:<creation timestamp>" by token hash.
+REFRESH_TOKEN_KEY_PREFIX = "auth:refresh_token:"  # noqa: S105
+
+# Sorted set of the hashes of revoked tokens, scored by their expiration
+# timestamp so that expired revocations can be pruned.
+REVOKED_REFRESH_TOKENS_KEY = "auth:refresh_token_revoked"
+
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _refresh_token_key(token: str) -> str:
+    return f"{REFRESH_TOKEN_KEY_PREFIX}{hash_refresh_token(token)}"
+
+
+async def store_refresh_token(
+    redis: Redis,
+    refresh_token: AuthRefreshTokenRead,
+    *,
+    duration: timedelta,
+) -> None:
+    """Record `refresh_token` in Redis until it expires.
+
+    Nothing is recorded if the token is already expired.
+    """
+
+    ttl = refresh_token.creation_date + duration - datetime.now(UTC)
+    if ttl <= timedelta(0):
+        return
+
+    await redis.set(
+        _refresh_token_key(refresh_token.token),
+        f"{refresh_token.user_id}:{refresh_token.creation_date.timestamp()}",
+        px=math.ceil(ttl.total_seconds() * 1000),
+    )
+
+
+async def read_stored_refresh_token(
+    redis: Redis,
+    token: str,
+) -> tuple[AuthRefreshTokenRead | None, bool]:
+    """Read the record of `token` and whether it is revoked, in one round trip.
+
+    The record is None if the token is unknown to Redis (expired, never
+    recorded or evicted), in which case the database is the reference.
+    """
+
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.get(_refresh_token_key(token))
+        pipe.zscore(REVOKED_REFRESH_TOKENS_KEY, hash_refresh_token(token))
+        value, revoked_score = await pipe.execute()
+
+    if value is None:
+        return None, revoked_score is not None
+
+    user_id, creation_timestamp = value.decode().split(":", 1)
+    record = AuthRefreshTokenRead(
+        token=token,
+        user_id=int(user_id),
+        creation_date=datetime.fromtimestamp(float(creation_timestamp), UTC),
+    )
+
+    return record, revoked_score is not None
+
+
+async def revoke_stored_refresh_token(
+    redis: Redis,
+    token: str,
+    *,
+    duration: timedelta,
+) -> None:
+    """Add `token` to the revoked tokens, for as long as it could be valid.
+
+    Revocations older than `duration` are pruned on the way.
+    """
+
+    now = datetime.now(UTC).timestamp()
+
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.zadd(
+            REVOKED_REFRESH_TOKENS_KEY,
+            {hash_refresh_token(token): now + duration.total_seconds()},
+        )
+        pipe.zremrangebyscore(REVOKED_REFRESH_TOKENS_KEY, "-inf", now)
+        pipe.delete(_refresh_token_key(token))
+        await pipe.execute()
@@ -2,7 +2,7 @@ from uuid import UUID
 
 from fastapi import BackgroundTasks
 from fastapi_mail import FastMail
-from sqlalchemy import delete, func, insert, update
+from sqlalchemy import delete, func, insert, or_, update
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -95,3 +95,26 @@ async def apply_account_password_reset(
         .returning(User)
     )
     (await db.execute(update_password_stmt)).unique().one()
+
+
+async def purge_expired_account_password_reset_authorizations(
+    db: AsyncSession,
+    *,
+    config: AuthConfig,
+) -> int:
+    """Delete all expired or invalidated account password reset authorizations.
+
+    Returns the number of deleted authorizations.
+    """
+
+    stmt = delete(AuthAccountPasswordResetAuthorization).where(
+        or_(
+            AuthAccountPasswordResetAuthorization.invalidated,
+            AuthAccountPasswordResetAuthorization.creation_date
+            < func.now() - config.account_password_reset_authorization_duration,
+        )
+    )
+
+    result = await db.execute(stmt)
+
+    return result.rowcount  # type: ignore[attr-defined]
@@ -15,20 +15,21 @@ async def list_categories(
 ) -> list[CategoryRead]:
     """List all categories."""
 
-    cached = await cache.get(key_categories())
-    if cached is not None:
-        return [CategoryRead.model_validate(c) for c in json.loads(cached)]
+    # concurrent misses share a single query
+    computed: list[CategoryRead] | None = None
 
-    stmt = select(Category).order_by(Category.parent_slug.nulls_first(), Category.slug)
+    async def compute() -> str:
+        nonlocal computed
+        stmt = select(Category).order_by(
+            Category.parent_slug.nulls_first(), Category.slug
+        )
+        categories = (await db.execute(stmt)).unique().scalars().all()
+        computed = [CategoryRead.model_validate(cat) for cat in categories]
+        return json.dumps([c.model_dump(mode="json") for c in computed])
 
-    categories = (await db.execute(stmt)).unique().scalars().all()
+    raw = await cache.get_or_set(key_categories(), TTL_CATEGORIES, compute)
 
-    result = [CategoryRead.model_validate(cat) for cat in categories]
+    if computed is not None:
+        return computed
 
-    await cache.set(
-        key_categories(),
-        json.dumps([c.model_dump(mode="json") for c in result]),
-        ttl=TTL_CATEGORIES,
-    )
-
-    return result
+    return [CategoryRead.model_validate(c) for c in json.loads(raw)]
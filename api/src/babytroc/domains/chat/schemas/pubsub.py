@@ -4,20 +4,29 @@ from pydantic import Field, TypeAdapter
 
 from babytroc.shared.schemas import BaseModel
 
+from .read import ChatMessageRead
+
 
 class PubsubBase(BaseModel):
-    pass
+    # id in the event log of the user, set once published
+    event_id: str | None = None
 
 
 class PubsubMessageNewChatMessage(PubsubBase):
     type: Literal["new_chat_message"] = "new_chat_message"
     chat_message_id: int
 
+    # relayed as is to the websockets, read from the database if missing
+    message: ChatMessageRead | None = None
+
 
 class PubsubMessageUpdatedChatMessage(PubsubBase):
     type: Literal["updated_chat_message"] = "updated_chat_message"
     chat_message_id: int
 
+    # relayed as is to the websockets, read from the database if missing
+    message: ChatMessageRead | None = None
+
 
 class PubsubMessageUpdatedAccountValidation(PubsubBase):
     type: Literal["updated_account_validation"] = "updated_account_validation"
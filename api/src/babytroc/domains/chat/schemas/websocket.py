@@ -8,7 +8,8 @@ from .read import ChatMessageRead
 
 
 class WebSocketMessageBase(BaseModel):
-    pass
+    # to be given as `last_event_id` when reconnecting
+    event_id: str | None = None
 
 
 class WebSocketMessageNewChatMessage(WebSocketMessageBase):
@@ -26,10 +27,17 @@ class WebsocketMessageUpdatedAccountValidation(WebSocketMessageBase):
     validated: bool
 
 
+class WebSocketMessageEventsLost(WebSocketMessageBase):
+    """Events following the given `last_event_id` cannot be replayed."""
+
+    type: Literal["events_lost"] = "events_lost"
+
+
 WebSocketMessage = (
     WebSocketMessageNewChatMessage
     | WebSocketMessageUpdatedChatMessage
     | WebsocketMessageUpdatedAccountValidation
+    | WebSocketMessageEventsLost
 )
 
 
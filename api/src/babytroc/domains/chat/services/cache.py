@@ -1,5 +1,5 @@
 from babytroc.infrastructure.cache_client import Cache
-from babytroc.infrastructure.cache_keys import key_user_chats, pattern_chat_messages
+from babytroc.infrastructure.cache_keys import key_user_chats
 
 
 async def invalidate_chat_message_sent(
@@ -9,15 +9,4 @@ async def invalidate_chat_message_sent(
     borrower_id: int,
     owner_id: int,
 ) -> None:
-    await cache.delete(key_user_chats(owner_id))
-    await cache.delete(key_user_chats(borrower_id))
-    await cache.delete_pattern(pattern_chat_messages(item_id, borrower_id))
-
-
-async def invalidate_chat_message_seen(
-    cache: Cache,
-    *,
-    item_id: int,
-    borrower_id: int,
-) -> None:
-    await cache.delete_pattern(pattern_chat_messages(item_id, borrower_id))
+    await cache.delete(key_user_chats(owner_id), key_user_chats(borrower_id))
@@ -223,7 +223,10 @@ async def send_many_chat_messages(
     broadcast = get_broadcast()
     owner_ids_by_item: dict[int, int] = {}
     for chat_msg in sent:
-        pubsub_msg = PubsubMessageNewChatMessage(chat_message_id=chat_msg.id)
+        pubsub_msg = PubsubMessageNewChatMessage(
+            chat_message_id=chat_msg.id,
+            message=chat_msg,
+        )
         owner_id = (
             await db.execute(
                 select(Item.owner_id).where(Item.id == chat_msg.item_id)
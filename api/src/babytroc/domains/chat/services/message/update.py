@@ -37,6 +37,8 @@ async def mark_message_as_seen(
         key = query_filter.key | {"id": message_id}
         raise ChatMessageNotFoundError(key) from error
 
+    result = ChatMessageRead.model_validate(message)
+
     # notify chat members
     owner_id = (
         await db.execute(
@@ -46,22 +48,10 @@ async def mark_message_as_seen(
 
     pubsub_message = PubsubMessageUpdatedChatMessage(
         chat_message_id=message.id,
+        message=result,
     )
     broadcast = get_broadcast()
     for user_id in {message.borrower_id, owner_id}:
         notify_user_after_commit(db, broadcast, user_id, pubsub_message)
 
-    result = ChatMessageRead.model_validate(message)
-
-    # Invalidate cache
-    from babytroc.domains.chat.services.cache import invalidate_chat_message_seen
-    from babytroc.infrastructure.cache import get_cache
-
-    cache = get_cache()
-    await invalidate_chat_message_seen(
-        cache,
-        item_id=message.item_id,
-        borrower_id=message.borrower_id,
-    )
-
     return result
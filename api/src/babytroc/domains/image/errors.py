@@ -56,3 +56,14 @@ class InvalidImageError(ItemImageError, BadRequestError):
 
     def __init__(self):
         super().__init__("Invalid or unreadable image file")
+
+
+class ImageProcessingBusyError(ItemImageError):
+    """Raised when the image engine is saturated and rejects the upload."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__(
+            "Image processing is busy, retry later",
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(retry_after)},
+        )
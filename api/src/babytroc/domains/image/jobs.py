@@ -0,0 +1,22 @@
+from babytroc.infrastructure.scheduler import JobContext, job
+
+
+@job("image.collect_orphan_images", interval=lambda config: config.image.gc_interval)
+async def collect_orphan_images(context: JobContext) -> dict[str, int] | None:
+    from babytroc.domains.image.services.gc import collect_orphan_images as collect
+
+    # orphan objects cannot be deleted without storage
+    if context.s3 is None:
+        return None
+
+    collection = await collect(
+        context.session_maker,
+        context.s3,
+        grace_period=context.config.image.orphan_grace_period,
+    )
+
+    return {
+        "images": collection.images,
+        "objects": collection.objects,
+        "failed_images": collection.failed_images,
+    }
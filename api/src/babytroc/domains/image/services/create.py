@@ -1,4 +1,3 @@
-import asyncio
 import uuid
 from io import BytesIO
 
@@ -9,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from babytroc.domains.image.errors import (
     ImagePixelLimitError,
+    ImageProcessingBusyError,
     ImageTooLargeError,
     InvalidImageError,
 )
@@ -17,13 +17,18 @@ from babytroc.domains.item.models.image import ItemImage
 from babytroc.domains.user.services.read import get_user
 from babytroc.infrastructure import storage
 from babytroc.infrastructure.config import Config
+from babytroc.infrastructure.image_processing import (
+    ImageEngine,
+    ImageEngineSaturatedError,
+)
 from babytroc.shared import image as image_utils
 
 
 async def upload_image(
     config: Config,
     db: AsyncSession,
-    semaphore: asyncio.Semaphore,
+    engine: ImageEngine,
+    s3: storage.S3Client,
     *,
     owner_id: int,
     data: bytes,
@@ -36,21 +41,22 @@ async def upload_image(
             limit=config.image.max_upload_bytes,
         )
 
-    async with semaphore:
-        try:
-            variants = await asyncio.to_thread(
-                image_utils.generate_webp_variants,
-                BytesIO(data),
-            )
-        except PIL.Image.DecompressionBombError as error:
-            raise ImagePixelLimitError(config.image.max_pixels) from error
-        except (PIL.UnidentifiedImageError, OSError, SyntaxError) as error:
-            raise InvalidImageError() from error
+    try:
+        variants = await engine.run(
+            image_utils.generate_webp_variants,
+            BytesIO(data),
+        )
+    except ImageEngineSaturatedError as error:
+        raise ImageProcessingBusyError() from error
+    except PIL.Image.DecompressionBombError as error:
+        raise ImagePixelLimitError(config.image.max_pixels) from error
+    except (PIL.UnidentifiedImageError, OSError, SyntaxError) as error:
+        raise InvalidImageError() from error
 
     name = uuid.uuid4().hex
 
     await storage.upload_image_variants(
-        config=config.s3,
+        s3=s3,
         name=name,
         variants=variants,
     )
@@ -0,0 +1,140 @@
+import logging
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, exists, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from babytroc.domains.item.models.image import ItemImage, ItemImageAssociation
+from babytroc.infrastructure import storage
+
+logger = logging.getLogger(__name__)
+
+# number of images collected per transaction, whose variants fit in a single
+# DeleteObjects request
+GC_BATCH_SIZE = storage.DELETE_OBJECTS_MAX_KEYS // len(storage.IMAGE_SIZES)
+
+
+@dataclass
+class ImageGarbageCollection:
+    """Outcome of a garbage collection of the orphaned images."""
+
+    dry_run: bool
+    batches: int = 0
+    images: int = 0
+    objects: int = 0
+    failed_images: int = 0
+    duration: float = 0
+
+    @property
+    def images_per_second(self) -> float:
+        return self.images / self.duration if self.duration else 0
+
+    @property
+    def objects_per_second(self) -> float:
+        return self.objects / self.duration if self.duration else 0
+
+
+async def list_orphan_images(
+    db: AsyncSession,
+    *,
+    created_before: datetime,
+    after: str | None = None,
+    limit: int = GC_BATCH_SIZE,
+    lock: bool = False,
+) -> list[str]:
+    """Names of the images attached to no item and created before `created_before`.
+
+    Images are listed by name, starting after `after` (keyset pagination). With
+    `lock`, the rows are locked until the end of the transaction, rows locked
+    by a concurrent collection are skipped.
+    """
+
+    stmt = (
+        select(ItemImage.name)
+        .where(ItemImage.creation_date < created_before)
+        .where(
+            ~exists().where(ItemImageAssociation.image_name == ItemImage.name),
+        )
+        .order_by(ItemImage.name)
+        .limit(limit)
+    )
+
+    if after is not None:
+        stmt = stmt.where(ItemImage.name > after)
+
+    if lock:
+        stmt = stmt.with_for_update(skip_locked=True)
+
+    return list((await db.scalars(stmt)).all())
+
+
+async def collect_orphan_images(
+    session_maker: async_sessionmaker,
+    s3: storage.S3Client,
+    *,
+    grace_period: timedelta,
+    batch_size: int = GC_BATCH_SIZE,
+    dry_run: bool = False,
+) -> ImageGarbageCollection:
+    """Delete the images attached to no item for longer than `grace_period`.
+
+    Images are collected in batches of `batch_size`, each in its own
+    transaction: their variants are deleted from S3 with batched DeleteObjects
+    requests, then their rows are deleted. An image whose variants could not
+    all be deleted is kept, to be collected again later.
+
+    With `dry_run`, the orphaned images are only counted.
+    """
+
+    created_before = datetime.now(UTC) - grace_period
+    collection = ImageGarbageCollection(dry_run=dry_run)
+    start = time.perf_counter()
+    after: str | None = None
+
+    while True:
+        async with session_maker.begin() as db:
+            names = await list_orphan_images(
+                db,
+                created_before=created_before,
+                after=after,
+                limit=batch_size,
+                lock=not dry_run,
+            )
+
+            if not names:
+                break
+
+            after = names[-1]
+            collection.batches += 1
+
+            if dry_run:
+                collection.images += len(names)
+                collection.objects += len(names) * len(storage.IMAGE_SIZES)
+                continue
+
+            keys = [key for name in names for key in storage.image_variant_keys(name)]
+            failed_keys = await storage.delete_objects(s3, keys)
+            failed_names = {key.rsplit("_", 1)[0] for key in failed_keys}
+            deleted_names = [name for name in names if name not in failed_names]
+
+            if deleted_names:
+                await db.execute(
+                    delete(ItemImage).where(ItemImage.name.in_(deleted_names))
+                )
+
+        collection.images += len(deleted_names)
+        collection.objects += len(keys) - len(failed_keys)
+        collection.failed_images += len(failed_names)
+
+        if failed_keys:
+            logger.warning(
+                "Failed to delete %d objects of %d orphaned images",
+                len(failed_keys),
+                len(failed_names),
+            )
+
+    collection.duration = time.perf_counter() - start
+
+    return collection
@@ -9,13 +9,23 @@ from babytroc.domains.item.events import (
 )
 from babytroc.infrastructure.events import on
 
+# a batch of created items invalidates the items list once, and each owner once
 
-@on(ItemCreated, critical=False)
-async def invalidate_cache_on_item_created(db, event: ItemCreated):
-    from babytroc.domains.item.services.cache import invalidate_item_created
+
+@on(ItemCreated, critical=False, coalesce=lambda event: None)
+async def invalidate_items_list_on_item_created(db, event: ItemCreated):
+    from babytroc.domains.item.services.cache import invalidate_items_list
     from babytroc.infrastructure.cache import get_cache
 
-    await invalidate_item_created(get_cache(), owner_id=event.owner_id)
+    await invalidate_items_list(get_cache())
+
+
+@on(ItemCreated, critical=False, coalesce=lambda event: event.owner_id)
+async def invalidate_owner_cache_on_item_created(db, event: ItemCreated):
+    from babytroc.domains.item.services.cache import invalidate_owner_item_created
+    from babytroc.infrastructure.cache import get_cache
+
+    await invalidate_owner_item_created(get_cache(), owner_id=event.owner_id)
 
 
 @on(ItemUpdated, critical=False)
@@ -49,6 +59,7 @@ async def invalidate_cache_on_item_liked(db, event: ItemLiked):
 
     await invalidate_item_liked(
         get_cache(),
+        item_id=event.item_id,
         liker_id=event.user_id,
         item_owner_id=event.item_owner_id,
     )
@@ -61,6 +72,7 @@ async def invalidate_cache_on_item_unliked(db, event: ItemUnliked):
 
     await invalidate_item_liked(
         get_cache(),
+        item_id=event.item_id,
         liker_id=event.user_id,
         item_owner_id=event.item_owner_id,
     )
@@ -0,0 +1,15 @@
+from datetime import timedelta
+
+from babytroc.infrastructure.scheduler import JobContext, job
+
+
+@job("item.reconcile_counters", interval=timedelta(hours=1))
+async def reconcile_counters(context: JobContext) -> dict[str, int]:
+    from babytroc.domains.item.services.counters import (
+        reconcile_counters as reconcile,
+    )
+
+    async with context.session_maker.begin() as db:
+        reconciled = await reconcile(db)
+
+    return {"items": reconciled.items, "users": reconciled.users}
@@ -8,14 +8,12 @@ from sqlalchemy import (
     Index,
     Integer,
     String,
-    and_,
-    exists,
     func,
     or_,
     select,
     text,
 )
-from sqlalchemy.dialects.postgresql import INT4RANGE, Range
+from sqlalchemy.dialects.postgresql import INT4RANGE, TSVECTOR, Range
 from sqlalchemy.orm import (
     Mapped,
     column_property,
@@ -25,13 +23,11 @@ from sqlalchemy.orm import (
 )
 
 from babytroc.domains.category.models import Category
-from babytroc.domains.loan.models import Loan
 from babytroc.domains.region.models import Region
 from babytroc.shared.models import Base, CreationDate, UpdateDate
 
 from .category import ItemCategoryAssociation
 from .image import ItemImage, ItemImageAssociation
-from .like import ItemLike
 from .region import ItemRegionAssociation
 
 if TYPE_CHECKING:
@@ -42,7 +38,7 @@ class Item(CreationDate, UpdateDate, Base):
     __tablename__ = "item"
 
     # id is defined explicitly instead of using IntegerIdentifier subclassing
-    # to be accessed by likes_count deferred query
+    # to be accessed by first_image_name deferred query
     id: Mapped[int] = mapped_column(
         Integer,
         Identity(always=True),
@@ -111,15 +107,23 @@ class Item(CreationDate, UpdateDate, Base):
         Computed(func.normalize_text(name + " " + description))
     )
 
-    has_active_loan: Mapped[bool] = column_property(
-        exists(
-            select(Loan.id).where(
-                and_(
-                    Loan.item_id == id,
-                    func.upper(Loan.during).is_(None),
-                ),
-            )
+    # content used for full-text search candidates (see `item.search`)
+    searchable_tsvector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('french'::regconfig, "
+            "normalize_text(name || ' ' || description))"
         ),
+        deferred=True,
+        deferred_raiseload=True,
+    )
+
+    # kept in sync with the active loans of the item by the
+    # `update_item_has_active_loan` trigger on `loan`
+    has_active_loan: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        server_default="false",
     )
 
     available: Mapped[bool] = column_property(~or_(has_active_loan, blocked))
@@ -137,13 +141,11 @@ class Item(CreationDate, UpdateDate, Base):
         raiseload=True,
     )
 
-    likes_count: Mapped[int] = deferred(
-        select(func.count(ItemLike.item_id))
-        .where(
-            ItemLike.item_id == id,
-        )
-        .scalar_subquery(),
-        raiseload=True,
+    # maintained by the like services (see `item.services.counters`)
+    likes_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
     )
 
     @property
@@ -165,6 +167,16 @@ class Item(CreationDate, UpdateDate, Base):
             postgresql_using="gist",
             postgresql_ops={"searchable_text": "gist_trgm_ops"},
         ),
+        Index(
+            "idx_item_searchable_tsvector",
+            "searchable_tsvector",
+            postgresql_using="gin",
+        ),
+        Index(
+            "idx_item_available",
+            "id",
+            postgresql_where=text("NOT has_active_loan AND NOT blocked"),
+        ),
     )
 
     def __repr__(self):
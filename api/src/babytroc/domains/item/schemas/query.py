@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from sqlalchemy import Select, and_, func, or_, select
+from sqlalchemy import Select, and_, or_, select
 from sqlalchemy.dialects.postgresql import INT4RANGE
 
 from babytroc.domains.category.models import Category
@@ -11,7 +11,6 @@ from babytroc.domains.item.models import (
     ItemLike,
     ItemSave,
 )
-from babytroc.domains.loan.models import Loan
 from babytroc.domains.region.models import Region
 from babytroc.shared.pagination import QueryPageCursor
 from babytroc.shared.schemas import (
@@ -63,23 +62,14 @@ class ItemQueryFilterAvailability(ReadQueryFilter):
     availability: ItemQueryAvailability | None = None
 
     def _filter_read(self, stmt: Select) -> Select:
-        not_available = or_(
-            select(Loan)
-            .where(
-                and_(
-                    Loan.item_id == Item.id,
-                    func.upper(Loan.during).is_(None),
-                ),
-            )
-            .exists(),
-            Item.blocked,
-        )
+        # matches the predicate of the `idx_item_available` partial index
+        available = and_(~Item.has_active_loan, ~Item.blocked)
 
         match self.availability:
             case ItemQueryAvailability.yes:
-                stmt = stmt.where(~not_available)
+                stmt = stmt.where(available)
             case ItemQueryAvailability.no:
-                stmt = stmt.where(not_available)
+                stmt = stmt.where(or_(Item.has_active_loan, Item.blocked))
 
         return super()._filter_read(stmt)
 
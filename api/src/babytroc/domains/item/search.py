@@ -0,0 +1,131 @@
+import re
+from collections.abc import Callable
+
+from sqlalchemy import (
+    ColumnElement,
+    CompoundSelect,
+    Select,
+    cast,
+    desc,
+    false,
+    func,
+    or_,
+    select,
+    union,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
+
+from babytroc.domains.item.filters import select_words_match
+from babytroc.domains.item.models import Item
+
+# text search configuration used to build `Item.searchable_tsvector`
+SEARCH_CONFIG = "french"
+
+# number of candidates reranked by trigram word similarity
+SEARCH_CANDIDATES_LIMIT = 1000
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def words_tsquery(words: list[str]) -> str:
+    """Text of the `to_tsquery` query matching any of `words`.
+
+    Each word is split into tokens, all of which must match as a prefix. Any
+    other character is dropped, the query text is therefore always valid.
+
+    Returns an empty string if `words` holds no token.
+    """
+
+    terms = [
+        " & ".join(f"{token}:*" for token in tokens)
+        for tokens in (_TOKEN_RE.findall(word) for word in words)
+        if tokens
+    ]
+
+    return " | ".join(f"({term})" for term in terms)
+
+
+def select_words_tsquery(words: list[str]) -> ColumnElement:
+    """Expression of the normalized tsquery matching any of `words`."""
+
+    return func.to_tsquery(
+        cast(SEARCH_CONFIG, REGCONFIG),
+        func.normalize_text(words_tsquery(words)),
+    )
+
+
+def select_words_fulltext_match(words: list[str]) -> ColumnElement[bool]:
+    """Whether the item matches any of `words`, using the full-text index."""
+
+    return Item.searchable_tsvector.bool_op("@@")(select_words_tsquery(words))
+
+
+def select_words_trigram_match(words: list[str]) -> ColumnElement[bool]:
+    """Whether the item is similar to any of `words`, using the trigram index.
+
+    Unlike the full-text match, misspelled words match.
+    """
+
+    return or_(
+        *(
+            Item.searchable_text.bool_op("%>")(func.normalize_text(word))
+            for word in words
+        )
+    )
+
+
+def select_words_candidates(
+    words: list[str],
+    *,
+    min_candidates: int,
+    limit: int = SEARCH_CANDIDATES_LIMIT,
+    where: Callable[[Select], Select] = lambda stmt: stmt,
+) -> Select[int] | CompoundSelect:
+    """Select the ids of at most `limit` items best matching `words`.
+
+    Candidates are the items with the best full-text rank, selected with the
+    full-text index on `searchable_tsvector`. Misspelled words only match with
+    the trigram index on `searchable_text`: if there are fewer than
+    `min_candidates` full-text candidates, the items best matching by trigram
+    word similarity are candidates too. Both are decided by a single query.
+
+    `where` filters the items of both selections. Candidates are meant to be
+    reranked by trigram word similarity (see `select_words_match`).
+    """
+
+    if not words_tsquery(words):
+        return select(Item.id).where(false())
+
+    tsquery = select_words_tsquery(words)
+
+    fulltext_candidates = (
+        where(select(Item.id))
+        .where(Item.searchable_tsvector.bool_op("@@")(tsquery))
+        .order_by(
+            desc(func.ts_rank(Item.searchable_tsvector, tsquery)),
+            desc(Item.id),
+        )
+        .limit(limit)
+        .cte("fulltext_candidates")
+    )
+
+    # evaluated once, the trigram index is not scanned if enough candidates
+    fulltext_count = select(func.count()).select_from(fulltext_candidates)
+
+    trigram_candidates = (
+        where(select(Item.id))
+        .where(
+            fulltext_count.scalar_subquery() < min_candidates,
+            select_words_trigram_match(words),
+        )
+        .order_by(
+            desc(select_words_match(Item.searchable_text, words)),
+            desc(Item.id),
+        )
+        .limit(limit)
+    )
+
+    return union(
+        select(fulltext_candidates.c.id),
+        trigram_candidates,
+    )
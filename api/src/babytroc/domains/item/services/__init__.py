@@ -1,4 +1,4 @@
-from . import like, save
+from . import counters, like, save
 from .create import create_item, create_many_items
 from .delete import delete_item
 from .read import (
@@ -12,6 +12,7 @@ from .report import report_item
 from .update import update_item
 
 __all__ = [
+    "counters",
     "create_item",
     "create_many_items",
     "delete_item",
@@ -0,0 +1,196 @@
+from collections import Counter
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from sqlalchemy import Integer, column, func, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from babytroc.domains.item.models import Item, ItemLike
+from babytroc.domains.user.models import User
+
+
+class ReconciledCounters(NamedTuple):
+    """Number of rows whose counters have been corrected."""
+
+    items: int
+    users: int
+
+
+async def add_item_likes(
+    db: AsyncSession,
+    item_id: int,
+    count: int,
+) -> int:
+    """Add `count` likes to the item with `item_id` and to its owner.
+
+    Returns the id of the owner of the item.
+    """
+
+    stmt = (
+        update(Item)
+        .values(likes_count=Item.likes_count + count)
+        .where(Item.id == item_id)
+        .returning(Item.owner_id)
+    )
+
+    owner_id = (await db.execute(stmt)).scalar_one()
+
+    await db.execute(
+        update(User)
+        .values(likes_count=User.likes_count + count)
+        .where(User.id == owner_id)
+    )
+
+    return owner_id
+
+
+async def add_users_items(
+    db: AsyncSession,
+    owner_ids: Iterable[int],
+) -> None:
+    """Add one item to the `items_count` of the owner, for each given owner id.
+
+    Owner ids can be repeated.
+    """
+
+    counts = Counter(owner_ids)
+    if not counts:
+        return
+
+    data = values(
+        column("user_id", Integer),
+        column("added_items_count", Integer),
+        name="user_add_items_data",
+    ).data(list(counts.items()))
+
+    await db.execute(
+        update(User)
+        .values(items_count=User.items_count + data.c.added_items_count)
+        .where(User.id == data.c.user_id)
+    )
+
+
+async def remove_user_item(
+    db: AsyncSession,
+    owner_id: int,
+    likes_count: int,
+) -> None:
+    """Remove a deleted item, with `likes_count` likes, from the counters of its
+    owner."""
+
+    await db.execute(
+        update(User)
+        .values(
+            items_count=User.items_count - 1,
+            likes_count=User.likes_count - likes_count,
+        )
+        .where(User.id == owner_id)
+    )
+
+
+async def remove_likes_of_user(
+    db: AsyncSession,
+    user_id: int,
+) -> None:
+    """Remove the likes given by user with `user_id` from the counters.
+
+    Must be called before the user is deleted, its likes being deleted in cascade.
+
+    Like `add_item_likes`, the rows of the items are locked before the rows of
+    their owners, each in id order, not to deadlock with a concurrent like.
+    """
+
+    liked_item_ids = select(ItemLike.item_id).where(ItemLike.user_id == user_id)
+
+    item_ids = (
+        await db.scalars(
+            select(Item.id)
+            .where(Item.id.in_(liked_item_ids))
+            .order_by(Item.id)
+            .with_for_update()
+        )
+    ).all()
+
+    if not item_ids:
+        return
+
+    likes_per_owner = (
+        select(
+            Item.owner_id.label("owner_id"),
+            func.count().label("likes_count"),
+        )
+        .where(Item.id.in_(item_ids))
+        .group_by(Item.owner_id)
+        .subquery()
+    )
+
+    await db.execute(
+        select(User.id)
+        .where(User.id.in_(select(likes_per_owner.c.owner_id)))
+        .order_by(User.id)
+        .with_for_update()
+    )
+
+    await db.execute(
+        update(Item)
+        .values(likes_count=Item.likes_count - 1)
+        .where(Item.id.in_(item_ids))
+    )
+
+    await db.execute(
+        update(User)
+        .values(likes_count=User.likes_count - likes_per_owner.c.likes_count)
+        .where(User.id == likes_per_owner.c.owner_id)
+    )
+
+
+async def reconcile_counters(db: AsyncSession) -> ReconciledCounters:
+    """Recompute every item and user counter, fixing any drift."""
+
+    item_likes = (
+        select(
+            Item.id.label("item_id"),
+            func.count(ItemLike.item_id).label("likes_count"),
+        )
+        .outerjoin(ItemLike, ItemLike.item_id == Item.id)
+        .group_by(Item.id)
+        .subquery()
+    )
+
+    res = await db.execute(
+        update(Item)
+        .values(likes_count=item_likes.c.likes_count)
+        .where(
+            Item.id == item_likes.c.item_id,
+            Item.likes_count != item_likes.c.likes_count,
+        )
+    )
+    reconciled_items: int = res.rowcount  # type: ignore[attr-defined]
+
+    # relies on the item likes counters fixed above
+    user_counts = (
+        select(
+            User.id.label("user_id"),
+            func.count(Item.id).label("items_count"),
+            func.coalesce(func.sum(Item.likes_count), 0).label("likes_count"),
+        )
+        .outerjoin(Item, Item.owner_id == User.id)
+        .group_by(User.id)
+        .subquery()
+    )
+
+    res = await db.execute(
+        update(User)
+        .values(
+            items_count=user_counts.c.items_count,
+            likes_count=user_counts.c.likes_count,
+        )
+        .where(
+            User.id == user_counts.c.user_id,
+            (User.items_count != user_counts.c.items_count)
+            | (User.likes_count != user_counts.c.likes_count),
+        )
+    )
+    reconciled_users: int = res.rowcount  # type: ignore[attr-defined]
+
+    return ReconciledCounters(items=reconciled_items, users=reconciled_users)
@@ -16,9 +16,10 @@ from babytroc.domains.item.models.image import ItemImage, ItemImageAssociation
 from babytroc.domains.item.models.region import ItemRegionAssociation
 from babytroc.domains.item.schemas.create import ItemCreate
 from babytroc.domains.item.schemas.read import ItemRead
+from babytroc.domains.item.services.counters import add_users_items
 from babytroc.domains.region.services import get_many_regions
 from babytroc.domains.user.services.read import get_many_users
-from babytroc.infrastructure.events import emit
+from babytroc.infrastructure.events import batch_events, emit
 from babytroc.shared.schemas import Base as SchemaBase
 
 from .read import get_many_items
@@ -116,6 +117,7 @@ async def create_many_items(
         db=db,
         items=items,
     )
+    await add_users_items(db, owner_ids=(item.owner_id for item in items))
     await _insert_item_region_associations(
         db=db,
         associations=[
@@ -157,15 +159,16 @@ async def create_many_items(
         item_ids=set(item_ids),
     )
 
-    # emit events
-    for item_read in item_reads:
-        await emit(
-            db,
-            ItemCreated(
-                item_id=item_read.id,
-                owner_id=item_read.owner.id,
-            ),
-        )
+    # emit events, coalescing their invalidations
+    async with batch_events():
+        for item_read in item_reads:
+            await emit(
+                db,
+                ItemCreated(
+                    item_id=item_read.id,
+                    owner_id=item_read.owner.id,
+                ),
+            )
 
     return item_reads
 
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from babytroc.domains.item.errors import ItemNotFoundError
@@ -8,6 +8,7 @@ from babytroc.domains.item.models import Item
 from babytroc.domains.item.models.image import ItemImageAssociation
 from babytroc.domains.item.models.region import ItemRegionAssociation
 from babytroc.domains.item.schemas.query import ItemDeleteQueryFilter
+from babytroc.domains.item.services.counters import remove_user_item
 
 if TYPE_CHECKING:
     from babytroc.infrastructure.cache_client import Cache
@@ -25,21 +26,19 @@ async def delete_item(
     # default empty query filter
     query_filter = query_filter or ItemDeleteQueryFilter()
 
-    # get owner_id before deleting (needed for cache invalidation)
-    owner_id: int | None = None
-    if cache is not None:
-        owner_id = (
-            await db.execute(select(Item.owner_id).where(Item.id == item_id))
-        ).scalar()
-
-    stmt = query_filter.filter_delete(delete(Item).where(Item.id == item_id))
+    stmt = query_filter.filter_delete(
+        delete(Item).where(Item.id == item_id)
+    ).returning(Item.owner_id, Item.likes_count)
 
-    res = await db.execute(stmt)
+    deleted = (await db.execute(stmt)).first()
 
-    if res.rowcount == 0:  # type: ignore[attr-defined]
+    if deleted is None:
         raise ItemNotFoundError({**query_filter.key, "id": item_id})
 
-    if cache is not None and owner_id is not None:
+    owner_id, likes_count = deleted
+    await remove_user_item(db, owner_id=owner_id, likes_count=likes_count)
+
+    if cache is not None:
         from babytroc.domains.item.services.cache import invalidate_item_deleted
 
         await invalidate_item_deleted(cache, item_id=item_id, owner_id=owner_id)
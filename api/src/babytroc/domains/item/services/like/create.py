@@ -1,9 +1,9 @@
-from sqlalchemy import insert, select
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from babytroc.domains.item.events import ItemLiked
-from babytroc.domains.item.models import Item
 from babytroc.domains.item.models.like import ItemLike
+from babytroc.domains.item.services.counters import add_item_likes
 from babytroc.infrastructure.events import emit
 
 
@@ -25,8 +25,6 @@ async def add_item_to_user_liked_items(
     # TODO handle foreign key violation
     await db.execute(stmt)
 
-    owner_id = (
-        await db.execute(select(Item.owner_id).where(Item.id == item_id))
-    ).scalar_one()
+    owner_id = await add_item_likes(db, item_id=item_id, count=1)
 
     await emit(db, ItemLiked(item_id=item_id, user_id=user_id, item_owner_id=owner_id))
@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from babytroc.domains.item.events import ItemUnliked
 from babytroc.domains.item.models import Item
 from babytroc.domains.item.models.like import ItemLike
+from babytroc.domains.item.services.counters import add_item_likes
 from babytroc.infrastructure.events import emit
 
 
@@ -14,16 +15,24 @@ async def remove_item_from_user_liked_items(
 ) -> None:
     """Remove item from user liked items."""
 
-    stmt = delete(ItemLike).where(
-        ItemLike.item_id == item_id,
-        ItemLike.user_id == user_id,
+    stmt = (
+        delete(ItemLike)
+        .where(
+            ItemLike.item_id == item_id,
+            ItemLike.user_id == user_id,
+        )
+        .returning(ItemLike.item_id)
     )
 
-    await db.execute(stmt)
+    res = await db.execute(stmt)
 
-    owner_id = (
-        await db.execute(select(Item.owner_id).where(Item.id == item_id))
-    ).scalar_one()
+    # only count likes actually removed
+    if res.first() is not None:
+        owner_id = await add_item_likes(db, item_id=item_id, count=-1)
+    else:
+        owner_id = (
+            await db.execute(select(Item.owner_id).where(Item.id == item_id))
+        ).scalar_one()
 
     await emit(
         db, ItemUnliked(item_id=item_id, user_id=user_id, item_owner_id=owner_id)
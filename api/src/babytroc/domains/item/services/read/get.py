@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING
 
 from sqlalchemy import and_, func, literal, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import aliased, selectinload, undefer
+from sqlalchemy.orm import aliased, selectinload
 
 from babytroc.domains.item.errors import ItemNotFoundError
 from babytroc.domains.item.filters import (
@@ -31,26 +31,36 @@ async def get_item(
 ) -> ItemRead:
     """Get item by id."""
 
-    # Only use cache for anonymous (no client_id) requests
-    if cache is not None and client_id is None:
-        cached = await cache.get(key_item(item_id))
-        if cached is not None:
-            return ItemRead.model_validate_json(cached)
-
-    items = await get_many_items(
-        db=db,
-        item_ids={item_id},
-        query_filter=query_filter,
-        client_id=client_id,
-    )
+    # Only cache anonymous (no client_id) requests: core data without per-user
+    # flags
+    if cache is None or client_id is not None:
+        items = await get_many_items(
+            db=db,
+            item_ids={item_id},
+            query_filter=query_filter,
+            client_id=client_id,
+        )
+        return items[0]
+
+    # concurrent misses on the same item share a single query
+    computed: ItemRead | None = None
 
-    result = items[0]
+    async def compute() -> str:
+        nonlocal computed
+        items = await get_many_items(
+            db=db,
+            item_ids={item_id},
+            query_filter=query_filter,
+        )
+        computed = items[0]
+        return computed.model_dump_json()
+
+    raw = await cache.get_or_set(key_item(item_id), TTL_ITEM, compute)
 
-    # Only cache if no client_id (core data without per-user flags)
-    if cache is not None and client_id is None:
-        await cache.set(key_item(item_id), result.model_dump_json(), ttl=TTL_ITEM)
+    if computed is not None:
+        return computed
 
-    return result
+    return ItemRead.model_validate_json(raw)
 
 
 async def get_many_items(
@@ -148,8 +158,6 @@ async def get_many_items(
 
     stmt = query_filter.filter_read(stmt.where(Item.id.in_(item_ids)))
 
-    stmt = stmt.options(undefer(Item.likes_count))
-
     res = await db.execute(stmt)
 
     items = [
@@ -3,9 +3,7 @@ from typing import TYPE_CHECKING, overload
 
 from sqlalchemy import (
     BooleanClauseList,
-    Integer,
     desc,
-    func,
     select,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -24,9 +22,23 @@ from babytroc.domains.item.schemas.query import (
     ItemQueryPageCursor,
     ItemReadQueryFilter,
 )
-from babytroc.infrastructure.cache_keys import TTL_ITEMS_LIST, key_items_list
+from babytroc.domains.item.search import (
+    SEARCH_CANDIDATES_LIMIT,
+    select_words_candidates,
+)
+from babytroc.infrastructure.cache_keys import (
+    ITEMS_LIST_MAX_CACHED_PAGES,
+    TTL_ITEMS_LIST,
+    TTL_ITEMS_LIST_PAGE,
+    key_items_list,
+    key_items_list_page,
+    key_items_list_page_depth,
+    namespace_items_list,
+)
 from babytroc.shared.pagination import QueryPageOptions, QueryPageResult
 
+from .user_sets import get_user_liked_item_ids, get_user_saved_item_ids
+
 if TYPE_CHECKING:
     from babytroc.infrastructure.cache_client import Cache
 
@@ -58,7 +70,7 @@ def _deserialize_list_result(
     )
 
 
-def _build_cache_key(
+def _cache_key_params(
     words: list[str] | None,
     query_filter: ItemReadQueryFilter,
     page_options: (
@@ -66,30 +78,50 @@ def _build_cache_key(
         | QueryPageOptions[ItemMatchingWordsQueryPageCursor]
         | None
     ),
-) -> str:
-    """Build cache key for list_items."""
-    return key_items_list(
-        words=tuple(words) if words else None,
-        query_filter=repr(query_filter),
-        limit=page_options.limit if page_options else None,
-    )
-
-
-def _should_cache(
-    cache: "Cache | None",
-    client_id: int | None,
-    page_options: (
-        QueryPageOptions[ItemQueryPageCursor]
-        | QueryPageOptions[ItemMatchingWordsQueryPageCursor]
-        | None
-    ),
-) -> bool:
-    """Return True if the request is cacheable (anonymous, first page)."""
-    if cache is None or client_id is not None:
-        return False
-    if page_options is not None and page_options.cursor.item_id is not None:
-        return False
-    return True
+) -> dict[str, object]:
+    """Parameters identifying a list_items query, regardless of the page."""
+    return {
+        "words": tuple(words) if words else None,
+        "query_filter": repr(query_filter),
+        "limit": page_options.limit if page_options else None,
+    }
+
+
+def _cache_key_cursor(
+    cursor: ItemQueryPageCursor | ItemMatchingWordsQueryPageCursor | None,
+) -> dict[str, object]:
+    """Cursor of a page (`cid`, `cwm`), empty for the first page."""
+    if cursor is None:
+        return {}
+    dumped = cursor.model_dump(mode="json", by_alias=True)
+    return {k: v for k, v in dumped.items() if v is not None}
+
+
+async def _overlay_client_flags(
+    db: AsyncSession,
+    items: list[ItemPreviewRead],
+    *,
+    client_id: int,
+    cache: "Cache",
+) -> list[ItemPreviewRead]:
+    """Set the client-specific flags of anonymous item previews.
+
+    The liked and saved flags are taken from the cached sets of the client.
+    """
+
+    liked_item_ids = await get_user_liked_item_ids(db, client_id, cache=cache)
+    saved_item_ids = await get_user_saved_item_ids(db, client_id, cache=cache)
+
+    return [
+        item.model_copy(
+            update={
+                "owned": item.owner_id == client_id,
+                "liked": item.id in liked_item_ids,
+                "saved": item.id in saved_item_ids,
+            }
+        )
+        for item in items
+    ]
 
 
 def _serialize_list_result(
@@ -130,7 +162,7 @@ async def list_items(
 ) -> QueryPageResult[ItemPreviewRead, ItemMatchingWordsQueryPageCursor]: ...
 
 
-async def list_items(  # noqa: C901
+async def list_items(
     db: AsyncSession,
     words: list[str] | None = None,
     *,
@@ -151,13 +183,118 @@ async def list_items(  # noqa: C901
     # default empty query filter
     query_filter = query_filter or ItemReadQueryFilter()
 
-    # Only cache anonymous first-page requests
-    use_cache = _should_cache(cache, client_id, page_options)
-    cache_key = _build_cache_key(words, query_filter, page_options) if use_cache else ""
+    if cache is None:
+        return await _query_items(
+            db=db,
+            words=words,
+            query_filter=query_filter,
+            page_options=page_options,
+            client_id=client_id,
+        )
+
+    # Every page of a query lives under the current generation of the items
+    # list namespace, so that bumping it invalidates all of them at once.
+    generation = await cache.get_generation(namespace_items_list())
+    params = _cache_key_params(words, query_filter, page_options)
+    cursor = _cache_key_cursor(page_options.cursor if page_options else None)
+
+    # Only the first ITEMS_LIST_MAX_CACHED_PAGES pages past the first one are
+    # cached. The depth of the next page is recorded along with each cached
+    # page: a cursor with no recorded depth is either too deep or was not
+    # issued by a cached page, and goes straight to the database.
+    if not cursor:
+        depth = 0
+        cache_key = key_items_list(generation, **params)
+        ttl = TTL_ITEMS_LIST
 
-    cached = await cache.get(cache_key) if use_cache else None  # type: ignore[union-attr]
-    if cached is not None:
-        return _deserialize_list_result(cached, words=words)
+    else:
+        raw_depth = await cache.get(
+            key_items_list_page_depth(generation, cursor, **params)
+        )
+        if raw_depth is None:
+            return await _query_items(
+                db=db,
+                words=words,
+                query_filter=query_filter,
+                page_options=page_options,
+                client_id=client_id,
+            )
+
+        depth = int(raw_depth)
+        cache_key = key_items_list_page(generation, cursor, **params)
+        ttl = TTL_ITEMS_LIST_PAGE
+
+    # concurrent misses on the same key share a single query
+    computed: (
+        QueryPageResult[ItemPreviewRead, ItemQueryPageCursor]
+        | QueryPageResult[ItemPreviewRead, ItemMatchingWordsQueryPageCursor]
+        | None
+    ) = None
+
+    # the cached page is the anonymous one, shared by all clients
+    async def compute() -> str:
+        nonlocal computed
+        computed = await _query_items(
+            db=db,
+            words=words,
+            query_filter=query_filter,
+            page_options=page_options,
+            client_id=None,
+        )
+
+        # the depth record outlives the page issuing the cursor
+        if (
+            computed.next_page_cursor is not None
+            and depth < ITEMS_LIST_MAX_CACHED_PAGES
+        ):
+            await cache.set(
+                key_items_list_page_depth(
+                    generation,
+                    _cache_key_cursor(computed.next_page_cursor),
+                    **params,
+                ),
+                str(depth + 1),
+                TTL_ITEMS_LIST,
+            )
+
+        return _serialize_list_result(computed.data, computed.next_page_cursor)
+
+    raw = await cache.get_or_set(cache_key, ttl, compute)
+
+    result = (
+        computed
+        if computed is not None
+        else _deserialize_list_result(raw, words=words)
+    )
+
+    # overlay client-specific flags
+    if client_id is not None:
+        result.data = await _overlay_client_flags(
+            db,
+            result.data,
+            client_id=client_id,
+            cache=cache,
+        )
+
+    return result
+
+
+async def _query_items(  # noqa: C901
+    db: AsyncSession,
+    words: list[str] | None,
+    *,
+    query_filter: ItemReadQueryFilter,
+    page_options: (
+        QueryPageOptions[ItemQueryPageCursor]
+        | QueryPageOptions[ItemMatchingWordsQueryPageCursor]
+        | None
+    ),
+    client_id: int | None,
+) -> (
+    QueryPageResult[ItemPreviewRead, ItemQueryPageCursor]
+    | QueryPageResult[ItemPreviewRead, ItemMatchingWordsQueryPageCursor]
+):
+    """Query a page of items from the database."""
 
     # default empty query page options
     if page_options is None:
@@ -183,21 +320,19 @@ async def list_items(  # noqa: C901
     if words_match is not None:
         stmt = stmt.add_columns(words_match.label("words_match"))
 
-    # filter out items without words match
+    # apply filtering, on the candidates if searching words, the words match
+    # being then only computed on these
     if words is not None:
-        stmt = stmt.where(
-            BooleanClauseList.or_(
-                *(
-                    Item.searchable_text.op("%>", return_type=Integer)(
-                        func.normalize_text(word)
-                    )
-                    for word in words
-                )
-            )
+        # the fallback to misspelled words does not depend on the requested
+        # page, for all pages to be selected alike
+        candidates = select_words_candidates(
+            words,
+            min_candidates=page_options.limit or SEARCH_CANDIDATES_LIMIT,
+            where=query_filter.filter_read,
         )
-
-    # apply filtering
-    stmt = query_filter.filter_read(stmt)
+        stmt = stmt.where(Item.id.in_(candidates))
+    else:
+        stmt = query_filter.filter_read(stmt)
 
     # apply ordering
     if words_match is not None:
@@ -279,11 +414,4 @@ async def list_items(  # noqa: C901
             next_page_cursor=next_cursor,  # type: ignore[arg-type]
         )
 
-    if use_cache:
-        await cache.set(  # type: ignore[union-attr]
-            cache_key,  # type: ignore[possibly-undefined]
-            _serialize_list_result(items, next_cursor),
-            ttl=TTL_ITEMS_LIST,
-        )
-
     return result
@@ -2,10 +2,7 @@ from babytroc.infrastructure.cache_client import Cache
 from babytroc.infrastructure.cache_keys import (
     key_item,
     key_user_chats,
-    pattern_chat_messages,
-    pattern_items_list,
-    pattern_user_borrowings,
-    pattern_user_loans,
+    namespace_items_list,
 )
 
 
@@ -16,12 +13,11 @@ async def invalidate_loan_request_created(
     borrower_id: int,
     owner_id: int,
 ) -> None:
-    await cache.delete(key_item(item_id))
-    await cache.delete_pattern(pattern_user_borrowings(borrower_id))
-    await cache.delete_pattern(pattern_user_loans(owner_id))
-    await cache.delete(key_user_chats(owner_id))
-    await cache.delete(key_user_chats(borrower_id))
-    await cache.delete_pattern(pattern_chat_messages(item_id, borrower_id))
+    await cache.delete(
+        key_item(item_id),
+        key_user_chats(owner_id),
+        key_user_chats(borrower_id),
+    )
 
 
 async def invalidate_loan_request_state_changed(
@@ -32,9 +28,6 @@ async def invalidate_loan_request_state_changed(
     owner_id: int,
 ) -> None:
     await cache.delete(key_item(item_id))
-    await cache.delete_pattern(pattern_user_borrowings(borrower_id))
-    await cache.delete_pattern(pattern_user_loans(owner_id))
-    await cache.delete_pattern(pattern_chat_messages(item_id, borrower_id))
 
 
 async def invalidate_loan_started(
@@ -45,10 +38,7 @@ async def invalidate_loan_started(
     owner_id: int,
 ) -> None:
     await cache.delete(key_item(item_id))
-    await cache.delete_pattern(pattern_items_list())
-    await cache.delete_pattern(pattern_user_borrowings(borrower_id))
-    await cache.delete_pattern(pattern_user_loans(owner_id))
-    await cache.delete_pattern(pattern_chat_messages(item_id, borrower_id))
+    await cache.bump_generation(namespace_items_list())
 
 
 async def invalidate_loan_ended(
@@ -59,7 +49,4 @@ async def invalidate_loan_ended(
     owner_id: int,
 ) -> None:
     await cache.delete(key_item(item_id))
-    await cache.delete_pattern(pattern_items_list())
-    await cache.delete_pattern(pattern_user_borrowings(borrower_id))
-    await cache.delete_pattern(pattern_user_loans(owner_id))
-    await cache.delete_pattern(pattern_chat_messages(item_id, borrower_id))
+    await cache.bump_generation(namespace_items_list())
@@ -65,20 +65,19 @@ async def list_regions(
 ) -> list[RegionRead]:
     """List all regions."""
 
-    cached = await cache.get(key_regions())
-    if cached is not None:
-        return [RegionRead.model_validate(r) for r in json.loads(cached)]
+    # concurrent misses share a single query
+    computed: list[RegionRead] | None = None
 
-    stmt = select(Region)
+    async def compute() -> str:
+        nonlocal computed
+        stmt = select(Region)
+        regions = (await db.execute(stmt)).unique().scalars().all()
+        computed = [RegionRead.model_validate(reg) for reg in regions]
+        return json.dumps([r.model_dump(mode="json") for r in computed])
 
-    regions = (await db.execute(stmt)).unique().scalars().all()
-
-    result = [RegionRead.model_validate(reg) for reg in regions]
+    raw = await cache.get_or_set(key_regions(), TTL_REGIONS, compute)
 
-    await cache.set(
-        key_regions(),
-        json.dumps([r.model_dump(mode="json") for r in result]),
-        ttl=TTL_REGIONS,
-    )
+    if computed is not None:
+        return computed
 
-    return result
+    return [RegionRead.model_validate(r) for r in json.loads(raw)]
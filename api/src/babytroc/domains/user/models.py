@@ -78,6 +78,18 @@ class User(IntegerIdentifier, CreationDate, Base):
         default=0,
     )
 
+    # maintained by the item services (see `item.services.counters`)
+    items_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+    )
+    likes_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+    )
+
     disabled: Mapped[bool] = mapped_column(
         Boolean,
         default=False,
@@ -1,8 +1,10 @@
 from babytroc.infrastructure.cache_client import Cache
 from babytroc.infrastructure.cache_keys import (
     key_user,
-    pattern_items_list,
-    pattern_user_all,
+    key_user_chats,
+    key_user_liked_items,
+    key_user_saved_items,
+    namespace_items_list,
 )
 
 
@@ -12,10 +14,14 @@ async def invalidate_user_updated(cache: Cache, *, user_id: int) -> None:
 
 async def invalidate_user_validated(cache: Cache, *, user_id: int) -> None:
     await cache.delete(key_user(user_id))
-    await cache.delete_pattern(pattern_items_list())
+    await cache.bump_generation(namespace_items_list())
 
 
 async def invalidate_user_deleted(cache: Cache, *, user_id: int) -> None:
-    await cache.delete_pattern(pattern_user_all(user_id))
-    await cache.delete(key_user(user_id))
-    await cache.delete_pattern(pattern_items_list())
+    await cache.delete(
+        key_user(user_id),
+        key_user_liked_items(user_id),
+        key_user_saved_items(user_id),
+        key_user_chats(user_id),
+    )
+    await cache.bump_generation(namespace_items_list())
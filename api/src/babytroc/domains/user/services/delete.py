@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from babytroc.domains.item.services.counters import remove_likes_of_user
 from babytroc.domains.user.errors import UserNotFoundError
 from babytroc.domains.user.models import User
 
@@ -18,6 +19,9 @@ async def delete_user(
 ) -> None:
     """Delete user with `user_id`."""
 
+    # the likes of the user are deleted in cascade
+    await remove_likes_of_user(db, user_id=user_id)
+
     stmt = delete(User).where(User.id == user_id)
 
     res = await db.execute(stmt)
@@ -1,11 +1,10 @@
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from babytroc.domains.item.models import Item, ItemLike
 from babytroc.domains.user.errors import UserNotFoundError
 from babytroc.domains.user.models import User
 from babytroc.domains.user.schemas.preview import UserPreviewRead
@@ -83,38 +82,10 @@ async def get_many_users_private(
     Raises UserNotFoundError if not all users matching criterias exist.
     """
 
-    stmt = (
-        select(User, func.count(Item.id), func.count(ItemLike.item_id))
-        .where(User.id.in_(user_ids))
-        .join(
-            Item,
-            onclause=Item.owner_id == User.id,
-            isouter=True,
-        )
-        .join(
-            ItemLike,
-            onclause=ItemLike.item_id == Item.id,
-            isouter=True,
-        )
-        .group_by(User.id)
-    )
+    stmt = select(User).where(User.id.in_(user_ids))
 
     res = await db.execute(stmt)
-    rows = res.all()
-
-    users = [
-        UserPrivateRead(
-            id=user.id,
-            validated=user.validated,
-            name=user.name,
-            email=user.email,
-            avatar_seed=user.avatar_seed,
-            items_count=items_count,
-            stars_count=user.stars_count,
-            likes_count=likes_count,
-        )
-        for user, items_count, likes_count in rows
-    ]
+    users = [UserPrivateRead.model_validate(user) for user in res.unique().scalars()]
 
     # If the number of queried users  does not match the number of given users ids,
     # it means either:
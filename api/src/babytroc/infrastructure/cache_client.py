@@ -1,15 +1,67 @@
-from collections.abc import Awaitable, Callable
+import asyncio
+import uuid
+from collections.abc import Awaitable, Callable, Iterable
 
 from redis.asyncio import Redis
 
+# Prefix of the Redis sets indexing the keys registered under each tag.
+_TAG_KEY_PREFIX = "babytroc:tag:"
+
+# Prefix of the Redis counters holding the current generation of a namespace.
+_GENERATION_KEY_PREFIX = "babytroc:generation:"
+
+# Prefix of the short-lived locks electing the worker that recomputes an entry.
+_LOCK_KEY_PREFIX = "babytroc:lock:"
+
+# Release a lock only if it is still held by the given token.
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Delete every key indexed by the given tag sets, then the tag sets themselves,
+# in a single atomic step. Keys are unlinked in chunks to stay below Lua's
+# unpack() limit.
+_INVALIDATE_TAGS_SCRIPT = """
+for _, tag in ipairs(KEYS) do
+    local members = redis.call('SMEMBERS', tag)
+    for i = 1, #members, 1000 do
+        redis.call('UNLINK', unpack(members, i, math.min(i + 999, #members)))
+    end
+    redis.call('UNLINK', tag)
+end
+return 0
+"""
+
+
+class _ComputationAbandonedError(Exception):
+    """The caller computing a `get_or_set` entry was cancelled."""
+
 
 class Cache:
-    """Base cache interface."""
+    """Base cache interface.
+
+    Entries can be registered under tags at `set` time so that a whole family
+    of keys can be dropped with `invalidate_tags` without walking the keyspace.
+
+    Alternatively, a family of keys can embed the generation of a namespace
+    (see `get_generation`). Bumping the generation makes every previously built
+    key unreachable at once; the orphaned entries then age out through TTL.
+    """
 
     async def get(self, key: str) -> str | None:
         raise NotImplementedError
 
-    async def set(self, key: str, value: str, ttl: int) -> None:
+    async def set(
+        self,
+        key: str,
+        value: str,
+        ttl: int,
+        *,
+        tags: Iterable[str] = (),
+    ) -> None:
         raise NotImplementedError
 
     async def delete(self, *keys: str) -> None:
@@ -18,11 +70,22 @@ class Cache:
     async def delete_pattern(self, pattern: str) -> None:
         raise NotImplementedError
 
+    async def invalidate_tags(self, *tags: str) -> None:
+        raise NotImplementedError
+
+    async def get_generation(self, namespace: str) -> int:
+        raise NotImplementedError
+
+    async def bump_generation(self, namespace: str) -> None:
+        raise NotImplementedError
+
     async def get_or_set(
         self,
         key: str,
         ttl: int,
         factory: Callable[[], Awaitable[str]],
+        *,
+        tags: Iterable[str] = (),
     ) -> str:
         raise NotImplementedError
 
@@ -33,7 +96,14 @@ class NullCache(Cache):
     async def get(self, key: str) -> str | None:
         return None
 
-    async def set(self, key: str, value: str, ttl: int) -> None:
+    async def set(
+        self,
+        key: str,
+        value: str,
+        ttl: int,
+        *,
+        tags: Iterable[str] = (),
+    ) -> None:
         pass
 
     async def delete(self, *keys: str) -> None:
@@ -42,27 +112,82 @@ class NullCache(Cache):
     async def delete_pattern(self, pattern: str) -> None:
         pass
 
+    async def invalidate_tags(self, *tags: str) -> None:
+        pass
+
+    async def get_generation(self, namespace: str) -> int:
+        return 0
+
+    async def bump_generation(self, namespace: str) -> None:
+        pass
+
     async def get_or_set(
         self,
         key: str,
         ttl: int,
         factory: Callable[[], Awaitable[str]],
+        *,
+        tags: Iterable[str] = (),
     ) -> str:
         return await factory()
 
 
 class RedisCache(Cache):
-    def __init__(self, redis: Redis) -> None:
+    """Redis-backed cache.
+
+    `get_or_set` protects against cache stampedes. Within a worker, concurrent
+    callers for the same key share a single factory call, made by the first
+    caller (a waiting caller takes over if it is cancelled). Across workers, a
+    short Redis lock elects the one that recomputes a missing entry while the
+    others wait for its result. Entries written by `get_or_set` are kept
+    `stale_ttl` seconds past their TTL: during that window they are still
+    served to everyone but the worker that refreshes them. Explicitly deleted
+    entries are never served stale.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        stale_ttl: int = 10,
+        lock_timeout: float = 5.0,
+        lock_poll_interval: float = 0.05,
+    ) -> None:
         self._redis = redis
+        self._invalidate_tags_script = redis.register_script(_INVALIDATE_TAGS_SCRIPT)
+        self._release_lock_script = redis.register_script(_RELEASE_LOCK_SCRIPT)
+        self.stale_ttl = stale_ttl
+        self.lock_timeout = lock_timeout
+        self.lock_poll_interval = lock_poll_interval
+        self._inflight: dict[str, asyncio.Future[str]] = {}
 
     async def get(self, key: str) -> str | None:
-        value = await self._redis.get(key)
-        if value is None:
-            return None
-        return value.decode() if isinstance(value, bytes) else value
+        return _decode(await self._redis.get(key))
+
+    async def set(
+        self,
+        key: str,
+        value: str,
+        ttl: int,
+        *,
+        tags: Iterable[str] = (),
+    ) -> None:
+        tag_keys = [_tag_key(tag) for tag in tags]
+        if not tag_keys:
+            await self._redis.set(key, value, ex=ttl)
+            return
 
-    async def set(self, key: str, value: str, ttl: int) -> None:
-        await self._redis.set(key, value, ex=ttl)
+        # Store the entry and index it under its tags atomically, so that a
+        # concurrent invalidate_tags() either sees both or neither. The tag set
+        # must outlive its longest-lived member: NX sets the expiry of a fresh
+        # set, GT only ever extends it.
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(key, value, ex=ttl)
+            for tag_key in tag_keys:
+                pipe.sadd(tag_key, key)
+                pipe.expire(tag_key, ttl, nx=True)
+                pipe.expire(tag_key, ttl, gt=True)
+            await pipe.execute()
 
     async def delete(self, *keys: str) -> None:
         if keys:
@@ -79,15 +204,139 @@ class RedisCache(Cache):
             if cursor == 0:
                 break
 
+    async def invalidate_tags(self, *tags: str) -> None:
+        if tags:
+            await self._invalidate_tags_script(keys=[_tag_key(tag) for tag in tags])
+
+    async def get_generation(self, namespace: str) -> int:
+        value = await self._redis.get(_generation_key(namespace))
+        return int(value) if value is not None else 0
+
+    async def bump_generation(self, namespace: str) -> None:
+        await self._redis.incr(_generation_key(namespace))
+
     async def get_or_set(
         self,
         key: str,
         ttl: int,
         factory: Callable[[], Awaitable[str]],
+        *,
+        tags: Iterable[str] = (),
     ) -> str:
-        cached = await self.get(key)
+        # Wait for the in-flight computation of this worker, if any. It runs in
+        # the task of the caller that started it, with its factory (which may
+        # hold the resources of its request), and is abandoned if that caller
+        # goes away: a waiter then takes over with its own factory.
+        while (inflight := self._inflight.get(key)) is not None:
+            try:
+                # shield the shared result from the cancellation of a waiter
+                return await asyncio.shield(inflight)
+            except _ComputationAbandonedError:
+                continue
+
+        inflight = asyncio.get_running_loop().create_future()
+        self._inflight[key] = inflight
+
+        try:
+            value = await self._get_or_compute(key, ttl, factory, tags=tuple(tags))
+
+        except asyncio.CancelledError:
+            _set_future_exception(inflight, _ComputationAbandonedError())
+            raise
+
+        except Exception as error:
+            _set_future_exception(inflight, error)
+            raise
+
+        else:
+            inflight.set_result(value)
+            return value
+
+        finally:
+            del self._inflight[key]
+
+    async def _get_or_compute(
+        self,
+        key: str,
+        ttl: int,
+        factory: Callable[[], Awaitable[str]],
+        *,
+        tags: tuple[str, ...],
+    ) -> str:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.pttl(key)
+            raw, pttl = await pipe.execute()
+
+        cached = _decode(raw)
+
+        # fresh hit (PTTL is -1 for keys without expiry)
+        if cached is not None and (pttl == -1 or pttl > self.stale_ttl * 1000):
+            return cached
+
+        # missing or stale: only the lock holder recomputes
+        lock_key = _lock_key(key)
+        token = uuid.uuid4().hex
+        locked = await self._redis.set(
+            lock_key,
+            token,
+            nx=True,
+            px=int(self.lock_timeout * 1000),
+        )
+        if locked:
+            try:
+                return await self._compute(key, ttl, factory, tags=tags)
+            finally:
+                await self._release_lock_script(keys=[lock_key], args=[token])
+
+        # stale while another worker revalidates
         if cached is not None:
             return cached
+
+        # missing: wait for the lock holder, then give up and compute
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.lock_timeout
+        while loop.time() < deadline:
+            await asyncio.sleep(self.lock_poll_interval)
+            cached = await self.get(key)
+            if cached is not None:
+                return cached
+
+        return await self._compute(key, ttl, factory, tags=tags)
+
+    async def _compute(
+        self,
+        key: str,
+        ttl: int,
+        factory: Callable[[], Awaitable[str]],
+        *,
+        tags: tuple[str, ...],
+    ) -> str:
         value = await factory()
-        await self.set(key, value, ttl)
+        await self.set(key, value, ttl + self.stale_ttl, tags=tags)
         return value
+
+
+def _set_future_exception(future: asyncio.Future, error: BaseException) -> None:
+    future.set_exception(error)
+
+    # mark the exception as retrieved: there may be no waiter to retrieve it
+    future.exception()
+
+
+def _decode(value: bytes | str | None) -> str | None:
+    if value is None:
+        return None
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _tag_key(tag: str) -> str:
+    return f"{_TAG_KEY_PREFIX}{tag}"
+
+
+def _generation_key(namespace: str) -> str:
+    return f"{_GENERATION_KEY_PREFIX}{namespace}"
+
+
+def _lock_key(key: str) -> str:
+    return f"{_LOCK_KEY_PREFIX}{key}"
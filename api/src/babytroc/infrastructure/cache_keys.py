@@ -6,6 +6,7 @@ TTL_CATEGORIES = 86400  # 24h
 TTL_REGIONS = 86400  # 24h
 TTL_ITEM = 600  # 10min
 TTL_ITEMS_LIST = 120  # 2min
+TTL_ITEMS_LIST_PAGE = 60  # 1min
 TTL_USER = 1800  # 30min
 TTL_USER_LIKED = 300  # 5min
 TTL_USER_SAVED = 300  # 5min
@@ -16,6 +17,10 @@ TTL_USER_LOANS = 300  # 5min
 TTL_USER_BORROWINGS = 300  # 5min
 
 
+# Number of pages past the first one cached per items list query
+ITEMS_LIST_MAX_CACHED_PAGES = 5
+
+
 def cache_key_hash(**params: object) -> str:
     filtered = {k: v for k, v in sorted(params.items()) if v is not None}
     raw = json.dumps(filtered, separators=(",", ":"), default=str)
@@ -36,8 +41,32 @@ def key_item(item_id: int) -> str:
     return f"babytroc:item:{item_id}"
 
 
-def key_items_list(**query_params: object) -> str:
-    return f"babytroc:items:list:{cache_key_hash(**query_params)}"
+def key_items_list(generation: int, **query_params: object) -> str:
+    return f"babytroc:items:list:{generation}:{cache_key_hash(**query_params)}"
+
+
+def key_items_list_page(
+    generation: int,
+    cursor: dict[str, object],
+    **query_params: object,
+) -> str:
+    query_hash = cache_key_hash(**query_params)
+    return (
+        f"babytroc:items:list:{generation}:{query_hash}:"
+        f"page:{cache_key_hash(**cursor)}"
+    )
+
+
+def key_items_list_page_depth(
+    generation: int,
+    cursor: dict[str, object],
+    **query_params: object,
+) -> str:
+    query_hash = cache_key_hash(**query_params)
+    return (
+        f"babytroc:items:list:{generation}:{query_hash}:"
+        f"depth:{cache_key_hash(**cursor)}"
+    )
 
 
 def key_user(user_id: int) -> str:
@@ -56,27 +85,18 @@ def key_user_chats(user_id: int) -> str:
     return f"babytroc:user:{user_id}:chats"
 
 
-# --- Pattern builders (for invalidation) ---
-
-def pattern_items_list() -> str:
-    return "babytroc:items:list:*"
-
-
-def pattern_user_items(user_id: int) -> str:
-    return f"babytroc:user:{user_id}:items:*"
-
-
-def pattern_user_loans(user_id: int) -> str:
-    return f"babytroc:user:{user_id}:loans:*"
-
+# --- Local tier ---
+# Read on most requests and rarely written: also kept in the per-worker
+# in-process tier in front of Redis (see `TieredCache`).
 
-def pattern_user_borrowings(user_id: int) -> str:
-    return f"babytroc:user:{user_id}:borrowings:*"
+def local_key_prefixes() -> tuple[str, ...]:
+    return (key_categories(), key_regions(), "babytroc:item:")
 
 
-def pattern_chat_messages(item_id: int, borrower_id: int) -> str:
-    return f"babytroc:chat:{item_id}_{borrower_id}:messages:*"
+# --- Namespaces (for generation-based invalidation) ---
+# Keys embed the namespace generation from `Cache.get_generation`;
+# `Cache.bump_generation` orphans all of them with a single INCR.
 
+def namespace_items_list() -> str:
+    return "items:list"
 
-def pattern_user_all(user_id: int) -> str:
-    return f"babytroc:user:{user_id}:*"
@@ -0,0 +1,258 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from fnmatch import fnmatchcase
+from typing import NamedTuple
+
+from broadcaster import Broadcast
+
+from babytroc.infrastructure.cache_client import Cache
+
+logger = logging.getLogger(__name__)
+
+
+class _LocalEntry(NamedTuple):
+    value: str
+    expires_at: float
+    size: int
+
+
+class LocalCache:
+    """Bounded in-process LRU cache with per-entry TTL.
+
+    Eviction happens on insertion, least recently used first, as soon as
+    either `max_entries` or `max_bytes` would be exceeded. The size of an entry
+    is approximated by the length of its key and value.
+    """
+
+    def __init__(self, *, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, _LocalEntry] = OrderedDict()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self._pop(key)
+
+        size = len(key) + len(value)
+        if ttl <= 0 or size > self.max_bytes or self.max_entries <= 0:
+            return
+
+        while self._entries and (
+            len(self._entries) >= self.max_entries
+            or self._size + size > self.max_bytes
+        ):
+            self._pop(next(iter(self._entries)))
+
+        self._entries[key] = _LocalEntry(
+            value=value,
+            expires_at=time.monotonic() + ttl,
+            size=size,
+        )
+        self._size += size
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._pop(key)
+
+    def delete_pattern(self, pattern: str) -> None:
+        self.delete(*[key for key in self._entries if fnmatchcase(key, pattern)])
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+
+class TieredCache(Cache):
+    """Two-tier cache: a per-worker `LocalCache` in front of a shared `Cache`.
+
+    Only untagged entries whose key starts with one of `local_key_prefixes`
+    are kept in the local tier, for at most `local_ttl` seconds. Every other
+    operation goes straight to the shared backend.
+
+    Deletions of locally cached keys are published on `channel` so that the
+    other workers drop their own copies (see `listen_for_invalidations`).
+    """
+
+    def __init__(
+        self,
+        backend: Cache,
+        *,
+        local: LocalCache,
+        local_ttl: int,
+        local_key_prefixes: Iterable[str],
+        broadcast: Broadcast,
+        channel: str,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ) -> None:
+        self.backend = backend
+        self.local = local
+        self.local_ttl = local_ttl
+        self.local_key_prefixes = tuple(local_key_prefixes)
+        self._broadcast = broadcast
+        self._channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._origin = uuid.uuid4().hex
+
+    def is_local(self, key: str) -> bool:
+        return key.startswith(self.local_key_prefixes)
+
+    async def get(self, key: str) -> str | None:
+        if not self.is_local(key):
+            return await self.backend.get(key)
+
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        value = await self.backend.get(key)
+        if value is not None:
+            self.local.set(key, value, self.local_ttl)
+        return value
+
+    async def set(
+        self,
+        key: str,
+        value: str,
+        ttl: int,
+        *,
+        tags: Iterable[str] = (),
+    ) -> None:
+        tags = tuple(tags)
+        await self.backend.set(key, value, ttl, tags=tags)
+        if self.is_local(key) and not tags:
+            self.local.set(key, value, min(ttl, self.local_ttl))
+
+    async def delete(self, *keys: str) -> None:
+        await self.backend.delete(*keys)
+        local_keys = [key for key in keys if self.is_local(key)]
+        if local_keys:
+            self.local.delete(*local_keys)
+            await self._publish_invalidation(keys=local_keys)
+
+    async def delete_pattern(self, pattern: str) -> None:
+        await self.backend.delete_pattern(pattern)
+        self.local.delete_pattern(pattern)
+        await self._publish_invalidation(patterns=[pattern])
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        # tagged entries never reach the local tier
+        await self.backend.invalidate_tags(*tags)
+
+    async def get_generation(self, namespace: str) -> int:
+        return await self.backend.get_generation(namespace)
+
+    async def bump_generation(self, namespace: str) -> None:
+        await self.backend.bump_generation(namespace)
+
+    async def get_or_set(
+        self,
+        key: str,
+        ttl: int,
+        factory: Callable[[], Awaitable[str]],
+        *,
+        tags: Iterable[str] = (),
+    ) -> str:
+        tags = tuple(tags)
+        local = self.is_local(key) and not tags
+
+        if local:
+            cached = self.local.get(key)
+            if cached is not None:
+                return cached
+
+        # the backend coalesces concurrent computations of the same entry
+        value = await self.backend.get_or_set(key, ttl, factory, tags=tags)
+        if local:
+            self.local.set(key, value, min(ttl, self.local_ttl))
+        return value
+
+    async def listen_for_invalidations(self) -> None:
+        """Apply invalidations published by the other workers. Runs forever.
+
+        A lost subscription is retried with an exponential backoff. The local
+        tier is cleared once subscribed, as invalidations published in the
+        meantime were missed.
+        """
+
+        delay = self.reconnect_delay
+
+        while True:
+            try:
+                async with self._broadcast.subscribe(
+                    channel=self._channel,
+                ) as subscriber:
+                    self.local.clear()
+                    delay = self.reconnect_delay
+
+                    # broadcaster mistypes `Subscriber.__aiter__` as optional
+                    async for event in subscriber:  # type: ignore[union-attr]
+                        if event is not None:
+                            self._apply_invalidation(event.message)
+
+                logger.warning("Cache invalidation subscription ended, resubscribing")
+
+            except Exception:
+                logger.exception("Cache invalidation subscription lost, resubscribing")
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _apply_invalidation(self, message: str) -> None:
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            logger.warning("Ignoring malformed cache invalidation message")
+            return
+
+        if payload.get("origin") == self._origin:
+            return
+
+        self.local.delete(*payload.get("keys", []))
+        for pattern in payload.get("patterns", []):
+            self.local.delete_pattern(pattern)
+
+    async def _publish_invalidation(
+        self,
+        *,
+        keys: list[str] | None = None,
+        patterns: list[str] | None = None,
+    ) -> None:
+        await self._broadcast.publish(
+            channel=self._channel,
+            message=json.dumps(
+                {
+                    "origin": self._origin,
+                    "keys": keys or [],
+                    "patterns": patterns or [],
+                }
+            ),
+        )
@@ -1,26 +1,128 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+
 import httpx
 
 from babytroc.infrastructure.config import CapConfig
 
+# maximum number of rejected tokens kept in cache
+RESULT_CACHE_MAX_SIZE = 10_000
+
+
+class CapVerifier:
+    """Long-lived cap PoW token verifier.
+
+    The HTTP client is opened on first use and keeps its connections alive
+    between verifications. At most `config.max_concurrency` verifications are
+    in flight, the others wait for a free slot. It must be closed with `close`.
+
+    Tokens rejected by the cap server are cached for `config.result_cache_ttl`,
+    by token hash, so that retried submissions of a bad token do not reach the
+    cap server again. Tokens are single-use, hence accepted tokens are neither
+    cached nor shared between concurrent verifications: each one is redeemed
+    by the cap server. Failures to reach the cap server are not cached.
+    """
+
+    def __init__(
+        self,
+        config: CapConfig,
+        *,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.config = config
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore = asyncio.Semaphore(config.max_concurrency)
+        # rejected token hash -> expiration time
+        self._rejections: OrderedDict[str, float] = OrderedDict()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The underlying HTTP client, opened if needed."""
+
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.config.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.config.max_concurrency,
+                    max_keepalive_connections=self.config.max_concurrency,
+                ),
+                transport=self._transport,
+            )
+
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def verify(self, token: str) -> bool:
+        """Whether `token` is accepted by the cap server (see `verify_cap_token`)."""
+
+        key = hashlib.sha256(token.encode()).hexdigest()
+
+        if self._is_rejected(key):
+            return False
 
-async def verify_cap_token(config: CapConfig, token: str) -> bool:
+        return await self._verify(key, token)
+
+    async def _verify(self, key: str, token: str) -> bool:
+        try:
+            async with self._semaphore:
+                resp = await self.client.post(
+                    f"{self.config.api_url}/{self.config.site_key}/siteverify",
+                    json={"secret": self.config.secret_key, "response": token},
+                )
+        except httpx.HTTPError:
+            return False
+
+        if resp.status_code != 200:
+            return False
+
+        try:
+            payload = resp.json()
+        except ValueError:
+            return False
+
+        result = payload.get("success") is True
+        if not result:
+            self._cache_rejection(key)
+
+        return result
+
+    def _is_rejected(self, key: str) -> bool:
+        expiration = self._rejections.get(key)
+        if expiration is None:
+            return False
+
+        if expiration <= time.monotonic():
+            del self._rejections[key]
+            return False
+
+        return True
+
+    def _cache_rejection(self, key: str) -> None:
+        ttl = self.config.result_cache_ttl.total_seconds()
+        if ttl <= 0:
+            return
+
+        self._rejections.pop(key, None)
+        self._rejections[key] = time.monotonic() + ttl
+        while len(self._rejections) > RESULT_CACHE_MAX_SIZE:
+            self._rejections.popitem(last=False)
+
+
+def create_cap_verifier(config: CapConfig) -> CapVerifier:
+    return CapVerifier(config)
+
+
+async def verify_cap_token(verifier: CapVerifier, token: str) -> bool:
     """Verify a cap PoW token by calling the cap server's /siteverify endpoint.
 
     Returns False on any failure (HTTP non-200, network error, success=False,
     invalid JSON). Failure is fail-closed by design — see spec.
     """
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.post(
-                f"{config.api_url}/{config.site_key}/siteverify",
-                json={"secret": config.secret_key, "response": token},
-            )
-            if resp.status_code != 200:
-                return False
-            try:
-                payload = resp.json()
-            except ValueError:
-                return False
-            return payload.get("success") is True
-    except httpx.HTTPError:
-        return False
+    return await verifier.verify(token)
@@ -0,0 +1,7 @@
+from fastapi import Request
+
+from babytroc.infrastructure.cap import CapVerifier
+
+
+def get_cap_verifier(request: Request) -> CapVerifier:
+    return request.app.state.cap_verifier
@@ -271,6 +271,40 @@ class RedisConfig(NamedTuple):
         return f"{self.scheme}://{auth}{self.host}:{self.port}/{self.db}"
 
 
+class CacheConfig(NamedTuple):
+    local_max_entries: int
+    local_max_bytes: int
+    local_ttl: int
+
+    @classmethod
+    def from_env(
+        cls,
+        *,
+        local_max_entries: int | None = None,
+        local_max_bytes: int | None = None,
+        local_ttl: int | None = None,
+        test: bool | None = None,
+    ) -> Self:
+        env = EnvironmentVariablesReader(test=test)
+
+        if local_max_entries is None:
+            local_max_entries = int(
+                env.get("CACHE_LOCAL_MAX_ENTRIES", default="2048"),
+            )
+        if local_max_bytes is None:
+            local_max_bytes = int(
+                env.get("CACHE_LOCAL_MAX_BYTES", default=str(32 * 1024 * 1024)),
+            )
+        if local_ttl is None:
+            local_ttl = int(env.get("CACHE_LOCAL_TTL_SECONDS", default="60"))
+
+        return cls(
+            local_max_entries=local_max_entries,
+            local_max_bytes=local_max_bytes,
+            local_ttl=local_ttl,
+        )
+
+
 class PubsubConfig(NamedTuple):
     url: str
 
@@ -287,6 +321,117 @@ class PubsubConfig(NamedTuple):
         return cls(url=url)
 
 
+class WebSocketConfig(NamedTuple):
+    queue_size: int
+    send_timeout: float
+    event_log_max_length: int
+    event_log_ttl: int
+
+    @classmethod
+    def from_env(
+        cls,
+        *,
+        queue_size: int | None = None,
+        send_timeout: float | None = None,
+        event_log_max_length: int | None = None,
+        event_log_ttl: int | None = None,
+        test: bool | None = None,
+    ) -> Self:
+        env = EnvironmentVariablesReader(test=test)
+
+        if queue_size is None:
+            queue_size = int(env.get("WEBSOCKET_QUEUE_SIZE", default="64"))
+        if send_timeout is None:
+            send_timeout = float(
+                env.get("WEBSOCKET_SEND_TIMEOUT_SECONDS", default="10"),
+            )
+        if event_log_max_length is None:
+            event_log_max_length = int(
+                env.get("WEBSOCKET_EVENT_LOG_MAX_LENGTH", default="256"),
+            )
+        if event_log_ttl is None:
+            event_log_ttl = int(
+                env.get("WEBSOCKET_EVENT_LOG_TTL_SECONDS", default="86400"),
+            )
+
+        return cls(
+            queue_size=queue_size,
+            send_timeout=send_timeout,
+            event_log_max_length=event_log_max_length,
+            event_log_ttl=event_log_ttl,
+        )
+
+
+# non-critical event handlers run after commit, in the background, unless
+# `handler_concurrency` is 0. A positive `outbox_relay_interval` enables the
+# event outbox.
+class EventsConfig(NamedTuple):
+    handler_concurrency: int
+    handler_max_attempts: int
+    handler_retry_delay: float
+    outbox_relay_interval: float
+
+    @classmethod
+    def from_env(
+        cls,
+        *,
+        handler_concurrency: int | None = None,
+        handler_max_attempts: int | None = None,
+        handler_retry_delay: float | None = None,
+        outbox_relay_interval: float | None = None,
+        test: bool | None = None,
+    ) -> Self:
+        env = EnvironmentVariablesReader(test=test)
+
+        if handler_concurrency is None:
+            handler_concurrency = int(
+                env.get("EVENTS_HANDLER_CONCURRENCY", default="16"),
+            )
+        if handler_max_attempts is None:
+            handler_max_attempts = int(
+                env.get("EVENTS_HANDLER_MAX_ATTEMPTS", default="3"),
+            )
+        if handler_retry_delay is None:
+            handler_retry_delay = float(
+                env.get("EVENTS_HANDLER_RETRY_DELAY_SECONDS", default="0.5"),
+            )
+        if outbox_relay_interval is None:
+            outbox_relay_interval = float(
+                env.get("EVENTS_OUTBOX_RELAY_INTERVAL_SECONDS", default="0"),
+            )
+
+        return cls(
+            handler_concurrency=handler_concurrency,
+            handler_max_attempts=handler_max_attempts,
+            handler_retry_delay=handler_retry_delay,
+            outbox_relay_interval=outbox_relay_interval,
+        )
+
+
+# maintenance jobs (see `babytroc.infrastructure.scheduler`) are considered
+# every `tick` seconds, 0 disables them.
+class MaintenanceConfig(NamedTuple):
+    tick: float
+
+    @classmethod
+    def from_env(
+        cls,
+        *,
+        tick: float | None = None,
+        test: bool | None = None,
+    ) -> Self:
+        env = EnvironmentVariablesReader(test=test)
+
+        if tick is None:
+            tick = float(
+                env.get("MAINTENANCE_TICK_SECONDS", default="30"),
+            )
+
+        return cls(
+            tick=tick,
+        )
+
+
 class EmailConfig(NamedTuple):
     server: str
     port: int
@@ -340,6 +485,8 @@ class S3Config(NamedTuple):
     secret_key: str
     bucket: str
     public_url: str
+    max_pool_connections: int = 20
+    keepalive_timeout: float = 60
 
     @classmethod
     def from_env(
@@ -349,6 +496,8 @@ class S3Config(NamedTuple):
         secret_key: str | None = None,
         bucket: str | None = None,
         public_url: str | None = None,
+        max_pool_connections: int | None = None,
+        keepalive_timeout: float | None = None,
         test: bool | None = None,
     ) -> Self:
         env = EnvironmentVariablesReader(test=test)
@@ -363,6 +512,14 @@ class S3Config(NamedTuple):
             bucket = env["S3_BUCKET"]
         if public_url is None:
             public_url = env["S3_PUBLIC_URL"]
+        if max_pool_connections is None:
+            max_pool_connections = int(
+                env.get("S3_MAX_POOL_CONNECTIONS", default="20"),
+            )
+        if keepalive_timeout is None:
+            keepalive_timeout = float(
+                env.get("S3_KEEPALIVE_TIMEOUT_SECONDS", default="60"),
+            )
 
         return cls(
             endpoint_url=endpoint_url,
@@ -370,6 +527,8 @@ class S3Config(NamedTuple):
             secret_key=secret_key,
             bucket=bucket,
             public_url=public_url,
+            max_pool_connections=max_pool_connections,
+            keepalive_timeout=keepalive_timeout,
         )
 
 
@@ -379,6 +538,7 @@ class AuthConfig(NamedTuple):
     refresh_token_duration: timedelta
     access_token_duration: timedelta
     account_password_reset_authorization_duration: timedelta
+    refresh_token_purge_interval: timedelta
 
     @classmethod
     def from_env(
@@ -388,6 +548,7 @@ class AuthConfig(NamedTuple):
         refresh_token_duration: timedelta | None = None,
         access_token_duration: timedelta | None = None,
         account_password_reset_authorization_duration: timedelta | None = None,
+        refresh_token_purge_interval: timedelta | None = None,
         test: bool | None = None,
     ) -> Self:
         env = EnvironmentVariablesReader(test=test)
@@ -430,12 +591,25 @@ class AuthConfig(NamedTuple):
                     ),
                 ),
             )
+
+        # expired refresh tokens are deleted periodically, 0 disables it
+        if refresh_token_purge_interval is None:
+            refresh_token_purge_interval = timedelta(
+                minutes=int(
+                    env.get(
+                        "JWT_REFRESH_TOKEN_PURGE_INTERVAL_MINUTES",
+                        default=60,
+                    ),
+                ),
+            )
+
         return cls(
             algorithm=algorithm,
             secret_key=secret_key,
             refresh_token_duration=refresh_token_duration,
             access_token_duration=access_token_duration,
             account_password_reset_authorization_duration=account_password_reset_authorization_duration,
+            refresh_token_purge_interval=refresh_token_purge_interval,
         )
 
 
@@ -518,6 +692,10 @@ class CapConfig(NamedTuple):
     api_url: str
     site_key: str
     secret_key: str
+    max_concurrency: int = 20
+    timeout: float = 5.0
+    # rejected tokens are cached for `result_cache_ttl` (0 disables it)
+    result_cache_ttl: timedelta = timedelta(seconds=30)
 
     @classmethod
     def from_env(
@@ -525,6 +703,9 @@ class CapConfig(NamedTuple):
         api_url: str | None = None,
         site_key: str | None = None,
         secret_key: str | None = None,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+        result_cache_ttl: timedelta | None = None,
         test: bool | None = None,
     ) -> Self:
         env = EnvironmentVariablesReader(test=test)
@@ -535,10 +716,21 @@ class CapConfig(NamedTuple):
             site_key = env["CAP_SITE_KEY"]
         if secret_key is None:
             secret_key = env["CAP_SECRET_KEY"]
+        if max_concurrency is None:
+            max_concurrency = int(env.get("CAP_MAX_CONCURRENCY", default="20"))
+        if timeout is None:
+            timeout = float(env.get("CAP_TIMEOUT_SECONDS", default="5"))
+        if result_cache_ttl is None:
+            result_cache_ttl = timedelta(
+                seconds=float(env.get("CAP_RESULT_CACHE_TTL_SECONDS", default="30")),
+            )
         return cls(
             api_url=api_url,
             site_key=site_key,
             secret_key=secret_key,
+            max_concurrency=max_concurrency,
+            timeout=timeout,
+            result_cache_ttl=result_cache_ttl,
         )
 
 
@@ -546,6 +738,11 @@ class ImageConfig(NamedTuple):
     max_upload_bytes: int
     max_pixels: int
     max_concurrent_processing_per_worker: int
+    max_queued_processing_per_worker: int
+    # images attached to no item are garbage collected once older than
+    # `orphan_grace_period`, every `gc_interval` (0 disables it)
+    orphan_grace_period: timedelta
+    gc_interval: timedelta
 
     @classmethod
     def from_env(cls, *, test: bool | None = None) -> Self:
@@ -569,6 +766,28 @@ class ImageConfig(NamedTuple):
                     default="4",
                 ),
             ),
+            max_queued_processing_per_worker=int(
+                env.get(
+                    "IMAGE_MAX_QUEUED_PROCESSING_PER_WORKER",
+                    default="8",
+                ),
+            ),
+            orphan_grace_period=timedelta(
+                hours=int(
+                    env.get(
+                        "IMAGE_ORPHAN_GRACE_PERIOD_HOURS",
+                        default="24",
+                    ),
+                ),
+            ),
+            gc_interval=timedelta(
+                minutes=int(
+                    env.get(
+                        "IMAGE_GC_INTERVAL_MINUTES",
+                        default="60",
+                    ),
+                ),
+            ),
         )
 
 
@@ -580,10 +799,14 @@ class Config(NamedTuple):
     delay: float
     database: DatabaseConfig
     pubsub: PubsubConfig
+    websocket: WebSocketConfig
+    events: EventsConfig
+    maintenance: MaintenanceConfig
     email: EmailConfig
     s3: S3Config
     image: ImageConfig
     redis: RedisConfig
+    cache: CacheConfig
     auth: AuthConfig
     contact: ContactConfig
     cap: CapConfig
@@ -602,10 +825,14 @@ class Config(NamedTuple):
         delay: float | None = None,
         database: DatabaseConfig | None = None,
         pubsub: PubsubConfig | None = None,
+        websocket: WebSocketConfig | None = None,
+        events: EventsConfig | None = None,
+        maintenance: MaintenanceConfig | None = None,
         email: EmailConfig | None = None,
         s3: S3Config | None = None,
         image: ImageConfig | None = None,
         redis: RedisConfig | None = None,
+        cache: CacheConfig | None = None,
         auth: AuthConfig | None = None,
         contact: ContactConfig | None = None,
         cap: CapConfig | None = None,
@@ -638,9 +865,21 @@ class Config(NamedTuple):
         if redis is None:
             redis = RedisConfig.from_env(test=test)
 
+        if cache is None:
+            cache = CacheConfig.from_env(test=test)
+
         if pubsub is None:
             pubsub = PubsubConfig.from_env(url=redis.url, test=test)
 
+        if websocket is None:
+            websocket = WebSocketConfig.from_env(test=test)
+
+        if events is None:
+            events = EventsConfig.from_env(test=test)
+
+        if maintenance is None:
+            maintenance = MaintenanceConfig.from_env(test=test)
+
         if email is None:
             email = EmailConfig.from_env(test=test)
 
@@ -700,10 +939,14 @@ class Config(NamedTuple):
             delay=delay,
             database=database,
             pubsub=pubsub,
+            websocket=websocket,
+            events=events,
+            maintenance=maintenance,
             email=email,
             s3=s3,
             image=image,
             redis=redis,
+            cache=cache,
             auth=auth,
             contact=contact,
             cap=cap,
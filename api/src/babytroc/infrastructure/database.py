@@ -1,5 +1,6 @@
+import logging
 import warnings
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable
 
 from sqlalchemy import URL
 from sqlalchemy.exc import SAWarning
@@ -8,6 +9,10 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 # make sqlalchemy warnings as errors
 warnings.simplefilter("error", SAWarning)
 
+logger = logging.getLogger(__name__)
+
+_AFTER_COMMIT_CALLBACKS_KEY = "_after_commit_callbacks"
+
 
 def create_session_maker(db_url: URL, **engine_kwargs) -> async_sessionmaker:
     engine = create_async_engine(
@@ -26,9 +31,38 @@ async def get_db_session() -> AsyncGenerator[AsyncSession]:
         yield session
     # Flush pub/sub notifications after the transaction has committed
     # (data is now visible to other connections)
+    from babytroc.infrastructure.events import dispatch_pending_events
     from babytroc.infrastructure.pubsub import flush_pending_notifications
 
     await flush_pending_notifications(session)
+    await run_after_commit_callbacks(session)
+    # non-critical event handlers run in the background, off the request
+    dispatch_pending_events(session)
+
+
+def after_commit(db: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """Queue a callback to be awaited after the session commits.
+
+    Callbacks are stored in ``session.info`` and run by
+    ``run_after_commit_callbacks``, like pub/sub notifications. They are
+    dropped if the transaction is rolled back.
+    """
+    db.info.setdefault(_AFTER_COMMIT_CALLBACKS_KEY, []).append(callback)
+
+
+async def run_after_commit_callbacks(db: AsyncSession) -> None:
+    """Await all queued callbacks, in order. Call after session commit.
+
+    A failing callback is logged, the transaction being already committed.
+    """
+    callbacks: list[Callable[[], Awaitable[None]]] = db.info.pop(
+        _AFTER_COMMIT_CALLBACKS_KEY, []
+    )
+    for callback in callbacks:
+        try:
+            await callback()
+        except Exception:
+            logger.exception("After commit callback failed")
 
 
 _session_maker: async_sessionmaker
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import uuid
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import DateTime, Integer, String, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import UUID
+
+from babytroc.infrastructure.events import (
+    EventHandlerExecutor,
+    decode_event,
+    non_critical_handlers,
+)
+from babytroc.shared.models import Base, CreationDate
+
+logger = logging.getLogger(__name__)
+
+# number of outbox entries claimed per transaction
+RELAY_BATCH_SIZE = 100
+
+# time a claimed outbox entry is left to its relay before others claim it again
+RELAY_LEASE = timedelta(minutes=5)
+
+
+class EventOutboxEntry(CreationDate, Base):
+    """Event whose non-critical handlers have not run yet."""
+
+    __tablename__ = "event_outbox"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID,
+        primary_key=True,
+    )
+
+    event_type: Mapped[str] = mapped_column(String)
+
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB)
+
+    # number of failed handlings of the event
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+    )
+
+    # the entry is claimed by a relay until then
+    lease_expiration_date: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+
+def add_outbox_entry(
+    db: AsyncSession,
+    *,
+    event_type: str,
+    payload: dict[str, Any],
+) -> uuid.UUID:
+    """Write an event to the outbox, within the transaction of `db`.
+
+    Returns the id of the entry, known before the transaction is committed.
+    """
+
+    entry_id = uuid.uuid4()
+    db.add(EventOutboxEntry(id=entry_id, event_type=event_type, payload=payload))
+    return entry_id
+
+
+async def delete_outbox_entries(
+    db: AsyncSession,
+    entry_ids: Iterable[uuid.UUID],
+) -> None:
+    await db.execute(
+        delete(EventOutboxEntry).where(EventOutboxEntry.id.in_(list(entry_ids)))
+    )
+
+
+async def mark_outbox_entry_failed(db: AsyncSession, entry_id: uuid.UUID) -> None:
+    await db.execute(
+        update(EventOutboxEntry)
+        .where(EventOutboxEntry.id == entry_id)
+        .values(attempts=EventOutboxEntry.attempts + 1)
+    )
+
+
+async def claim_outbox_entries(
+    db: AsyncSession,
+    *,
+    min_age: timedelta,
+) -> list[tuple[uuid.UUID, str, dict[str, Any]]]:
+    """Claim up to `RELAY_BATCH_SIZE` outbox entries older than `min_age`.
+
+    Claimed entries are leased for `RELAY_LEASE`, other relays skip them
+    until then. Returns the (id, event type, payload) of the claimed entries.
+    """
+
+    claimable = (
+        select(EventOutboxEntry.id)
+        .where(
+            EventOutboxEntry.creation_date < func.now() - min_age,
+            or_(
+                EventOutboxEntry.lease_expiration_date.is_(None),
+                EventOutboxEntry.lease_expiration_date < func.now(),
+            ),
+        )
+        .order_by(EventOutboxEntry.creation_date)
+        .limit(RELAY_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(EventOutboxEntry)
+        .where(EventOutboxEntry.id.in_(claimable.scalar_subquery()))
+        .values(lease_expiration_date=func.now() + RELAY_LEASE)
+        .returning(
+            EventOutboxEntry.id,
+            EventOutboxEntry.event_type,
+            EventOutboxEntry.payload,
+        )
+    )
+
+    return [tuple(row) for row in await db.execute(stmt)]
+
+
+async def relay_event_outbox(
+    session_maker: async_sessionmaker,
+    executor: EventHandlerExecutor,
+    *,
+    min_age: timedelta,
+) -> int:
+    """Handle the outbox entries older than `min_age` and delete them.
+
+    Younger entries are expected to be handled by the worker that emitted them.
+    Entries are claimed in a transaction of their own (see
+    `claim_outbox_entries`), then handled outside of any transaction. An entry
+    is deleted once handled, a failed one is left to be relayed again when
+    its lease expires.
+
+    Returns the number of relayed entries.
+    """
+
+    relayed = 0
+
+    while True:
+        async with session_maker.begin() as db:
+            entries = await claim_outbox_entries(db, min_age=min_age)
+
+        for entry_id, event_type, payload in entries:
+            event = decode_event(event_type, payload)
+            if event is None:
+                logger.warning(
+                    "Dropping outbox entry of unknown event type %s",
+                    event_type,
+                )
+                handled = True
+            else:
+                handled = await executor.handle(event, non_critical_handlers(event))
+
+            async with session_maker.begin() as db:
+                if handled:
+                    await delete_outbox_entries(db, [entry_id])
+                else:
+                    await mark_outbox_entry_failed(db, entry_id)
+
+            if handled:
+                relayed += 1
+
+        if len(entries) < RELAY_BATCH_SIZE:
+            return relayed
+
+
+async def run_event_outbox_relay(
+    session_maker: async_sessionmaker,
+    executor: EventHandlerExecutor,
+    *,
+    interval: float,
+) -> None:
+    """Relay the outbox entries left over every `interval` seconds. Runs forever."""
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            relayed = await relay_event_outbox(
+                session_maker,
+                executor,
+                min_age=timedelta(seconds=interval),
+            )
+        except Exception:
+            logger.exception("Failed to relay the event outbox")
+        else:
+            if relayed:
+                logger.info("Relayed %d event outbox entries", relayed)
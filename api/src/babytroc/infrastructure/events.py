@@ -1,6 +1,11 @@
+import asyncio
+import dataclasses
 import logging
+import uuid
 from collections import defaultdict
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from typing import Any
 
@@ -8,36 +13,257 @@ logger = logging.getLogger(__name__)
 
 type EventHandler = Callable[[Any, Any], Awaitable[None]]
 
+_PENDING_EVENTS_KEY = "_pending_events"
+
 
 @dataclass
 class _Registration:
     handler: EventHandler
     critical: bool
+    coalesce: Callable[[Any], Hashable] | None = None
+
+    def coalesce_key(self, event: object) -> Hashable:
+        return event if self.coalesce is None else self.coalesce(event)
+
+
+@dataclass
+class _PendingEvent:
+    event: object
+    registrations: list[_Registration]
+    outbox_entry_id: uuid.UUID | None = None
+
+
+@dataclass
+class _BatchedCall:
+    db: Any
+    event: object
+    registration: _Registration
 
 
 _handlers: dict[type, list[_Registration]] = defaultdict(list)
 
+# non-critical handler calls collected by the current `batch_events` scope, by
+# handler and coalesce key
+_batch: ContextVar[dict[tuple[EventHandler, Hashable], _BatchedCall] | None] = (
+    ContextVar("batch", default=None)
+)
+
+# event types with a registered handler, by name (see `event_type_name`)
+_event_types: dict[str, type] = {}
 
-def on(event_type: type, *, critical: bool = True):
-    """Register a handler for an event type."""
+
+def event_type_name(event_type: type) -> str:
+    return f"{event_type.__module__}.{event_type.__qualname__}"
+
+
+def on(
+    event_type: type,
+    *,
+    critical: bool = True,
+    coalesce: Callable[[Any], Hashable] | None = None,
+):
+    """Register a handler for an event type.
+
+    Within a `batch_events` scope, a non-critical handler runs once per distinct
+    `coalesce(event)` (by default, once per distinct event), on the first
+    event of each.
+    """
 
     def decorator(fn: EventHandler):
-        _handlers[event_type].append(_Registration(handler=fn, critical=critical))
+        _handlers[event_type].append(
+            _Registration(handler=fn, critical=critical, coalesce=coalesce)
+        )
+        _event_types[event_type_name(event_type)] = event_type
         return fn
 
     return decorator
 
 
+class EventHandlerExecutor:
+    """Run non-critical event handlers in the background.
+
+    At most `concurrency` events are handled at once. A failing handler is
+    retried up to `max_attempts` times in total, with an exponential backoff
+    starting at `retry_delay` seconds, then logged and given up.
+
+    With `outbox_session_maker`, events are also written to the event outbox
+    (see `babytroc.infrastructure.event_outbox`). Their entry is deleted once
+    handled, or left to the outbox relay if a handler was given up.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int,
+        max_attempts: int,
+        retry_delay: float,
+        outbox_session_maker: Any = None,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.outbox_session_maker = outbox_session_maker
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def submit(
+        self,
+        event: object,
+        handlers: list[EventHandler],
+        *,
+        outbox_entry_id: uuid.UUID | None = None,
+    ) -> None:
+        task = asyncio.create_task(
+            self._handle(event, handlers, outbox_entry_id=outbox_entry_id)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def handle(self, event: object, handlers: list[EventHandler]) -> bool:
+        """Run `handlers` on `event`, with retries. Never raises.
+
+        Returns whether every handler succeeded.
+        """
+
+        succeeded = True
+        for handler in handlers:
+            succeeded &= await self._run(handler, event)
+
+        return succeeded
+
+    async def drain(self) -> None:
+        """Wait for all submitted events to be handled."""
+
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _handle(
+        self,
+        event: object,
+        handlers: list[EventHandler],
+        *,
+        outbox_entry_id: uuid.UUID | None,
+    ) -> None:
+        async with self._semaphore:
+            handled = await self.handle(event, handlers)
+
+        if outbox_entry_id is not None and self.outbox_session_maker is not None:
+            from babytroc.infrastructure.event_outbox import (
+                delete_outbox_entries,
+                mark_outbox_entry_failed,
+            )
+
+            try:
+                async with self.outbox_session_maker.begin() as db:
+                    if handled:
+                        await delete_outbox_entries(db, [outbox_entry_id])
+                    else:
+                        # handled again by the outbox relay
+                        await mark_outbox_entry_failed(db, outbox_entry_id)
+            except Exception:
+                # handled again by the outbox relay, handlers are idempotent
+                logger.exception("Failed to update outbox entry %s", outbox_entry_id)
+
+    async def _run(self, handler: EventHandler, event: object) -> bool:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                # the transaction emitting the event is over
+                await handler(None, event)
+            except Exception:
+                if attempt >= self.max_attempts:
+                    logger.exception(
+                        "Non-critical handler %s failed for %s after %d attempts",
+                        handler.__name__,
+                        type(event).__name__,
+                        attempt,
+                    )
+                    return False
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+            else:
+                return True
+
+        return False
+
+
+_executor: EventHandlerExecutor | None = None
+
+
+def get_event_handler_executor() -> EventHandlerExecutor | None:
+    return _executor
+
+
+def init_event_handler_executor_dependency(
+    executor: EventHandlerExecutor | None,
+) -> None:
+    """Set the executor of non-critical handlers, None to run them inline."""
+    global _executor
+    _executor = executor
+
+
 async def emit(db: Any, event: object) -> None:
     """Dispatch event to all registered handlers.
 
-    Critical handlers propagate exceptions (rolling back the transaction).
-    Non-critical handlers log and swallow exceptions.
+    Critical handlers run inline and propagate exceptions (rolling back the
+    transaction).
+
+    Non-critical handlers log and swallow exceptions. Within a `batch_events`
+    scope, they are collected until the end of the scope. With an executor (see
+    `init_event_handler_executor_dependency`), they are queued in
+    ``db.info`` and submitted by ``dispatch_pending_events`` once the session
+    has committed, without a session. Otherwise, they run inline.
     """
+
+    batch = _batch.get()
+    non_critical: list[_Registration] = []
+
     for reg in _handlers[type(event)]:
         if reg.critical:
             await reg.handler(db, event)
+        elif batch is not None:
+            batch.setdefault(
+                (reg.handler, reg.coalesce_key(event)),
+                _BatchedCall(db=db, event=event, registration=reg),
+            )
         else:
+            non_critical.append(reg)
+
+    if non_critical:
+        await _dispatch_non_critical(db, event, non_critical)
+
+
+@asynccontextmanager
+async def batch_events() -> AsyncIterator[None]:
+    """Coalesce the non-critical handler calls of the events emitted within.
+
+    Meant for bulk operations emitting many events. Each distinct call (see
+    `on`) is dispatched once, when leaving the scope. Nothing is dispatched if
+    the scope exits with an exception. Nested scopes join the outermost one.
+    """
+
+    if _batch.get() is not None:
+        yield
+        return
+
+    batch: dict[tuple[EventHandler, Hashable], _BatchedCall] = {}
+    token = _batch.set(batch)
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+
+    for call in batch.values():
+        await _dispatch_non_critical(call.db, call.event, [call.registration])
+
+
+async def _dispatch_non_critical(
+    db: Any,
+    event: object,
+    registrations: list[_Registration],
+) -> None:
+    if _executor is None or not hasattr(db, "info"):
+        for reg in registrations:
             try:
                 await reg.handler(db, event)
             except Exception:
@@ -46,3 +272,51 @@ async def emit(db: Any, event: object) -> None:
                     reg.handler.__name__,
                     type(event).__name__,
                 )
+        return
+
+    outbox_entry_id = None
+    if _executor.outbox_session_maker is not None:
+        from babytroc.infrastructure.event_outbox import add_outbox_entry
+
+        outbox_entry_id = add_outbox_entry(
+            db,
+            event_type=event_type_name(type(event)),
+            payload=dataclasses.asdict(event),  # type: ignore[call-overload]
+        )
+
+    db.info.setdefault(_PENDING_EVENTS_KEY, []).append(
+        _PendingEvent(
+            event=event,
+            registrations=registrations,
+            outbox_entry_id=outbox_entry_id,
+        )
+    )
+
+
+def dispatch_pending_events(db: Any) -> None:
+    """Submit the non-critical handlers queued by `emit`. Call after commit."""
+
+    pending: list[_PendingEvent] = db.info.pop(_PENDING_EVENTS_KEY, [])
+
+    if not pending or _executor is None:
+        return
+
+    for item in pending:
+        _executor.submit(
+            item.event,
+            [reg.handler for reg in item.registrations],
+            outbox_entry_id=item.outbox_entry_id,
+        )
+
+
+def non_critical_handlers(event: object) -> list[EventHandler]:
+    return [reg.handler for reg in _handlers[type(event)] if not reg.critical]
+
+
+def decode_event(event_type: str, payload: dict[str, Any]) -> object | None:
+    """Event of type named `event_type`, None if no such type is registered."""
+
+    cls = _event_types.get(event_type)
+    if cls is None:
+        return None
+    return cls(**payload)
@@ -1,12 +1,78 @@
 import asyncio
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
 
-_image_processing_semaphore: asyncio.Semaphore
+from babytroc.shared.image import configure_pillow_pixel_limit
 
 
-def init_image_processing_dependency(semaphore: asyncio.Semaphore) -> None:
-    global _image_processing_semaphore
-    _image_processing_semaphore = semaphore
+class ImageEngineSaturatedError(Exception):
+    """Raised when the image engine already holds as many jobs as it accepts."""
 
 
-def get_image_processing_semaphore() -> asyncio.Semaphore:
-    return _image_processing_semaphore
+class ImageEngine:
+    """Run CPU-bound image processing on `executor`, off the event loop.
+
+    At most `max_pending` jobs are accepted at once, running or waiting for the
+    executor. Beyond that, `run` fails fast with `ImageEngineSaturatedError`
+    instead of queueing.
+    """
+
+    def __init__(self, executor: Executor, *, max_pending: int) -> None:
+        self.executor = executor
+        self.max_pending = max_pending
+        self._pending = 0
+
+    def __len__(self) -> int:
+        return self._pending
+
+    async def run[*Ts, T](self, fn: Callable[[*Ts], T], *args: *Ts) -> T:
+        """Run `fn(*args)` on the executor (picklable with a process pool)."""
+
+        if self._pending >= self.max_pending:
+            raise ImageEngineSaturatedError
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, fn, *args)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def create_image_engine(
+    *,
+    processes: int,
+    queue_size: int,
+    max_pixels: int,
+) -> ImageEngine:
+    """Image engine backed by a pool of `processes` processes.
+
+    Up to `queue_size` jobs wait for a free process. The decompression-bomb cap
+    of Pillow is set to `max_pixels` in each process.
+    """
+
+    executor = ProcessPoolExecutor(
+        max_workers=processes,
+        # the event loop and its threads must not be forked
+        mp_context=multiprocessing.get_context("forkserver"),
+        initializer=configure_pillow_pixel_limit,
+        initargs=(max_pixels,),
+    )
+
+    return ImageEngine(executor, max_pending=processes + queue_size)
+
+
+_image_engine: ImageEngine
+
+
+def init_image_engine_dependency(engine: ImageEngine) -> None:
+    global _image_engine
+    _image_engine = engine
+
+
+def get_image_engine() -> ImageEngine:
+    return _image_engine
@@ -1,10 +1,39 @@
+import asyncio
+from collections import defaultdict
+
 from broadcaster import Broadcast
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from babytroc.domains.chat.schemas.pubsub import PubsubMessage
+from babytroc.domains.chat.schemas.pubsub import (
+    PubsubMessage,
+    PubsubMessageUpdatedChatMessage,
+)
 
 _PENDING_NOTIFICATIONS_KEY = "_pending_pubsub_notifications"
 
+# maximum number of channels published to concurrently, without a pipeline
+MAX_CONCURRENT_PUBLISHES = 16
+
+EVENT_ID_PATTERN = r"^\d+-\d+$"
+
+# KEYS[1]: event log stream of the channel
+# ARGV[1]: channel, ARGV[2]: payload (a JSON object)
+# ARGV[3]: approximate max length of the stream, ARGV[4]: stream TTL in seconds
+#
+# The event id is added to the published payload, not to the logged one.
+_PUBLISH_EVENT_SCRIPT = """
+local id = redis.call("XADD", KEYS[1], "MAXLEN", "~", ARGV[3], "*", "payload", ARGV[2])
+redis.call("EXPIRE", KEYS[1], ARGV[4])
+redis.call(
+    "PUBLISH",
+    ARGV[1],
+    '{"event_id":"' .. id .. '",' .. string.sub(ARGV[2], 2)
+)
+return id
+"""
+
 
 def get_broadcast() -> Broadcast:
     return _broadcast
@@ -12,31 +41,129 @@ def get_broadcast() -> Broadcast:
 
 _broadcast: Broadcast
 _channel_prefix: str = ""
+_redis: Redis | None = None
+_publish_event_script: AsyncScript | None = None
+_event_log_max_length: int = 0
+_event_log_ttl: int = 0
 
 
 def init_broadcast_dependency(
     broadcast: Broadcast,
     *,
     channel_prefix: str = "",
+    redis: Redis | None = None,
+    event_log_max_length: int = 0,
+    event_log_ttl: int = 0,
 ) -> None:
-    global _broadcast, _channel_prefix
+    """Set the broadcast used to notify users.
+
+    If given, `redis` must be the connection of the Redis backend of `broadcast`.
+    It is used to publish pending notifications through a single pipeline.
+
+    With `redis`, a positive `event_log_max_length` and `event_log_ttl`, the
+    notifications of each user are also logged in a Redis stream (see
+    `read_user_events`), kept `event_log_ttl` seconds after the last notification.
+    """
+    global _broadcast, _channel_prefix, _redis, _publish_event_script
+    global _event_log_max_length, _event_log_ttl
     _broadcast = broadcast
     _channel_prefix = channel_prefix
+    _redis = redis
+    _publish_event_script = (
+        redis.register_script(_PUBLISH_EVENT_SCRIPT)
+        if redis is not None and event_log_max_length > 0 and event_log_ttl > 0
+        else None
+    )
+    _event_log_max_length = event_log_max_length
+    _event_log_ttl = event_log_ttl
 
 
 def user_channel(user_id: int) -> str:
     return f"{_channel_prefix}user{user_id}"
 
 
+def user_channel_pattern() -> str:
+    """Pattern matching the channels of all users."""
+    return f"{_channel_prefix}user*"
+
+
+def user_id_from_channel(channel: str) -> int | None:
+    """User id of a user `channel`, None if `channel` is not a user channel."""
+    prefix = f"{_channel_prefix}user"
+    if not channel.startswith(prefix):
+        return None
+    try:
+        return int(channel.removeprefix(prefix))
+    except ValueError:
+        return None
+
+
+def events_key(channel: str) -> str:
+    """Key of the event log stream of `channel`."""
+    return f"{channel}:events"
+
+
+def event_id_key(event_id: str) -> tuple[int, int]:
+    """Sort key of a stream `event_id`."""
+    milliseconds, sequence = event_id.split("-")
+    return int(milliseconds), int(sequence)
+
+
+def cache_invalidation_channel() -> str:
+    return f"{_channel_prefix}cache_invalidation"
+
+
 async def notify_user(
     broadcast: Broadcast,
     user_id: int,
     message: PubsubMessage,
 ) -> None:
-    await broadcast.publish(
-        channel=user_channel(user_id),
-        message=message.model_dump_json(),
-    )
+    channel = user_channel(user_id)
+    # the event id is set when publishing
+    payload = message.model_dump_json(exclude={"event_id"})
+
+    if _redis is not None and broadcast is _broadcast:
+        await _publish_pipelined(_redis, {channel: [payload]})
+    else:
+        await broadcast.publish(channel=channel, message=payload)
+
+
+async def read_user_events(
+    user_id: int,
+    *,
+    after: str,
+) -> list[tuple[str, str]] | None:
+    """Logged notifications of user with `user_id` following event `after`.
+
+    Returns a list of (event id, payload) pairs, or None if the event `after` is
+    no longer logged: the following events may have been lost. A missing log
+    means the user had no notification for `event_log_ttl` seconds, hence no
+    events are returned.
+    """
+
+    if _redis is None or _publish_event_script is None:
+        return None
+
+    key = events_key(user_channel(user_id))
+
+    async with _redis.pipeline(transaction=True) as pipe:
+        pipe.exists(key)
+        pipe.xrange(key, min=after, max="+")
+        exists, entries = await pipe.execute()
+
+    if not exists:
+        return []
+
+    raw_entries: list[tuple[bytes, dict[bytes, bytes]]] = entries
+    events = [
+        (event_id.decode(), fields[b"payload"].decode())
+        for event_id, fields in raw_entries
+    ]
+
+    if not events or events[0][0] != after:
+        return None
+
+    return events[1:]
 
 
 def notify_user_after_commit(
@@ -50,16 +177,78 @@ def notify_user_after_commit(
     Notifications are stored in ``session.info`` and flushed by
     ``flush_pending_notifications`` which must be called after the session
     transaction has been committed (i.e. after the data is visible).
+
+    An updated chat message notification replaces any pending notification of
+    the same update to the same user.
     """
     channel = user_channel(user_id)
-    payload = message.model_dump_json()
+    # the event id is set when publishing
+    payload = message.model_dump_json(exclude={"event_id"})
+
+    key: object
+    if isinstance(message, PubsubMessageUpdatedChatMessage):
+        key = (broadcast, channel, message.type, message.chat_message_id)
+    else:
+        key = object()
 
-    pending = db.info.setdefault(_PENDING_NOTIFICATIONS_KEY, [])
-    pending.append((broadcast, channel, payload))
+    pending: dict[object, tuple[Broadcast, str, str]] = db.info.setdefault(
+        _PENDING_NOTIFICATIONS_KEY, {}
+    )
+    # the replacing notification is published in its own position
+    pending.pop(key, None)
+    pending[key] = (broadcast, channel, payload)
 
 
 async def flush_pending_notifications(db: AsyncSession) -> None:
-    """Publish all queued notifications. Call after session commit."""
-    pending = db.info.pop(_PENDING_NOTIFICATIONS_KEY, [])
-    for broadcast, channel, payload in pending:
-        await broadcast.publish(channel=channel, message=payload)
+    """Publish all queued notifications. Call after session commit.
+
+    Notifications are grouped per channel, each channel keeping the order in
+    which they were queued. They are sent through a single Redis pipeline when
+    possible, otherwise channels are published to concurrently.
+    """
+    pending: dict[object, tuple[Broadcast, str, str]] = db.info.pop(
+        _PENDING_NOTIFICATIONS_KEY, {}
+    )
+
+    grouped: dict[Broadcast, dict[str, list[str]]] = defaultdict(
+        lambda: defaultdict(list)
+    )
+    for broadcast, channel, payload in pending.values():
+        grouped[broadcast][channel].append(payload)
+
+    for broadcast, channels in grouped.items():
+        if _redis is not None and broadcast is _broadcast:
+            await _publish_pipelined(_redis, channels)
+        else:
+            await _publish_concurrently(broadcast, channels)
+
+
+async def _publish_pipelined(redis: Redis, channels: dict[str, list[str]]) -> None:
+    async with redis.pipeline(transaction=False) as pipe:
+        for channel, payloads in channels.items():
+            for payload in payloads:
+                if _publish_event_script is None:
+                    pipe.publish(channel, payload)
+                else:
+                    await _publish_event_script(
+                        keys=[events_key(channel)],
+                        args=[channel, payload, _event_log_max_length, _event_log_ttl],
+                        client=pipe,
+                    )
+        await pipe.execute()
+
+
+async def _publish_concurrently(
+    broadcast: Broadcast,
+    channels: dict[str, list[str]],
+) -> None:
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PUBLISHES)
+
+    async def publish(channel: str, payloads: list[str]) -> None:
+        async with semaphore:
+            for payload in payloads:
+                await broadcast.publish(channel=channel, message=payload)
+
+    await asyncio.gather(
+        *(publish(channel, payloads) for channel, payloads in channels.items())
+    )
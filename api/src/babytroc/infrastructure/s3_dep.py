@@ -0,0 +1,7 @@
+from fastapi import Request
+
+from babytroc.infrastructure.storage import S3Client
+
+
+def get_s3_client(request: Request) -> S3Client:
+    return request.app.state.s3_client
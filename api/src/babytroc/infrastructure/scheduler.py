@@ -0,0 +1,223 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from babytroc.infrastructure.storage import S3Client
+
+logger = logging.getLogger(__name__)
+
+# Prefix of the locks electing the worker that runs a job. A lock is held for
+# the interval of its job, so that the job runs once per interval per cluster.
+_LOCK_KEY_PREFIX = "babytroc:maintenance:lock:"
+
+# Hash of the last run of each job, by job name.
+RUNS_KEY = "babytroc:maintenance:runs"
+
+# Release a lock only if it is still held by the given token.
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass(frozen=True)
+class JobContext:
+    """What maintenance jobs run with."""
+
+    config: Any
+    session_maker: async_sessionmaker
+    redis: Redis
+    s3: S3Client | None = None
+
+
+type Job = Callable[[JobContext], Awaitable[Mapping[str, int] | None]]
+
+
+@dataclass
+class _ScheduledJob:
+    name: str
+    fn: Job
+    interval: timedelta | Callable[[Any], timedelta]
+
+    def get_interval(self, config: Any) -> timedelta:
+        if isinstance(self.interval, timedelta):
+            return self.interval
+        return self.interval(config)
+
+
+@dataclass(frozen=True)
+class JobRun:
+    """Outcome of a job run, with the counts it returned (e.g. deleted rows)."""
+
+    name: str
+    start_date: datetime
+    duration: float
+    counts: dict[str, int] = field(default_factory=dict)
+    error: str | None = None
+
+
+_jobs: dict[str, _ScheduledJob] = {}
+
+
+def job(name: str, *, interval: timedelta | Callable[[Any], timedelta]):
+    """Register a maintenance job, run every `interval` by one worker.
+
+    `interval` is either fixed or read from the app config, a null interval
+    disables the job. The job returns the counts to record (e.g. the number of
+    deleted rows), if any.
+    """
+
+    def decorator(fn: Job):
+        _jobs[name] = _ScheduledJob(name=name, fn=fn, interval=interval)
+        return fn
+
+    return decorator
+
+
+def registered_jobs() -> list[_ScheduledJob]:
+    return list(_jobs.values())
+
+
+class MaintenanceScheduler:
+    """Run the registered maintenance jobs periodically.
+
+    Every `tick` seconds, each worker tries to take the Redis lock of each job,
+    and runs the jobs it got. A lock expires after the interval of its job,
+    hence each job runs about once per interval in the cluster, whatever the
+    number of workers. The lock of a failed run is released, to be retried on
+    the next tick.
+
+    Each run is logged and recorded in Redis (see `RUNS_KEY`).
+    """
+
+    def __init__(
+        self,
+        context: JobContext,
+        *,
+        tick: float,
+        jobs: Iterable[_ScheduledJob] | None = None,
+    ) -> None:
+        self.context = context
+        self.tick = tick
+        self.jobs = registered_jobs() if jobs is None else list(jobs)
+        self._release_lock_script = context.redis.register_script(_RELEASE_LOCK_SCRIPT)
+
+    async def run(self) -> None:
+        """Run the jobs as they are due. Runs forever."""
+
+        while True:
+            await asyncio.sleep(self.tick)
+            await self.run_due_jobs()
+
+    async def run_due_jobs(self) -> list[JobRun]:
+        """Run the jobs whose lock could be taken, one after the other."""
+
+        runs = []
+
+        for scheduled_job in self.jobs:
+            interval = scheduled_job.get_interval(self.context.config)
+            if interval <= timedelta(0):
+                continue
+
+            try:
+                run = await self._run_if_elected(scheduled_job, interval)
+            except Exception:
+                logger.exception(
+                    "Failed to schedule maintenance job %s", scheduled_job.name
+                )
+                continue
+
+            if run is not None:
+                runs.append(run)
+
+        return runs
+
+    async def run_job(self, scheduled_job: _ScheduledJob) -> JobRun:
+        """Run `scheduled_job` now, regardless of the lock, and record the run."""
+
+        start_date = datetime.now(UTC)
+        start = time.perf_counter()
+
+        try:
+            counts = await scheduled_job.fn(self.context)
+        except Exception as error:
+            logger.exception("Maintenance job %s failed", scheduled_job.name)
+            run = JobRun(
+                name=scheduled_job.name,
+                start_date=start_date,
+                duration=time.perf_counter() - start,
+                error=repr(error),
+            )
+        else:
+            run = JobRun(
+                name=scheduled_job.name,
+                start_date=start_date,
+                duration=time.perf_counter() - start,
+                counts=dict(counts or {}),
+            )
+            logger.info(
+                "Maintenance job %s done in %.3fs %s",
+                run.name,
+                run.duration,
+                run.counts,
+            )
+
+        await self.context.redis.hset(RUNS_KEY, run.name, _encode_run(run))
+
+        return run
+
+    async def _run_if_elected(
+        self,
+        scheduled_job: _ScheduledJob,
+        interval: timedelta,
+    ) -> JobRun | None:
+        lock_key = f"{_LOCK_KEY_PREFIX}{scheduled_job.name}"
+        token = uuid.uuid4().hex
+
+        elected = await self.context.redis.set(
+            lock_key,
+            token,
+            nx=True,
+            px=int(interval.total_seconds() * 1000),
+        )
+        if not elected:
+            return None
+
+        run = await self.run_job(scheduled_job)
+
+        if run.error is not None:
+            await self._release_lock_script(keys=[lock_key], args=[token])
+
+        return run
+
+
+async def get_job_runs(redis: Redis) -> dict[str, JobRun]:
+    """Last recorded run of each job, by job name."""
+
+    raw_runs = await redis.hgetall(RUNS_KEY)
+
+    return {
+        (name.decode() if isinstance(name, bytes) else name): _decode_run(value)
+        for name, value in raw_runs.items()
+    }
+
+
+def _encode_run(run: JobRun) -> str:
+    return json.dumps(asdict(run), default=datetime.isoformat)
+
+
+def _decode_run(value: bytes | str) -> JobRun:
+    data = json.loads(value)
+    data["start_date"] = datetime.fromisoformat(data["start_date"])
+    return JobRun(**data)
@@ -1,54 +1,127 @@
 import asyncio
+from collections.abc import Sequence
+from contextlib import AsyncExitStack
 from io import BytesIO
+from typing import Any
 
 import aioboto3
+from aiobotocore.config import AioConfig  # type: ignore[import-untyped]
 
 from babytroc.infrastructure.config import S3Config
 
 IMAGE_SIZES = (128, 256, 512, 1024)
 
+# maximum number of keys of a single DeleteObjects request
+DELETE_OBJECTS_MAX_KEYS = 1000
+
+
+class S3Client:
+    """Long-lived S3 client, sharing its connection pool across requests.
+
+    The underlying client is opened on first use (see `get`), credentials are
+    resolved once, and connections are kept alive between requests. It must be
+    closed with `close`.
+    """
+
+    def __init__(self, config: S3Config) -> None:
+        self.config = config
+        self._session = aioboto3.Session()
+        self._client: Any = None
+        self._exit_stack = AsyncExitStack()
+        self._lock = asyncio.Lock()
+
+    @property
+    def bucket(self) -> str:
+        return self.config.bucket
+
+    async def get(self) -> Any:
+        """The underlying aiobotocore client, opened if needed."""
+
+        if self._client is None:
+            async with self._lock:
+                if self._client is None:
+                    self._client = await self._exit_stack.enter_async_context(
+                        self._session.client(
+                            "s3",
+                            endpoint_url=self.config.endpoint_url,
+                            aws_access_key_id=self.config.access_key,
+                            aws_secret_access_key=self.config.secret_key,
+                            config=AioConfig(
+                                max_pool_connections=self.config.max_pool_connections,
+                                connector_args={
+                                    "keepalive_timeout": self.config.keepalive_timeout,
+                                },
+                            ),
+                        )
+                    )
+
+        return self._client
+
+    async def close(self) -> None:
+        await self._exit_stack.aclose()
+        self._client = None
 
-def _get_s3_client(config: S3Config):
-    session = aioboto3.Session()
-    return session.client(
-        "s3",
-        endpoint_url=config.endpoint_url,
-        aws_access_key_id=config.access_key,
-        aws_secret_access_key=config.secret_key,
-    )
+
+def create_s3_client(config: S3Config) -> S3Client:
+    return S3Client(config)
 
 
 def image_key(name: str, size: int) -> str:
     return f"{name}_{size}.webp"
 
 
+def image_variant_keys(name: str) -> list[str]:
+    return [image_key(name, size) for size in IMAGE_SIZES]
+
+
 async def upload_image_variants(
-    config: S3Config,
+    s3: S3Client,
     name: str,
     variants: dict[int, BytesIO],
 ) -> None:
-    async with _get_s3_client(config) as client:
-        await asyncio.gather(
-            *(
-                client.put_object(
-                    Bucket=config.bucket,
-                    Key=image_key(name, size),
-                    Body=data.getvalue(),
-                    ContentType="image/webp",
-                )
-                for size, data in variants.items()
+    client = await s3.get()
+    await asyncio.gather(
+        *(
+            client.put_object(
+                Bucket=s3.bucket,
+                Key=image_key(name, size),
+                Body=data.getvalue(),
+                ContentType="image/webp",
             )
+            for size, data in variants.items()
         )
+    )
 
 
 async def delete_image_variants(
-    config: S3Config,
+    s3: S3Client,
     name: str,
 ) -> None:
-    async with _get_s3_client(config) as client:
-        await client.delete_objects(
-            Bucket=config.bucket,
+    await delete_objects(s3, image_variant_keys(name))
+
+
+async def delete_objects(
+    s3: S3Client,
+    keys: Sequence[str],
+) -> list[str]:
+    """Delete `keys` with as few DeleteObjects requests as possible.
+
+    Returns the keys that could not be deleted. Missing keys are not errors.
+    """
+
+    client = await s3.get()
+    failed: list[str] = []
+
+    for i in range(0, len(keys), DELETE_OBJECTS_MAX_KEYS):
+        response = await client.delete_objects(
+            Bucket=s3.bucket,
             Delete={
-                "Objects": [{"Key": image_key(name, size)} for size in IMAGE_SIZES],
+                "Objects": [
+                    {"Key": key} for key in keys[i : i + DELETE_OBJECTS_MAX_KEYS]
+                ],
+                "Quiet": True,
             },
         )
+        failed.extend(error["Key"] for error in response.get("Errors", []))
+
+    return failed
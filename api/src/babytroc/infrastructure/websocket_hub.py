@@ -0,0 +1,175 @@
+import asyncio
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from redis.asyncio import Redis
+
+from babytroc.infrastructure.pubsub import user_channel_pattern, user_id_from_channel
+
+logger = logging.getLogger(__name__)
+
+
+def get_websocket_hub() -> "WebSocketHub":
+    return _websocket_hub
+
+
+_websocket_hub: "WebSocketHub"
+
+
+def init_websocket_hub_dependency(websocket_hub: "WebSocketHub") -> None:
+    global _websocket_hub
+    _websocket_hub = websocket_hub
+
+
+class HubConnection:
+    """A websocket of `user_id` registered in the `WebSocketHub`.
+
+    Notifications are queued in a bounded queue, consumed by iterating over the
+    connection. The iteration ends once the connection is evicted.
+    """
+
+    def __init__(self, user_id: int, *, queue_size: int) -> None:
+        self.user_id = user_id
+        self.evicted = False
+        self._queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=queue_size)
+
+    def push(self, payload: str) -> bool:
+        """Queue `payload`. Returns False if the queue is full."""
+
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def evict(self) -> None:
+        """Drop the queued notifications and end the iteration."""
+
+        self.evicted = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    def __aiter__(self) -> "HubConnection":
+        return self
+
+    async def __anext__(self) -> str:
+        payload = await self._queue.get()
+        if payload is None:
+            raise StopAsyncIteration
+        return payload
+
+
+class WebSocketHub:
+    """Per-worker dispatcher of the user notifications to the websockets.
+
+    A single pattern subscription receives the notifications published on any
+    user channel. Each one is pushed to the connections of its user, registered
+    with `connect`.
+
+    A connection whose queue is full is a slow consumer: it is evicted instead
+    of delaying the others or buffering without bound. Sending to a websocket
+    should not take longer than `send_timeout` seconds either.
+
+    A lost subscription is retried with an exponential backoff, from
+    `reconnect_delay` up to `max_reconnect_delay` seconds.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        queue_size: int,
+        send_timeout: float,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ) -> None:
+        if queue_size <= 0:
+            msg = "The queue size must be positive"
+            raise ValueError(msg)
+
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._redis = redis
+        self._connections: dict[int, set[HubConnection]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(connections) for connections in self._connections.values())
+
+    @contextmanager
+    def connect(self, user_id: int) -> Iterator[HubConnection]:
+        """Register a connection receiving the notifications of `user_id`."""
+
+        connection = HubConnection(user_id, queue_size=self.queue_size)
+        self._connections.setdefault(user_id, set()).add(connection)
+
+        try:
+            yield connection
+
+        finally:
+            self._discard(connection)
+
+    def dispatch(self, user_id: int, payload: str) -> None:
+        """Push `payload` to every connection of `user_id`."""
+
+        for connection in list(self._connections.get(user_id, ())):
+            if not connection.push(payload):
+                logger.warning("Evicting slow websocket consumer of user %i", user_id)
+                connection.evict()
+                self._discard(connection)
+
+    async def run(self) -> None:
+        """Dispatch the published notifications. Runs forever."""
+
+        delay = self.reconnect_delay
+
+        while True:
+            try:
+                async with self._redis.pubsub(
+                    ignore_subscribe_messages=True,
+                ) as pubsub:
+                    await pubsub.psubscribe(user_channel_pattern())
+                    delay = self.reconnect_delay
+
+                    async for message in pubsub.listen():
+                        self._dispatch_message(message)
+
+                logger.warning("Notifications subscription ended, resubscribing")
+
+            # notifications published until resubscription are lost
+            except Exception:
+                logger.exception("Notifications subscription lost, resubscribing")
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _dispatch_message(self, message: dict[str, Any]) -> None:
+        if message["type"] != "pmessage":
+            return
+
+        channel = message["channel"]
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+
+        user_id = user_id_from_channel(channel)
+        if user_id is None:
+            return
+
+        payload = message["data"]
+        if isinstance(payload, bytes):
+            payload = payload.decode()
+
+        self.dispatch(user_id, payload)
+
+    def _discard(self, connection: HubConnection) -> None:
+        connections = self._connections.get(connection.user_id)
+        if connections is None:
+            return
+
+        connections.discard(connection)
+        if not connections:
+            del self._connections[connection.user_id]
@@ -1,12 +1,14 @@
 from typing import Annotated
 
 from fastapi import Depends, Form, Request, Response
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from babytroc.domains.auth import services as auth_services
 from babytroc.domains.auth.schemas.credentials import UserCredentialsInfo
 from babytroc.domains.auth.schemas.form import AuthPasswordForm
 from babytroc.infrastructure.database import get_db_session
+from babytroc.infrastructure.redis_dep import get_redis
 
 from .cookies import set_response_with_token_cookies
 from .router import router
@@ -18,11 +20,13 @@ async def login(
     response: Response,
     form_data: Annotated[AuthPasswordForm, Form()],
     db: Annotated[AsyncSession, Depends(get_db_session)],
+    redis: Annotated[Redis, Depends(get_redis)],
 ) -> UserCredentialsInfo:
     """Get credentials from password."""
 
     credentials = await auth_services.login_user(
         db=db,
+        redis=redis,
         email=form_data.username,
         password=form_data.password,
         config=request.app.state.config.auth,
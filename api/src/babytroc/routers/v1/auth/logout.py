@@ -1,4 +1,13 @@
-from fastapi import Request, Response
+from typing import Annotated
+
+from fastapi import Depends, Request, Response
+from fastapi.security.utils import get_authorization_scheme_param
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from babytroc.domains.auth import services as auth_services
+from babytroc.infrastructure.database import get_db_session
+from babytroc.infrastructure.redis_dep import get_redis
 
 from .cookies import reset_response_token_cookies
 from .router import router
@@ -8,8 +17,21 @@ from .router import router
 async def logout(
     request: Request,
     response: Response,
+    db: Annotated[AsyncSession, Depends(get_db_session)],
+    redis: Annotated[Redis, Depends(get_redis)],
 ) -> None:
-    """Remove credentials cookies."""
+    """Revoke the refresh token and remove credentials cookies."""
+
+    authorization = request.cookies.get("refresh_token")
+    scheme, token = get_authorization_scheme_param(authorization)
+
+    if authorization and scheme.lower() == "bearer":
+        await auth_services.revoke_refresh_token(
+            db=db,
+            redis=redis,
+            token=token,
+            config=request.app.state.config.auth,
+        )
 
     reset_response_token_cookies(
         response=response,
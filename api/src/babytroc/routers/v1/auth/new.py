@@ -2,14 +2,18 @@ from typing import TYPE_CHECKING, Annotated
 
 from fastapi import BackgroundTasks, Depends, Request, Response
 from fastapi_mail import FastMail
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from babytroc.domains.auth import services as auth_services
 from babytroc.domains.auth.schemas.credentials import UserCredentialsInfo
 from babytroc.domains.user import services as user_services
 from babytroc.domains.user.schemas.create import UserCreate
+from babytroc.infrastructure.cap import CapVerifier
+from babytroc.infrastructure.cap_dep import get_cap_verifier
 from babytroc.infrastructure.database import get_db_session
 from babytroc.infrastructure.email import get_email_client
+from babytroc.infrastructure.redis_dep import get_redis
 from babytroc.shared.antibot import AntiBotMixin, verify_antibot
 from babytroc.shared.rate_limit import make_rate_limit_dep
 
@@ -33,17 +37,19 @@ rate_limit_signup = make_rate_limit_dep(
 @router.post("/new")
 async def create_user(
     db: Annotated[AsyncSession, Depends(get_db_session)],
+    redis: Annotated[Redis, Depends(get_redis)],
     email_client: Annotated[FastMail, Depends(get_email_client)],
     background_tasks: BackgroundTasks,
     user_create_request: UserCreateRequest,
     request: Request,
     response: Response,
     _rate_limited: Annotated[None, Depends(rate_limit_signup)],
+    cap_verifier: Annotated[CapVerifier, Depends(get_cap_verifier)],
 ) -> UserCredentialsInfo:
     """Create a new user."""
 
     config: Config = request.app.state.config
-    await verify_antibot(user_create_request, config.cap)
+    await verify_antibot(user_create_request, cap_verifier)
 
     user_create = UserCreate.model_validate(
         user_create_request.model_dump(exclude={"cap_token", "website"}),
@@ -60,6 +66,7 @@ async def create_user(
 
     credentials = await auth_services.login_user(
         db=db,
+        redis=redis,
         email=user_create.email,
         password=user_create.password,
         config=config.auth,
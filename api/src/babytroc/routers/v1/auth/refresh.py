@@ -2,12 +2,14 @@ from typing import Annotated
 
 from fastapi import Depends, Request, Response
 from fastapi.security.utils import get_authorization_scheme_param
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from babytroc.domains.auth import services as auth_services
 from babytroc.domains.auth.errors import InvalidCredentialError
 from babytroc.domains.auth.schemas.credentials import UserCredentialsInfo
 from babytroc.infrastructure.database import get_db_session
+from babytroc.infrastructure.redis_dep import get_redis
 
 from .cookies import set_response_with_token_cookies
 from .router import router
@@ -18,6 +20,7 @@ async def refresh_credentials(
     request: Request,
     response: Response,
     db: Annotated[AsyncSession, Depends(get_db_session)],
+    redis: Annotated[Redis, Depends(get_redis)],
 ) -> UserCredentialsInfo:
     """Refresh credentials."""
 
@@ -34,6 +37,7 @@ async def refresh_credentials(
 
     credentials = await auth_services.refresh_user_credentials(
         db=db,
+        redis=redis,
         refresh_token=token,
         config=request.app.state.config.auth,
     )
@@ -14,6 +14,8 @@ from babytroc.domains.auth.schemas.reset import (
     AuthAccountPasswordResetDone,
 )
 from babytroc.domains.user.schemas.update import UserPasswordUpdate
+from babytroc.infrastructure.cap import CapVerifier
+from babytroc.infrastructure.cap_dep import get_cap_verifier
 from babytroc.infrastructure.database import get_db_session
 from babytroc.infrastructure.email import get_email_client
 from babytroc.shared.antibot import AntiBotMixin, verify_antibot
@@ -43,11 +45,12 @@ async def create_account_password_reset_authorization(
     background_tasks: BackgroundTasks,
     reset_request: PasswordResetRequest,
     _rate_limited: Annotated[None, Depends(rate_limit_password_reset)],
+    cap_verifier: Annotated[CapVerifier, Depends(get_cap_verifier)],
 ) -> AuthAccountPasswordResetAuthorizationCreated:
     """Send an account password reset authorization by email."""
 
     config: Config = request.app.state.config
-    await verify_antibot(reset_request, config.cap)
+    await verify_antibot(reset_request, cap_verifier)
 
     await auth_services.create_account_password_reset_authrorization(
         db=db,
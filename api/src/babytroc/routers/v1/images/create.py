@@ -1,4 +1,3 @@
-import asyncio
 from typing import Annotated
 
 from fastapi import Depends, Request, Response, UploadFile, status
@@ -8,7 +7,9 @@ from babytroc.domains.image import services as image_services
 from babytroc.domains.image.errors import ImageTooLargeError
 from babytroc.domains.image.schemas.read import ItemImageRead
 from babytroc.infrastructure.database import get_db_session
-from babytroc.infrastructure.image_processing import get_image_processing_semaphore
+from babytroc.infrastructure.image_processing import ImageEngine, get_image_engine
+from babytroc.infrastructure.s3_dep import get_s3_client
+from babytroc.infrastructure.storage import S3Client
 from babytroc.routers.v1.auth import client_id_annotation
 from babytroc.shared.rate_limit import make_rate_limit_dep
 
@@ -27,7 +28,8 @@ async def upload_image(
     response: Response,
     file: UploadFile,
     db: Annotated[AsyncSession, Depends(get_db_session)],
-    semaphore: Annotated[asyncio.Semaphore, Depends(get_image_processing_semaphore)],
+    engine: Annotated[ImageEngine, Depends(get_image_engine)],
+    s3: Annotated[S3Client, Depends(get_s3_client)],
     _rate_limited: Annotated[None, Depends(rate_limit_image_upload)],
 ) -> ItemImageRead:
     """Upload item image."""
@@ -42,7 +44,8 @@ async def upload_image(
     return await image_services.upload_image(
         config=config,
         db=db,
-        semaphore=semaphore,
+        engine=engine,
+        s3=s3,
         owner_id=client_id,
         data=data,
     )
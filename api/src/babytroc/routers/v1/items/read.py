@@ -20,6 +20,7 @@ from .router import router
 async def list_items(
     request: Request,
     response: Response,
+    client_id: maybe_client_id_annotation,
     query: Annotated[ItemMatchinWordsApiQuery, Query()],
     db: Annotated[AsyncSession, Depends(get_db_session)],
     cache: Annotated[Cache, Depends(get_cache)],
@@ -33,6 +34,7 @@ async def list_items(
             words=query.words,
             query_filter=query.item_select_query_filter,
             page_options=query.item_matching_words_query_page_options,
+            client_id=client_id,
             cache=cache,
         )
 
@@ -44,6 +46,7 @@ async def list_items(
         db=db,
         query_filter=query.item_select_query_filter,
         page_options=query.item_query_page_options,
+        client_id=client_id,
         cache=cache,
     )
 
@@ -1,11 +1,13 @@
-from typing import TYPE_CHECKING, Annotated
+from typing import Annotated
 
-from fastapi import Body, Depends, Request, status
+from fastapi import Body, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from babytroc.domains.item import services as item_services
 from babytroc.domains.item.schemas.create import ItemCreate
 from babytroc.domains.item.schemas.read import ItemRead
+from babytroc.infrastructure.cap import CapVerifier
+from babytroc.infrastructure.cap_dep import get_cap_verifier
 from babytroc.infrastructure.database import get_db_session
 from babytroc.routers.v1.auth import client_id_annotation
 from babytroc.shared.antibot import AntiBotMixin, verify_antibot
@@ -13,9 +15,6 @@ from babytroc.shared.rate_limit import make_rate_limit_dep
 
 from .router import router
 
-if TYPE_CHECKING:
-    from babytroc.infrastructure.config import Config
-
 
 class ItemCreateRequest(AntiBotMixin, ItemCreate):
     pass
@@ -34,14 +33,13 @@ async def create_client_item(
         ItemCreateRequest,
         Body(title="Fields for the item creation."),
     ],
-    request: Request,
     db: Annotated[AsyncSession, Depends(get_db_session)],
     _rate_limited: Annotated[None, Depends(rate_limit_item_create)],
+    cap_verifier: Annotated[CapVerifier, Depends(get_cap_verifier)],
 ) -> ItemRead:
     """Create an item owned by the client."""
 
-    config: Config = request.app.state.config
-    await verify_antibot(item_create_request, config.cap)
+    await verify_antibot(item_create_request, cap_verifier)
 
     item_create = ItemCreate(
         name=item_create_request.name,
@@ -1,25 +1,37 @@
 import asyncio
 from typing import Annotated
 
-from broadcaster import Broadcast
-from fastapi import Depends, WebSocket
+from fastapi import Depends, Query, WebSocket, status
 from starlette.websockets import WebSocketDisconnect
 
 from babytroc.domains.chat import services as chat_services
 from babytroc.domains.chat.schemas.pubsub import (
+    PubsubMessage,
     PubsubMessageNewChatMessage,
     PubsubMessageTypeAdapter,
     PubsubMessageUpdatedAccountValidation,
     PubsubMessageUpdatedChatMessage,
 )
 from babytroc.domains.chat.schemas.query import ChatMessageReadQueryFilter
+from babytroc.domains.chat.schemas.read import ChatMessageRead
 from babytroc.domains.chat.schemas.websocket import (
+    WebSocketMessage,
+    WebSocketMessageEventsLost,
     WebSocketMessageNewChatMessage,
     WebsocketMessageUpdatedAccountValidation,
     WebSocketMessageUpdatedChatMessage,
 )
 from babytroc.infrastructure.database import get_session_maker
-from babytroc.infrastructure.pubsub import get_broadcast, user_channel
+from babytroc.infrastructure.pubsub import (
+    EVENT_ID_PATTERN,
+    event_id_key,
+    read_user_events,
+)
+from babytroc.infrastructure.websocket_hub import (
+    HubConnection,
+    WebSocketHub,
+    get_websocket_hub,
+)
 from babytroc.routers.v1.auth import verify_websocket_credentials_no_validation_check
 
 from .router import router
@@ -45,70 +57,127 @@ async def terminate_task_group_when_websocket_is_closed(
         raise TerminateTaskGroup()
 
 
-async def relay_broacast_events_to_websocket(
+async def get_pubsub_chat_message(
+    pubsub_message: PubsubMessageNewChatMessage | PubsubMessageUpdatedChatMessage,
+    *,
+    client_id: int,
+) -> ChatMessageRead:
+    """Chat message carried by `pubsub_message`.
+
+    The message is read from the database only if the publisher did not embed it.
+    """
+
+    if pubsub_message.message is not None:
+        return pubsub_message.message
+
+    async with get_session_maker().begin() as db:
+        return await chat_services.get_message(
+            db=db,
+            message_id=pubsub_message.chat_message_id,
+            query_filter=ChatMessageReadQueryFilter(
+                member_id=client_id,
+            ),
+        )
+
+
+async def get_websocket_message(
+    pubsub_message: PubsubMessage,
+    *,
+    client_id: int,
+) -> WebSocketMessage:
+    """Websocket message relaying `pubsub_message`."""
+
+    if isinstance(pubsub_message, PubsubMessageNewChatMessage):
+        return WebSocketMessageNewChatMessage(
+            event_id=pubsub_message.event_id,
+            message=await get_pubsub_chat_message(
+                pubsub_message,
+                client_id=client_id,
+            ),
+        )
+
+    if isinstance(pubsub_message, PubsubMessageUpdatedChatMessage):
+        return WebSocketMessageUpdatedChatMessage(
+            event_id=pubsub_message.event_id,
+            message=await get_pubsub_chat_message(
+                pubsub_message,
+                client_id=client_id,
+            ),
+        )
+
+    if isinstance(pubsub_message, PubsubMessageUpdatedAccountValidation):
+        return WebsocketMessageUpdatedAccountValidation(
+            event_id=pubsub_message.event_id,
+            validated=pubsub_message.validated,
+        )
+
+    msg = f"Unhandled pubsub message type {pubsub_message}"
+    raise TypeError(msg)
+
+
+async def relay_hub_notifications_to_websocket(
     websocket: WebSocket,
-    broadcast: Broadcast,
+    connection: HubConnection,
     client_id: int,
-    *args,
-    **kwargs,
+    *,
+    send_timeout: float,
+    last_event_id: str | None = None,
 ):
-    """Send events of `broadcast` to `websocket`."""
+    """Send notifications received by `connection` to `websocket`.
 
-    # TODO add logging in case of error
-    async with broadcast.subscribe(*args, **kwargs) as subscriber:
-        async for event in subscriber:
-            if event is None:
-                continue
+    If `last_event_id` is given, the logged notifications following it are sent
+    first, or `WebSocketMessageEventsLost` if they cannot be replayed. Received
+    notifications already replayed are skipped.
 
-            pubsub_message = PubsubMessageTypeAdapter.validate_json(event.message)
+    Raise TerminateTaskGroup when `connection` is evicted, or `websocket` is too
+    slow to send to (the connection is then evicted).
+    """
 
-            if isinstance(pubsub_message, PubsubMessageNewChatMessage):
-                async with get_session_maker().begin() as db:
-                    chat_message = await chat_services.get_message(
-                        db=db,
-                        message_id=pubsub_message.chat_message_id,
-                        query_filter=ChatMessageReadQueryFilter(
-                            member_id=client_id,
-                        ),
-                    )
+    async def send(message: WebSocketMessage) -> None:
+        async with asyncio.timeout(send_timeout):
+            await websocket.send_text(message.model_dump_json())
 
-                await websocket.send_text(
-                    WebSocketMessageNewChatMessage(
-                        message=chat_message,
-                    ).model_dump_json()
+    # TODO add logging in case of error
+    try:
+        if last_event_id is not None:
+            events = await read_user_events(client_id, after=last_event_id)
+
+            if events is None:
+                last_event_id = None
+                await send(WebSocketMessageEventsLost())
+
+            for event_id, payload in events or []:
+                pubsub_message = PubsubMessageTypeAdapter.validate_json(payload)
+                pubsub_message.event_id = event_id
+                await send(
+                    await get_websocket_message(pubsub_message, client_id=client_id)
                 )
+                last_event_id = event_id
 
-            elif isinstance(pubsub_message, PubsubMessageUpdatedChatMessage):
-                async with get_session_maker().begin() as db:
-                    chat_message = await chat_services.get_message(
-                        db=db,
-                        message_id=pubsub_message.chat_message_id,
-                        query_filter=ChatMessageReadQueryFilter(
-                            member_id=client_id,
-                        ),
-                    )
-                await websocket.send_text(
-                    WebSocketMessageUpdatedChatMessage(
-                        message=chat_message,
-                    ).model_dump_json()
-                )
+        async for payload in connection:
+            pubsub_message = PubsubMessageTypeAdapter.validate_json(payload)
 
-            elif isinstance(pubsub_message, PubsubMessageUpdatedAccountValidation):
-                await websocket.send_text(
-                    WebsocketMessageUpdatedAccountValidation(
-                        validated=pubsub_message.validated,
-                    ).model_dump_json()
-                )
+            # already replayed
+            if (
+                last_event_id is not None
+                and pubsub_message.event_id is not None
+                and event_id_key(pubsub_message.event_id) <= event_id_key(last_event_id)
+            ):
+                continue
+
+            await send(await get_websocket_message(pubsub_message, client_id=client_id))
+
+    except TimeoutError:
+        connection.evict()
 
-            else:
-                msg = f"Unhandled pubsub message type {pubsub_message}"
-                raise TypeError(msg)
+    raise TerminateTaskGroup()
 
 
 @router.websocket("/websocket")
 async def open_websocket(
     websocket: WebSocket,
-    broadcast: Annotated[Broadcast, Depends(get_broadcast)],
+    websocket_hub: Annotated[WebSocketHub, Depends(get_websocket_hub)],
+    last_event_id: Annotated[str | None, Query(pattern=EVENT_ID_PATTERN)] = None,
 ):
     client_id = verify_websocket_credentials_no_validation_check(
         websocket,
@@ -116,27 +185,35 @@ async def open_websocket(
 
     await websocket.accept()
 
-    try:
-        async with asyncio.TaskGroup() as task_group:
-            task_group.create_task(
-                relay_broacast_events_to_websocket(
-                    websocket=websocket,
-                    broadcast=broadcast,
-                    client_id=client_id,
-                    channel=user_channel(client_id),
+    with websocket_hub.connect(client_id) as connection:
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(
+                    relay_hub_notifications_to_websocket(
+                        websocket=websocket,
+                        connection=connection,
+                        client_id=client_id,
+                        send_timeout=websocket_hub.send_timeout,
+                        last_event_id=last_event_id,
+                    )
                 )
-            )
-            task_group.create_task(
-                terminate_task_group_when_websocket_is_closed(
-                    websocket=websocket,
+                task_group.create_task(
+                    terminate_task_group_when_websocket_is_closed(
+                        websocket=websocket,
+                    )
                 )
-            )
-
-    except* TerminateTaskGroup:
-        pass
 
-    finally:
-        try:
-            await websocket.close(1000)
-        except RuntimeError:
+        except* TerminateTaskGroup:
             pass
+
+        finally:
+            # evicted clients are expected to reconnect
+            code = (
+                status.WS_1013_TRY_AGAIN_LATER
+                if connection.evicted
+                else status.WS_1000_NORMAL_CLOSURE
+            )
+            try:
+                await websocket.close(code)
+            except RuntimeError:
+                pass
@@ -4,6 +4,8 @@ from fastapi import APIRouter, BackgroundTasks, Body, Depends, Request, status
 from fastapi.responses import Response
 from pydantic import BaseModel, EmailStr, StringConstraints
 
+from babytroc.infrastructure.cap import CapVerifier
+from babytroc.infrastructure.cap_dep import get_cap_verifier
 from babytroc.infrastructure.email import get_email_client
 from babytroc.infrastructure.email_contact import send_contact_email
 from babytroc.routers.v1.auth.verification import maybe_verify_request_credentials
@@ -41,10 +43,11 @@ async def submit_contact(
     request: Request,
     background_tasks: BackgroundTasks,
     _rate_limited: Annotated[None, Depends(rate_limit_contact)],
+    cap_verifier: Annotated[CapVerifier, Depends(get_cap_verifier)],
     client_id: Annotated[int | None, Depends(maybe_verify_request_credentials)],
 ) -> Response:
     config: Config = request.app.state.config
-    await verify_antibot(payload, config.cap)
+    await verify_antibot(payload, cap_verifier)
 
     email_client = get_email_client()
     background_tasks.add_task(
@@ -2,8 +2,7 @@ from typing import Annotated
 
 from pydantic import BaseModel, StringConstraints
 
-from babytroc.infrastructure.cap import verify_cap_token
-from babytroc.infrastructure.config import CapConfig
+from babytroc.infrastructure.cap import CapVerifier, verify_cap_token
 from babytroc.shared.errors import BadRequestError
 
 
@@ -18,7 +17,7 @@ class AntiBotMixin(BaseModel):
     website: str = ""  # honeypot — bots fill, humans don't see
 
 
-async def verify_antibot(payload: AntiBotMixin, cap_config: CapConfig) -> None:
+async def verify_antibot(payload: AntiBotMixin, cap_verifier: CapVerifier) -> None:
     """Run honeypot then cap PoW check. Raise BadRequestError on either failure.
 
     Both rejections surface as the same shared 400 INVALID_SUBMISSION error
@@ -27,6 +26,6 @@ async def verify_antibot(payload: AntiBotMixin, cap_config: CapConfig) -> None:
     if payload.website:
         msg = "INVALID_SUBMISSION"
         raise BadRequestError(msg)
-    if not await verify_cap_token(cap_config, payload.cap_token):
+    if not await verify_cap_token(cap_verifier, payload.cap_token):
         msg = "INVALID_SUBMISSION"
         raise BadRequestError(msg)
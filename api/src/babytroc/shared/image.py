@@ -1,3 +1,4 @@
+import math
 from enum import Enum
 from io import BytesIO
 from typing import IO
@@ -106,29 +107,48 @@ def clear_exif(image: PIL.Image.Image) -> PIL.Image.Image:
     return image
 
 
+def draft_size(image: PIL.Image.Image, max_dim: int) -> tuple[int, int]:
+    """Smallest size of `image`, with its aspect ratio, whose largest dimension
+    is `max_dim`. Requested from `draft` decoding."""
+
+    if image.width >= image.height:
+        return max_dim, math.ceil(max_dim * image.height / image.width)
+    return math.ceil(max_dim * image.width / image.height), max_dim
+
+
 def generate_webp_variants(
     fp: IO[bytes],
     sizes: tuple[int, ...] = (128, 256, 512, 1024),
+    *,
+    draft: bool = True,
 ) -> dict[int, BytesIO]:
-    """Load image, validate, process, and return webp variants for each size."""
+    """Load image, validate, process, and return webp variants for each size.
 
-    image = load_image(fp)
+    With `draft`, formats supporting it (JPEG) are decoded at the smallest
+    reduced scale still larger than the largest variant, instead of at full
+    resolution.
+    """
 
-    # Validate — this will raise if the file is not a valid image.
-    # We need to reload after verify() since it closes the image.
-    image.verify()
-    fp.seek(0)
+    # Opening only reads the header: it raises if the format is not recognised
+    # or if the image exceeds the pixel limit, before anything is decoded.
     image = load_image(fp)
 
+    if draft:
+        image.draft(None, draft_size(image, max(sizes)))
+
+    # Decoding raises if the image data is invalid or truncated.
+    image.load()
+
     image = apply_exif_orientation(image)
     image = clear_exif(image)
 
+    # resize progressively, each variant from the next larger one
     variants: dict[int, BytesIO] = {}
-    for size in sizes:
-        resized = limit_image_size(image.copy(), size)
+    for size in sorted(sizes, reverse=True):
+        image = limit_image_size(image, size)
         buf = BytesIO()
-        resized.save(buf, format="WEBP", quality=80)
+        image.save(buf, format="WEBP", quality=80)
         buf.seek(0)
         variants[size] = buf
 
-    return variants
+    return {size: variants[size] for size in sizes}
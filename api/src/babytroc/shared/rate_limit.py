@@ -1,6 +1,10 @@
+import math
+import time
+import uuid
+from collections import OrderedDict
 from collections.abc import Awaitable, Callable
 from datetime import timedelta
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated, NoReturn
 
 from fastapi import Depends, Request
 from redis.asyncio import Redis
@@ -10,15 +14,94 @@ from babytroc.infrastructure.redis_dep import get_redis
 from babytroc.routers.v1.auth.verification import maybe_verify_request_credentials
 from babytroc.shared.errors import TooManyRequestsError
 
+if TYPE_CHECKING:
+    from redis.commands.core import AsyncScript
+
+# Sliding window log of the hits of a client, in a sorted set scored by hit
+# time. The hit is only logged if fewer than the limit were logged within the
+# window. Returns {1, 0} if allowed, else {0, milliseconds until the oldest hit
+# leaves the window}.
+# KEYS[1]: log, ARGV[1]: window (ms), ARGV[2]: limit, ARGV[3]: unique member
+_SLIDING_WINDOW_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local window = tonumber(ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[2]) then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return {0, tonumber(oldest[2]) + window - now}
+end
+redis.call('ZADD', KEYS[1], now, ARGV[3])
+redis.call('PEXPIRE', KEYS[1], window)
+return {1, 0}
+"""
+
+
+class LocalTokenBuckets:
+    """In-process token buckets, by key.
+
+    A bucket holds up to `capacity` tokens and refills at `capacity` tokens per
+    `period`. A client that never exceeds `capacity` requests per `period`
+    never runs out of tokens. Buckets of the least recently used keys are
+    dropped beyond `max_keys` (as if full).
+    """
+
+    def __init__(
+        self,
+        *,
+        capacity: int,
+        period: timedelta,
+        max_keys: int = 10_000,
+    ) -> None:
+        self.capacity = capacity
+        self.rate = capacity / period.total_seconds()
+        self.max_keys = max_keys
+        # key -> (tokens, last refill time)
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def consume(self, key: str, *, now: float | None = None) -> float:
+        """Take a token from the bucket of `key`.
+
+        Returns 0 on success, else the seconds until a token is available.
+        """
+
+        if now is None:
+            now = time.monotonic()
+
+        tokens, last = self._buckets.pop(key, (float(self.capacity), now))
+        tokens = min(self.capacity, tokens + (now - last) * self.rate)
+
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / self.rate
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        return wait
+
 
 class RateLimiter:
-    """Reusable Redis fixed-window rate limiter usable as a FastAPI dependency.
+    """Reusable Redis sliding-window rate limiter usable as a FastAPI dependency.
 
     Keys are namespaced by prefix and identity:
       ratelimit:{prefix}:user:{client_id}   when authenticated
       ratelimit:{prefix}:ip:{client_host}   when anonymous
 
-    First hit in a window sets EXPIRE. Strict greater-than triggers 429.
+    At most `limit` requests are allowed within any `window`: each key holds
+    the log of its allowed requests, checked and updated atomically in a single
+    round trip by a Lua script.
+
+    Obvious floods are rejected without touching Redis by per-worker token
+    buckets of the same limit, which a client within its limit never empties.
+
+    Rejections raise a 429 with a Retry-After header.
     """
 
     def __init__(
@@ -33,6 +116,9 @@ class RateLimiter:
         self.anon_limit = anon_limit
         self.auth_limit = auth_limit
         self.window = window
+        self._anon_buckets = LocalTokenBuckets(capacity=anon_limit, period=window)
+        self._auth_buckets = LocalTokenBuckets(capacity=auth_limit, period=window)
+        self._script: AsyncScript | None = None
 
     async def __call__(
         self,
@@ -45,17 +131,41 @@ class RateLimiter:
         if client_id is not None:
             key = f"ratelimit:{self.key_prefix}:user:{client_id}"
             limit = self.auth_limit
+            buckets = self._auth_buckets
         else:
             host = request.client.host if request.client else "unknown"
             key = f"ratelimit:{self.key_prefix}:ip:{host}"
             limit = self.anon_limit
+            buckets = self._anon_buckets
+
+        if limit <= 0:
+            _raise_rate_limited(retry_after=self.window.total_seconds())
+
+        retry_after = buckets.consume(key)
+        if retry_after:
+            _raise_rate_limited(retry_after=retry_after)
+
+        if self._script is None or self._script.registered_client is not redis:
+            self._script = redis.register_script(_SLIDING_WINDOW_SCRIPT)
+
+        allowed, retry_after_ms = await self._script(
+            keys=[key],
+            args=[
+                int(self.window.total_seconds() * 1000),
+                limit,
+                uuid.uuid4().hex,
+            ],
+        )
+        if not allowed:
+            _raise_rate_limited(retry_after=int(retry_after_ms) / 1000)
+
 
-        count = await redis.incr(key)
-        if count == 1:
-            await redis.expire(key, int(self.window.total_seconds()))
-        if count > limit:
-            msg = "RATE_LIMITED"
-            raise TooManyRequestsError(msg)
+def _raise_rate_limited(*, retry_after: float) -> NoReturn:
+    msg = "RATE_LIMITED"
+    raise TooManyRequestsError(
+        msg,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
 
 
 def make_rate_limit_dep(
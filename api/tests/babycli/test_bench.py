@@ -0,0 +1,130 @@
+import os
+from io import BytesIO
+
+import PIL.Image
+import pytest
+
+from babycli.bench import (
+    explain_totals,
+    measure_image_variants,
+    percentile,
+    rows_examined,
+    rss_bytes,
+    summarize_image_variants,
+)
+
+
+def test_percentile():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 0.50) == 51
+    assert percentile(values, 0.99) == 99
+    assert percentile(values, 1) == 100
+
+
+def test_percentile_single_value():
+    assert percentile([3.0], 0.95) == 3.0
+
+
+def test_percentile_no_values():
+    with pytest.raises(ValueError, match="No values"):
+        percentile([], 0.5)
+
+
+def test_rows_examined_counts_filtered_rows_of_scans():
+    plan = {
+        "Node Type": "Limit",
+        "Actual Rows": 32,
+        "Plans": [
+            {
+                "Node Type": "Nested Loop",
+                "Actual Rows": 32,
+                "Plans": [
+                    {
+                        "Node Type": "Seq Scan",
+                        "Actual Rows": 40,
+                        "Rows Removed by Filter": 60,
+                        "Actual Loops": 1,
+                    },
+                    {
+                        "Node Type": "Index Scan",
+                        "Actual Rows": 1,
+                        "Actual Loops": 40,
+                    },
+                ],
+            }
+        ],
+    }
+
+    assert rows_examined(plan) == 140
+
+
+def test_explain_totals_sums_statements():
+    plans = [
+        {
+            "Plan": {"Node Type": "Seq Scan", "Actual Rows": 10, "Actual Loops": 1},
+            "Planning Time": 0.5,
+            "Execution Time": 2.0,
+        },
+        {
+            "Plan": {
+                "Node Type": "Index Scan",
+                "Actual Rows": 5,
+                "Rows Removed by Filter": 3,
+                "Actual Loops": 1,
+            },
+            "Planning Time": 0.25,
+            "Execution Time": 1.25,
+        },
+    ]
+
+    assert explain_totals(plans) == (18, 4.0)
+
+
+def test_rss_bytes_of_current_process():
+    rss = rss_bytes(os.getpid())
+    assert rss is None or rss > 0
+
+
+def test_rss_bytes_of_missing_process():
+    assert rss_bytes(-1) is None
+
+
+def test_measure_image_variants(tmp_path):
+    path = tmp_path / "photo.jpg"
+    fp = BytesIO()
+    PIL.Image.new("RGB", (2000, 1500), color="red").save(fp, format="JPEG")
+    path.write_bytes(fp.getvalue())
+
+    measurement = measure_image_variants(str(path), draft=True)
+
+    assert measurement["error"] is None
+    assert measurement["cpu_seconds"] >= 0
+    assert measurement["peak_rss_increase_bytes"] >= 0
+
+
+def test_measure_image_variants_records_error(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("not an image")
+
+    measurement = measure_image_variants(str(path), draft=False)
+
+    assert measurement["error"] == "UnidentifiedImageError"
+
+
+def test_summarize_image_variants():
+    measurements = [
+        {
+            "error": None,
+            "wall_seconds": 0.2,
+            "cpu_seconds": cpu,
+            "peak_rss_increase_bytes": memory,
+        }
+        for cpu, memory in [(0.1, 1000), (0.3, 3000)]
+    ] + [{"error": "UnidentifiedImageError"}]
+
+    summary = summarize_image_variants(measurements)
+
+    assert summary["measurements"] == 3
+    assert summary["errors"] == {"UnidentifiedImageError": 1}
+    assert summary["cpu_seconds"]["total"] == pytest.approx(0.4)
+    assert summary["peak_rss_increase_bytes"]["max"] == 3000
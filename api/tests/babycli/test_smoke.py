@@ -4,11 +4,18 @@ import pytest
 
 SUBCOMMANDS = [
     ["babycli", "--help"],
+    ["babycli", "bench", "--help"],
+    ["babycli", "bench", "search", "--help"],
+    ["babycli", "bench", "websocket", "--help"],
+    ["babycli", "bench", "images", "--help"],
     ["babycli", "check", "--help"],
     ["babycli", "config", "--help"],
     ["babycli", "danger-mode", "--help"],
     ["babycli", "db", "--help"],
+    ["babycli", "db", "reconcile-counters", "--help"],
     ["babycli", "db", "seed", "--help"],
+    ["babycli", "images", "--help"],
+    ["babycli", "images", "gc", "--help"],
     ["babycli", "lint", "--help"],
     ["babycli", "logs", "--help"],
     ["babycli", "server", "--help"],
@@ -35,7 +35,7 @@ def stub_cap_verify(
     so we patch both modules.
     """
 
-    async def _fake(_config, _token):
+    async def _fake(_verifier, _token):
         if cap_verify_raises:
             # `verify_cap_token` is fail-closed: it catches httpx errors
             # internally and returns False. Simulate that contract here.
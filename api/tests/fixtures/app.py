@@ -6,11 +6,14 @@ from asgi_lifespan import LifespanManager
 from fastapi import FastAPI
 
 from babytroc.app import create_app
+from babytroc.infrastructure.cache_local import TieredCache
 from babytroc.infrastructure.config import (
     CapConfig,
     Config,
     ContactConfig,
     DatabaseConfig,
+    EventsConfig,
+    MaintenanceConfig,
     PubsubConfig,
     RedisConfig,
     S3Config,
@@ -33,6 +36,11 @@ async def app_config(
         database=DatabaseConfig.from_env(url=primary_database),
         pubsub=PubsubConfig(url=redis_config.url),
         redis=redis_config,
+        # run non-critical event handlers inline, so that the cache is
+        # invalidated when the response is received
+        events=EventsConfig.from_env(handler_concurrency=0),
+        # maintenance jobs are run explicitly by the tests that need them
+        maintenance=MaintenanceConfig.from_env(tick=0),
         s3=S3Config.from_env(),
         contact=ContactConfig.from_env(),
         cap=CapConfig.from_env(),
@@ -53,5 +61,9 @@ async def app(
 @pytest.fixture(autouse=True)
 async def _flush_redis(app: FastAPI):
     await app.state.redis.flushdb()
+    if isinstance(app.state.cache, TieredCache):
+        app.state.cache.local.clear()
     yield
     await app.state.redis.flushdb()
+    if isinstance(app.state.cache, TieredCache):
+        app.state.cache.local.clear()
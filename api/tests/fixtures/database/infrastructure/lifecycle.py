@@ -78,7 +78,7 @@ async def primary_databases(
     # here as a placeholder.
     ctx = SeedContext(config=config, db_url=admin_database_url)
 
-    # Seed handlers (e.g. invalidate_cache_on_item_created,
+    # Seed handlers (e.g. invalidate_owner_cache_on_item_created,
     # loan_request_created) call get_cache() / get_broadcast() at chain
     # build time, before the app fixture initializes the real ones. Init
     # NullCache + an in-memory Broadcast so handlers don't crash; the
@@ -1,11 +1,15 @@
 """Baseline image seed — Alice and Bob's PBM item images."""
 
-import asyncio
-
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from babytroc.domains.image.services import upload_image
 from babytroc.domains.user.services import get_user_by_email_private
+from babytroc.infrastructure.config import Config
+from babytroc.infrastructure.image_processing import (
+    ImageEngine,
+    create_image_engine,
+)
+from babytroc.infrastructure.storage import S3Client, create_s3_client
 from tests.fixtures.database.infrastructure.chain import SeedContext
 
 _ALICE_ITEMS_IMG = b"P1\n3 3\n101\n101\n010"
@@ -24,14 +28,33 @@ async def seed_baseline_images(db: AsyncSession, ctx: SeedContext) -> None:
     `ItemImage.name` ordering.
     """
     config = ctx.config
-    semaphore = asyncio.Semaphore(config.image.max_concurrent_processing_per_worker)
+    engine = create_image_engine(
+        processes=1,
+        queue_size=0,
+        max_pixels=config.image.max_pixels,
+    )
+    s3 = create_s3_client(config.s3)
+    try:
+        await _upload_baseline_images(db, config, engine, s3)
+    finally:
+        engine.shutdown()
+        await s3.close()
+
+
+async def _upload_baseline_images(
+    db: AsyncSession,
+    config: Config,
+    engine: ImageEngine,
+    s3: S3Client,
+) -> None:
     alice = await get_user_by_email_private(db=db, email="alice@babytroc.ch")
     bob = await get_user_by_email_private(db=db, email="bob@babytroc.ch")
 
     await upload_image(
         config=config,
         db=db,
-        semaphore=semaphore,
+        engine=engine,
+        s3=s3,
         owner_id=alice.id,
         data=_ALICE_ITEMS_IMG,
     )
@@ -40,7 +63,8 @@ async def seed_baseline_images(db: AsyncSession, ctx: SeedContext) -> None:
         await upload_image(
             config=config,
             db=db,
-            semaphore=semaphore,
+            engine=engine,
+            s3=s3,
             owner_id=alice.id,
             data=_ALICE_NEW_ITEM_IMG,
         )
@@ -49,7 +73,8 @@ async def seed_baseline_images(db: AsyncSession, ctx: SeedContext) -> None:
         await upload_image(
             config=config,
             db=db,
-            semaphore=semaphore,
+            engine=engine,
+            s3=s3,
             owner_id=alice.id,
             data=_ALICE_SPECIAL_ITEM_IMG,
         )
@@ -57,7 +82,8 @@ async def seed_baseline_images(db: AsyncSession, ctx: SeedContext) -> None:
     await upload_image(
         config=config,
         db=db,
-        semaphore=semaphore,
+        engine=engine,
+        s3=s3,
         owner_id=bob.id,
         data=_BOB_ITEMS_IMG,
     )
@@ -0,0 +1,145 @@
+from collections.abc import AsyncIterator, Iterator
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from babytroc.domains.image.services.gc import collect_orphan_images
+from babytroc.domains.item.models.image import ItemImage, ItemImageAssociation
+from babytroc.domains.item.schemas.read import ItemRead
+from babytroc.domains.user.schemas.private import UserPrivateRead
+from babytroc.infrastructure.config import Config
+from babytroc.infrastructure.storage import S3Client, create_s3_client
+
+GRACE_PERIOD = timedelta(days=1)
+
+
+@pytest.fixture
+async def s3(app_config: Config) -> AsyncIterator[S3Client]:
+    s3 = create_s3_client(app_config.s3)
+    yield s3
+    await s3.close()
+
+
+@pytest.fixture
+def mock_s3_client(s3: S3Client) -> Iterator[AsyncMock]:
+    mock_s3_client = AsyncMock()
+    mock_s3_client.delete_objects.return_value = {}
+    with patch.object(s3, "get", AsyncMock(return_value=mock_s3_client)):
+        yield mock_s3_client
+
+
+@pytest.fixture
+async def old_images(
+    database_sessionmaker: async_sessionmaker,
+    alice: UserPrivateRead,
+    alice_new_item: ItemRead,
+) -> dict[str, list[str]]:
+    """Images uploaded two days ago, attached to an item or not."""
+
+    creation_date = datetime.now(UTC) - 2 * GRACE_PERIOD
+    orphans = [f"gc-orphan-{i:03}" for i in range(5)]
+    attached = ["gc-attached"]
+
+    async with database_sessionmaker.begin() as db:
+        await db.execute(
+            insert(ItemImage),
+            [
+                {"name": name, "owner_id": alice.id, "creation_date": creation_date}
+                for name in orphans + attached
+            ],
+        )
+        await db.execute(
+            insert(ItemImageAssociation).values(
+                item_id=alice_new_item.id,
+                image_name="gc-attached",
+                order=99,
+            )
+        )
+
+    return {"orphans": orphans, "attached": attached}
+
+
+async def _image_names(database_sessionmaker: async_sessionmaker) -> set[str]:
+    async with database_sessionmaker.begin() as db:
+        return set((await db.scalars(select(ItemImage.name))).all())
+
+
+async def test_collect_orphan_images(
+    database_sessionmaker: async_sessionmaker,
+    s3: S3Client,
+    mock_s3_client: AsyncMock,
+    old_images: dict[str, list[str]],
+):
+    before = await _image_names(database_sessionmaker)
+
+    collection = await collect_orphan_images(
+        database_sessionmaker,
+        s3,
+        grace_period=GRACE_PERIOD,
+        batch_size=2,
+    )
+
+    # recent and attached images are kept
+    assert await _image_names(database_sessionmaker) == before - set(
+        old_images["orphans"]
+    )
+
+    assert collection.images == 5
+    assert collection.objects == 20
+    assert collection.batches == 3
+    assert collection.failed_images == 0
+
+    deleted_keys = [
+        obj["Key"]
+        for call in mock_s3_client.delete_objects.call_args_list
+        for obj in call.kwargs["Delete"]["Objects"]
+    ]
+    assert len(deleted_keys) == 20
+    assert "gc-orphan-000_1024.webp" in deleted_keys
+    assert not any(key.startswith("gc-attached") for key in deleted_keys)
+
+
+async def test_collect_orphan_images_dry_run(
+    database_sessionmaker: async_sessionmaker,
+    s3: S3Client,
+    mock_s3_client: AsyncMock,
+    old_images: dict[str, list[str]],
+):
+    before = await _image_names(database_sessionmaker)
+
+    collection = await collect_orphan_images(
+        database_sessionmaker,
+        s3,
+        grace_period=GRACE_PERIOD,
+        batch_size=2,
+        dry_run=True,
+    )
+
+    assert collection.images == 5
+    assert collection.objects == 20
+    assert await _image_names(database_sessionmaker) == before
+    mock_s3_client.delete_objects.assert_not_called()
+
+
+async def test_collect_orphan_images_keeps_failed_images(
+    database_sessionmaker: async_sessionmaker,
+    s3: S3Client,
+    mock_s3_client: AsyncMock,
+    old_images: dict[str, list[str]],
+):
+    mock_s3_client.delete_objects.return_value = {
+        "Errors": [{"Key": "gc-orphan-001_256.webp", "Code": "InternalError"}],
+    }
+
+    collection = await collect_orphan_images(
+        database_sessionmaker,
+        s3,
+        grace_period=GRACE_PERIOD,
+    )
+
+    assert collection.images == 4
+    assert collection.failed_images == 1
+    assert "gc-orphan-001" in await _image_names(database_sessionmaker)
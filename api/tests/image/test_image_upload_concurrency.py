@@ -2,6 +2,7 @@ import asyncio
 import io
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import PIL.Image
 import pytest
@@ -9,11 +10,13 @@ from httpx import AsyncClient
 
 from babytroc.domains.image.services import create as create_service
 from babytroc.infrastructure.image_processing import (
-    get_image_processing_semaphore,
-    init_image_processing_dependency,
+    ImageEngine,
+    get_image_engine,
+    init_image_engine_dependency,
 )
 
-SEMAPHORE_LIMIT = 2
+ENGINE_LIMIT = 2
+ENGINE_MAX_PENDING = 6
 
 
 def _png_bytes() -> bytes:
@@ -24,17 +27,25 @@ def _png_bytes() -> bytes:
 
 
 @pytest.fixture
-def tight_semaphore():
-    """Replace the global semaphore with a 2-slot one for the duration of the test."""
-    original = get_image_processing_semaphore()
-    init_image_processing_dependency(asyncio.Semaphore(SEMAPHORE_LIMIT))
-    yield SEMAPHORE_LIMIT
-    init_image_processing_dependency(original)
+def thread_engine():
+    """Replace the global engine with a 2-thread one for the duration of the test.
+
+    Threads, unlike processes, run the monkeypatched `generate_webp_variants`.
+    """
+    original = get_image_engine()
+    engine = ImageEngine(
+        ThreadPoolExecutor(max_workers=ENGINE_LIMIT),
+        max_pending=ENGINE_MAX_PENDING,
+    )
+    init_image_engine_dependency(engine)
+    yield engine
+    init_image_engine_dependency(original)
+    engine.shutdown()
 
 
-async def test_semaphore_bounds_concurrent_uploads(
+async def test_engine_bounds_concurrent_uploads(
     alice_client: AsyncClient,
-    tight_semaphore: int,
+    thread_engine: ImageEngine,
     monkeypatch: pytest.MonkeyPatch,
 ):
     """N > limit parallel uploads must serialize down to <= limit in-flight."""
@@ -45,7 +56,7 @@ async def test_semaphore_bounds_concurrent_uploads(
     original = create_service.image_utils.generate_webp_variants
 
     def slow_generate(fp):
-        # Runs inside the asyncio.to_thread worker. Use threading.Lock to
+        # Runs inside an engine worker thread. Use threading.Lock to
         # protect the shared counters across worker threads.
         nonlocal in_flight, peak
         with lock:
@@ -72,19 +83,57 @@ async def test_semaphore_bounds_concurrent_uploads(
             files={"file": ("x.png", io.BytesIO(data), "image/png")},
         )
 
-    responses = await asyncio.gather(*(one_upload() for _ in range(6)))
+    responses = await asyncio.gather(
+        *(one_upload() for _ in range(ENGINE_MAX_PENDING)),
+    )
 
     for r in responses:
         # Allow 429 in case rate limiting kicks in across test runs;
         # the bound assertion below is what matters.
         assert r.status_code in (201, 429), r.text
-    assert peak <= tight_semaphore, (
-        f"peak in-flight {peak} exceeded limit {tight_semaphore}"
+    assert peak <= ENGINE_LIMIT, f"peak in-flight {peak} exceeded limit {ENGINE_LIMIT}"
+
+
+async def test_saturated_engine_rejects_upload(
+    alice_client: AsyncClient,
+    thread_engine: ImageEngine,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Uploads beyond the engine capacity are rejected instead of queued."""
+
+    original = create_service.image_utils.generate_webp_variants
+
+    def slow_generate(fp):
+        time.sleep(0.3)
+        return original(fp)
+
+    monkeypatch.setattr(
+        create_service.image_utils,
+        "generate_webp_variants",
+        slow_generate,
+    )
+
+    data = _png_bytes()
+
+    async def one_upload():
+        return await alice_client.post(
+            "/api/v1/images",
+            files={"file": ("x.png", io.BytesIO(data), "image/png")},
+        )
+
+    responses = await asyncio.gather(
+        *(one_upload() for _ in range(ENGINE_MAX_PENDING + 2)),
     )
 
+    statuses = [r.status_code for r in responses]
+    assert 503 in statuses, statuses
+    rejected = next(r for r in responses if r.status_code == 503)
+    assert rejected.headers["Retry-After"] == "1"
+
 
 async def test_event_loop_remains_responsive_during_upload(
     alice_client: AsyncClient,
+    thread_engine: ImageEngine,
     monkeypatch: pytest.MonkeyPatch,
 ):
     """A lightweight GET must not be blocked by a concurrent slow upload."""
@@ -110,7 +159,7 @@ async def test_event_loop_remains_responsive_during_upload(
         ),
     )
 
-    # Give the upload a moment to enter the to_thread call.
+    # Give the upload a moment to enter the engine.
     await asyncio.sleep(0.05)
 
     t0 = time.monotonic()
@@ -1,6 +1,7 @@
-import asyncio
 import struct
 import zlib
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 
 import PIL.Image
@@ -9,12 +10,15 @@ from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from babytroc.domains.image.errors import (
     ImagePixelLimitError,
+    ImageProcessingBusyError,
     ImageTooLargeError,
     InvalidImageError,
 )
 from babytroc.domains.image.services.create import upload_image
 from babytroc.domains.user.schemas.private import UserPrivateRead
 from babytroc.infrastructure.config import Config
+from babytroc.infrastructure.image_processing import ImageEngine, create_image_engine
+from babytroc.infrastructure.storage import S3Client, create_s3_client
 from babytroc.shared.image import configure_pillow_pixel_limit
 
 
@@ -42,22 +46,38 @@ def _crafted_png_header_with_dimensions(width: int, height: int) -> bytes:
 
 
 @pytest.fixture
-def small_semaphore() -> asyncio.Semaphore:
-    return asyncio.Semaphore(4)
+def engine(app_config: Config) -> Iterator[ImageEngine]:
+    engine = create_image_engine(
+        processes=1,
+        queue_size=4,
+        max_pixels=app_config.image.max_pixels,
+    )
+    yield engine
+    engine.shutdown()
+
+
+@pytest.fixture
+async def s3(app_config: Config) -> AsyncIterator[S3Client]:
+    # uploads are mocked (see tests/fixtures/s3.py), no connection is opened
+    s3 = create_s3_client(app_config.s3)
+    yield s3
+    await s3.close()
 
 
 async def test_upload_image_happy_path_returns_image_read(
     app_config: Config,
     database_sessionmaker: async_sessionmaker,
     alice: UserPrivateRead,
-    small_semaphore: asyncio.Semaphore,
+    engine: ImageEngine,
+    s3: S3Client,
 ):
     data = _png_bytes(200, 100)
     async with database_sessionmaker.begin() as session:
         result = await upload_image(
             config=app_config,
             db=session,
-            semaphore=small_semaphore,
+            engine=engine,
+            s3=s3,
             owner_id=alice.id,
             data=data,
         )
@@ -70,7 +90,8 @@ async def test_upload_image_rejects_oversized_bytes(
     app_config: Config,
     database_sessionmaker: async_sessionmaker,
     alice: UserPrivateRead,
-    small_semaphore: asyncio.Semaphore,
+    engine: ImageEngine,
+    s3: S3Client,
 ):
     too_big = b"x" * (app_config.image.max_upload_bytes + 1)
     async with database_sessionmaker.begin() as session:
@@ -78,7 +99,8 @@ async def test_upload_image_rejects_oversized_bytes(
             await upload_image(
                 config=app_config,
                 db=session,
-                semaphore=small_semaphore,
+                engine=engine,
+                s3=s3,
                 owner_id=alice.id,
                 data=too_big,
             )
@@ -88,7 +110,8 @@ async def test_upload_image_rejects_decompression_bomb(
     app_config: Config,
     database_sessionmaker: async_sessionmaker,
     alice: UserPrivateRead,
-    small_semaphore: asyncio.Semaphore,
+    engine: ImageEngine,
+    s3: S3Client,
 ):
     original_limit = PIL.Image.MAX_IMAGE_PIXELS
     try:
@@ -99,7 +122,8 @@ async def test_upload_image_rejects_decompression_bomb(
                 await upload_image(
                     config=app_config,
                     db=session,
-                    semaphore=small_semaphore,
+                    engine=engine,
+                    s3=s3,
                     owner_id=alice.id,
                     data=bomb,
                 )
@@ -111,14 +135,35 @@ async def test_upload_image_rejects_invalid_bytes(
     app_config: Config,
     database_sessionmaker: async_sessionmaker,
     alice: UserPrivateRead,
-    small_semaphore: asyncio.Semaphore,
+    engine: ImageEngine,
+    s3: S3Client,
 ):
     async with database_sessionmaker.begin() as session:
         with pytest.raises(InvalidImageError):
             await upload_image(
                 config=app_config,
                 db=session,
-                semaphore=small_semaphore,
+                engine=engine,
+                s3=s3,
                 owner_id=alice.id,
                 data=b"definitely not an image",
             )
+
+
+async def test_upload_image_rejects_when_engine_saturated(
+    app_config: Config,
+    database_sessionmaker: async_sessionmaker,
+    alice: UserPrivateRead,
+    s3: S3Client,
+):
+    saturated = ImageEngine(ThreadPoolExecutor(max_workers=1), max_pending=0)
+    async with database_sessionmaker.begin() as session:
+        with pytest.raises(ImageProcessingBusyError):
+            await upload_image(
+                config=app_config,
+                db=session,
+                engine=saturated,
+                s3=s3,
+                owner_id=alice.id,
+                data=_png_bytes(200, 100),
+            )
@@ -0,0 +1,181 @@
+import asyncio
+import contextlib
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+from broadcaster import Broadcast
+from redis.asyncio import Redis
+
+from babytroc.infrastructure.cache_client import RedisCache
+from babytroc.infrastructure.cache_local import LocalCache, TieredCache
+
+
+class TestLocalCache:
+    def test_get_miss(self):
+        local = LocalCache(max_entries=10, max_bytes=1024)
+        assert local.get("a") is None
+
+    def test_set_and_get(self):
+        local = LocalCache(max_entries=10, max_bytes=1024)
+        local.set("a", "1", ttl=60)
+        assert local.get("a") == "1"
+
+    def test_expired_entry_is_dropped(self, monkeypatch):
+        local = LocalCache(max_entries=10, max_bytes=1024)
+        local.set("a", "1", ttl=60)
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+        assert local.get("a") is None
+        assert len(local) == 0
+
+    def test_evicts_least_recently_used_entry(self):
+        local = LocalCache(max_entries=2, max_bytes=1024)
+        local.set("a", "1", ttl=60)
+        local.set("b", "2", ttl=60)
+        local.get("a")
+        local.set("c", "3", ttl=60)
+        assert local.get("a") == "1"
+        assert local.get("b") is None
+        assert local.get("c") == "3"
+
+    def test_evicts_to_stay_below_max_bytes(self):
+        local = LocalCache(max_entries=10, max_bytes=10)
+        local.set("a", "xxxx", ttl=60)
+        local.set("b", "yyyy", ttl=60)
+        local.set("c", "zzzz", ttl=60)
+        assert local.get("a") is None
+        assert local.size <= 10
+
+    def test_oversized_entry_is_not_stored(self):
+        local = LocalCache(max_entries=10, max_bytes=4)
+        local.set("a", "too large", ttl=60)
+        assert local.get("a") is None
+        assert local.size == 0
+
+    def test_delete_pattern(self):
+        local = LocalCache(max_entries=10, max_bytes=1024)
+        local.set("item:1", "1", ttl=60)
+        local.set("item:2", "2", ttl=60)
+        local.set("other", "3", ttl=60)
+        local.delete_pattern("item:*")
+        assert local.get("item:1") is None
+        assert local.get("item:2") is None
+        assert local.get("other") == "3"
+
+
+@pytest.fixture
+async def redis_client(worker_id: str):
+    db = 13
+    client = Redis(host="localhost", port=6379, db=db)
+    await client.flushdb()
+    yield client
+    await client.flushdb()
+    await client.aclose()
+
+
+@pytest.fixture
+async def broadcast():
+    async with Broadcast("memory://") as broadcast:
+        yield broadcast
+
+
+class FlakyBroadcast:
+    """Broadcast whose first `failures` subscriptions fail."""
+
+    def __init__(self, broadcast: Broadcast, *, failures: int) -> None:
+        self.broadcast = broadcast
+        self.failures = failures
+        self.publish = broadcast.publish
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        if self.failures > 0:
+            self.failures -= 1
+            msg = "connection lost"
+            raise ConnectionError(msg)
+        async with self.broadcast.subscribe(channel=channel) as subscriber:
+            yield subscriber
+
+
+def make_tiered_cache(redis_client, broadcast) -> TieredCache:
+    return TieredCache(
+        RedisCache(redis_client),
+        local=LocalCache(max_entries=10, max_bytes=1024),
+        local_ttl=60,
+        local_key_prefixes=("babytroc:local:",),
+        broadcast=broadcast,
+        channel="cache_invalidation",
+        reconnect_delay=0.01,
+    )
+
+
+class TestTieredCache:
+    async def test_local_key_served_from_local_tier(self, redis_client, broadcast):
+        cache = make_tiered_cache(redis_client, broadcast)
+        await cache.set("babytroc:local:a", "1", ttl=60)
+        await redis_client.delete("babytroc:local:a")
+        assert await cache.get("babytroc:local:a") == "1"
+
+    async def test_other_keys_bypass_local_tier(self, redis_client, broadcast):
+        cache = make_tiered_cache(redis_client, broadcast)
+        await cache.set("babytroc:shared:a", "1", ttl=60)
+        await redis_client.delete("babytroc:shared:a")
+        assert await cache.get("babytroc:shared:a") is None
+
+    async def test_tagged_entries_bypass_local_tier(self, redis_client, broadcast):
+        cache = make_tiered_cache(redis_client, broadcast)
+        await cache.set("babytroc:local:a", "1", ttl=60, tags=["t"])
+        await cache.invalidate_tags("t")
+        assert await cache.get("babytroc:local:a") is None
+
+    async def test_local_tier_filled_on_backend_hit(self, redis_client, broadcast):
+        cache = make_tiered_cache(redis_client, broadcast)
+        await redis_client.set("babytroc:local:a", "1")
+        assert await cache.get("babytroc:local:a") == "1"
+        assert cache.local.get("babytroc:local:a") == "1"
+
+    async def test_delete_propagates_to_other_workers(self, redis_client, broadcast):
+        worker_1 = make_tiered_cache(redis_client, broadcast)
+        worker_2 = make_tiered_cache(redis_client, broadcast)
+        listener = asyncio.create_task(worker_2.listen_for_invalidations())
+        await asyncio.sleep(0.1)
+
+        try:
+            await worker_1.set("babytroc:local:a", "1", ttl=60)
+            assert await worker_2.get("babytroc:local:a") == "1"
+
+            await worker_1.delete("babytroc:local:a")
+            await asyncio.sleep(0.1)
+
+            assert worker_2.local.get("babytroc:local:a") is None
+            assert await worker_2.get("babytroc:local:a") is None
+
+        finally:
+            listener.cancel()
+
+    async def test_listener_resubscribes_and_clears_local_tier(
+        self, redis_client, broadcast
+    ):
+        worker_1 = make_tiered_cache(redis_client, broadcast)
+        worker_2 = make_tiered_cache(
+            redis_client, FlakyBroadcast(broadcast, failures=2)
+        )
+        worker_2.local.set("babytroc:local:stale", "1", ttl=60)
+        listener = asyncio.create_task(worker_2.listen_for_invalidations())
+        await asyncio.sleep(0.1)
+
+        try:
+            # invalidations may have been missed while unsubscribed
+            assert worker_2.local.get("babytroc:local:stale") is None
+
+            await worker_1.set("babytroc:local:a", "1", ttl=60)
+            assert await worker_2.get("babytroc:local:a") == "1"
+            await worker_1.delete("babytroc:local:a")
+            await asyncio.sleep(0.1)
+            assert worker_2.local.get("babytroc:local:a") is None
+
+        finally:
+            listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await listener
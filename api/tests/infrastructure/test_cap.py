@@ -1,6 +1,10 @@
+import asyncio
+from collections.abc import Callable
+from datetime import timedelta
+
 import httpx
 
-from babytroc.infrastructure.cap import verify_cap_token
+from babytroc.infrastructure.cap import CapVerifier, verify_cap_token
 from babytroc.infrastructure.config import CapConfig
 
 CONFIG = CapConfig(
@@ -9,17 +13,16 @@ CONFIG = CapConfig(
     secret_key="secret-1",
 )
 
-# Capture the real AsyncClient before any test monkeypatches httpx.AsyncClient,
-# since patching `babytroc.infrastructure.cap.httpx.AsyncClient` mutates the
-# shared httpx module and would otherwise cause _client_with to recurse.
-_REAL_ASYNC_CLIENT = httpx.AsyncClient
-
 
-def _client_with(transport: httpx.MockTransport) -> httpx.AsyncClient:
-    return _REAL_ASYNC_CLIENT(transport=transport, timeout=5.0)
+def _verifier_with(
+    handler: Callable,
+    config: CapConfig = CONFIG,
+) -> CapVerifier:
+    """Build a verifier whose cap server is stood in for by `handler`."""
+    return CapVerifier(config, transport=httpx.MockTransport(handler))
 
 
-async def test_verify_cap_token_returns_true_on_success(monkeypatch):
+async def test_verify_cap_token_returns_true_on_success():
     captured = {}
 
     def handler(request: httpx.Request) -> httpx.Response:
@@ -27,56 +30,161 @@ async def test_verify_cap_token_returns_true_on_success(monkeypatch):
         captured["body"] = request.read()
         return httpx.Response(200, json={"success": True})
 
-    monkeypatch.setattr(
-        "babytroc.infrastructure.cap.httpx.AsyncClient",
-        lambda *a, **kw: _client_with(httpx.MockTransport(handler)),
-    )
-    assert await verify_cap_token(CONFIG, "token-abc") is True
+    verifier = _verifier_with(handler)
+    assert await verify_cap_token(verifier, "token-abc") is True
     assert captured["url"] == "https://cap.example.com/site-1/siteverify"
     assert b"secret-1" in captured["body"]
     assert b"token-abc" in captured["body"]
+    await verifier.close()
 
 
-async def test_verify_cap_token_returns_false_on_success_false(monkeypatch):
+async def test_verify_cap_token_returns_false_on_success_false():
     def handler(request):
         return httpx.Response(200, json={"success": False})
 
-    monkeypatch.setattr(
-        "babytroc.infrastructure.cap.httpx.AsyncClient",
-        lambda *a, **kw: _client_with(httpx.MockTransport(handler)),
-    )
-    assert await verify_cap_token(CONFIG, "bad-token") is False
+    verifier = _verifier_with(handler)
+    assert await verify_cap_token(verifier, "bad-token") is False
+    await verifier.close()
 
 
-async def test_verify_cap_token_returns_false_on_non_200(monkeypatch):
+async def test_verify_cap_token_returns_false_on_non_200():
     def handler(request):
         return httpx.Response(500, json={"error": "boom"})
 
-    monkeypatch.setattr(
-        "babytroc.infrastructure.cap.httpx.AsyncClient",
-        lambda *a, **kw: _client_with(httpx.MockTransport(handler)),
-    )
-    assert await verify_cap_token(CONFIG, "token") is False
+    verifier = _verifier_with(handler)
+    assert await verify_cap_token(verifier, "token") is False
+    await verifier.close()
 
 
-async def test_verify_cap_token_returns_false_on_network_error(monkeypatch):
+async def test_verify_cap_token_returns_false_on_network_error():
     def handler(request):
         msg = "server unreachable"
         raise httpx.ConnectError(msg)
 
-    monkeypatch.setattr(
-        "babytroc.infrastructure.cap.httpx.AsyncClient",
-        lambda *a, **kw: _client_with(httpx.MockTransport(handler)),
-    )
-    assert await verify_cap_token(CONFIG, "token") is False
+    verifier = _verifier_with(handler)
+    assert await verify_cap_token(verifier, "token") is False
+    await verifier.close()
 
 
-async def test_verify_cap_token_returns_false_on_invalid_json(monkeypatch):
+async def test_verify_cap_token_returns_false_on_invalid_json():
     def handler(request):
         return httpx.Response(200, content=b"not json")
 
-    monkeypatch.setattr(
-        "babytroc.infrastructure.cap.httpx.AsyncClient",
-        lambda *a, **kw: _client_with(httpx.MockTransport(handler)),
-    )
-    assert await verify_cap_token(CONFIG, "token") is False
+    verifier = _verifier_with(handler)
+    assert await verify_cap_token(verifier, "token") is False
+    await verifier.close()
+
+
+class TestCapVerifier:
+    async def test_client_is_opened_once_and_reused(self):
+        def handler(request):
+            return httpx.Response(200, json={"success": True})
+
+        verifier = _verifier_with(handler)
+        client = verifier.client
+        await verifier.verify("token-1")
+        await verifier.verify("token-2")
+        assert verifier.client is client
+        await verifier.close()
+        assert verifier.client is not client
+        await verifier.close()
+
+    async def test_rejections_are_cached_by_token(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"success": False})
+
+        verifier = _verifier_with(handler)
+        assert await verifier.verify("bad-token") is False
+        assert await verifier.verify("bad-token") is False
+        assert len(calls) == 1
+        await verifier.close()
+
+    async def test_cached_rejections_expire(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"success": False})
+
+        verifier = _verifier_with(
+            handler,
+            CONFIG._replace(result_cache_ttl=timedelta(milliseconds=50)),
+        )
+        await verifier.verify("token")
+        await asyncio.sleep(0.1)
+        await verifier.verify("token")
+        assert len(calls) == 2
+        await verifier.close()
+
+    async def test_null_ttl_disables_cache(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"success": False})
+
+        verifier = _verifier_with(
+            handler,
+            CONFIG._replace(result_cache_ttl=timedelta(0)),
+        )
+        await verifier.verify("token")
+        await verifier.verify("token")
+        assert len(calls) == 2
+        await verifier.close()
+
+    async def test_failures_are_not_cached(self):
+        responses = [
+            httpx.Response(503),
+            httpx.Response(200, json={"success": True}),
+        ]
+
+        def handler(request):
+            return responses.pop(0)
+
+        verifier = _verifier_with(handler)
+        assert await verifier.verify("token") is False
+        assert await verifier.verify("token") is True
+        await verifier.close()
+
+    async def test_accepted_token_cannot_be_replayed(self):
+        redeemed = set()
+
+        async def handler(request):
+            # the cap server accepts a token once
+            token = request.read()
+            await asyncio.sleep(0.01)
+            if token in redeemed:
+                return httpx.Response(200, json={"success": False})
+            redeemed.add(token)
+            return httpx.Response(200, json={"success": True})
+
+        verifier = _verifier_with(handler)
+        assert await verifier.verify("token-1") is True
+        assert await verifier.verify("token-1") is False
+
+        results = await asyncio.gather(*(verifier.verify("token-2") for _ in range(3)))
+        assert sorted(results) == [False, False, True]
+        await verifier.close()
+
+    async def test_concurrency_is_capped(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def handler(request):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return httpx.Response(200, json={"success": True})
+
+        verifier = _verifier_with(handler, CONFIG._replace(max_concurrency=2))
+        results = await asyncio.gather(
+            *(verifier.verify(f"token-{i}") for i in range(6)),
+        )
+        assert all(results)
+        assert max_in_flight == 2
+        await verifier.close()
@@ -0,0 +1,158 @@
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from babytroc.infrastructure.event_outbox import EventOutboxEntry, relay_event_outbox
+from babytroc.infrastructure.events import (
+    EventHandlerExecutor,
+    _handlers,
+    dispatch_pending_events,
+    emit,
+    init_event_handler_executor_dependency,
+    on,
+)
+
+
+@dataclass(frozen=True)
+class _OutboxTestEvent:
+    value: int
+
+
+@pytest.fixture(autouse=True)
+def _isolate_test_event_handlers():
+    """Save and restore the global handler registry (see `test_events`)."""
+    snapshot = {k: list(v) for k, v in _handlers.items()}
+    try:
+        yield
+    finally:
+        _handlers.clear()
+        for k, v in snapshot.items():
+            _handlers[k] = v
+
+
+@pytest.fixture
+async def executor(
+    database_sessionmaker: async_sessionmaker,
+) -> AsyncGenerator[EventHandlerExecutor]:
+    executor = EventHandlerExecutor(
+        concurrency=2,
+        max_attempts=2,
+        retry_delay=0,
+        outbox_session_maker=database_sessionmaker,
+    )
+    init_event_handler_executor_dependency(executor)
+    try:
+        yield executor
+    finally:
+        await executor.drain()
+        init_event_handler_executor_dependency(None)
+
+
+async def _emit_committed(session_maker: async_sessionmaker, event: object) -> None:
+    """Emit `event` in a committed transaction, as a request would."""
+
+    async with session_maker.begin() as db:
+        await emit(db, event)
+    dispatch_pending_events(db)
+
+
+async def _outbox_entries(session_maker: async_sessionmaker) -> list[EventOutboxEntry]:
+    async with session_maker() as db:
+        return list((await db.scalars(select(EventOutboxEntry))).all())
+
+
+class TestEventOutbox:
+    async def test_handled_event_is_removed_from_outbox(
+        self,
+        database_sessionmaker: async_sessionmaker,
+        executor: EventHandlerExecutor,
+    ):
+        results = []
+
+        @on(_OutboxTestEvent, critical=False)
+        async def handler(db, event):
+            results.append(event.value)
+
+        await _emit_committed(database_sessionmaker, _OutboxTestEvent(value=1))
+        assert len(await _outbox_entries(database_sessionmaker)) == 1
+
+        await executor.drain()
+
+        assert results == [1]
+        assert await _outbox_entries(database_sessionmaker) == []
+
+    async def test_failed_event_is_kept_and_relayed(
+        self,
+        database_sessionmaker: async_sessionmaker,
+        executor: EventHandlerExecutor,
+    ):
+        results = []
+        failing = True
+
+        @on(_OutboxTestEvent, critical=False)
+        async def handler(db, event):
+            if failing:
+                msg = "unavailable"
+                raise RuntimeError(msg)
+            results.append(event.value)
+
+        await _emit_committed(database_sessionmaker, _OutboxTestEvent(value=1))
+        await executor.drain()
+
+        [entry] = await _outbox_entries(database_sessionmaker)
+        assert entry.attempts == 1
+
+        # the relay keeps the entry while handlers fail
+        relayed = await relay_event_outbox(
+            database_sessionmaker,
+            executor,
+            min_age=timedelta(0),
+        )
+        assert relayed == 0
+        [entry] = await _outbox_entries(database_sessionmaker)
+        assert entry.attempts == 2
+        assert entry.lease_expiration_date is not None
+
+        # then replays it once the lease expired
+        async with database_sessionmaker.begin() as db:
+            entry = await db.get_one(EventOutboxEntry, entry.id)
+            entry.lease_expiration_date = None
+
+        failing = False
+        relayed = await relay_event_outbox(
+            database_sessionmaker,
+            executor,
+            min_age=timedelta(0),
+        )
+
+        assert relayed == 1
+        assert results == [1]
+        assert await _outbox_entries(database_sessionmaker) == []
+
+    async def test_relay_skips_leased_entries(
+        self,
+        database_sessionmaker: async_sessionmaker,
+        executor: EventHandlerExecutor,
+    ):
+        @on(_OutboxTestEvent, critical=False)
+        async def handler(db, event):
+            msg = "unavailable"
+            raise RuntimeError(msg)
+
+        await _emit_committed(database_sessionmaker, _OutboxTestEvent(value=1))
+        await executor.drain()
+        await relay_event_outbox(database_sessionmaker, executor, min_age=timedelta(0))
+
+        relayed = await relay_event_outbox(
+            database_sessionmaker,
+            executor,
+            min_age=timedelta(0),
+        )
+
+        assert relayed == 0
+        [entry] = await _outbox_entries(database_sessionmaker)
+        assert entry.attempts == 2
@@ -1,8 +1,20 @@
+import asyncio
 from dataclasses import dataclass
+from types import SimpleNamespace
 
 import pytest
 
-from babytroc.infrastructure.events import _handlers, emit, on
+from babytroc.infrastructure.events import (
+    EventHandlerExecutor,
+    _handlers,
+    batch_events,
+    decode_event,
+    dispatch_pending_events,
+    emit,
+    event_type_name,
+    init_event_handler_executor_dependency,
+    on,
+)
 
 
 @dataclass(frozen=True)
@@ -102,3 +114,232 @@ async def test_handler_receives_db_session():
     sentinel = object()
     await emit(sentinel, _TestEvent(value=1))
     assert received_db == [sentinel]
+
+
+@pytest.fixture
+def executor():
+    executor = EventHandlerExecutor(concurrency=4, max_attempts=3, retry_delay=0)
+    init_event_handler_executor_dependency(executor)
+    try:
+        yield executor
+    finally:
+        init_event_handler_executor_dependency(None)
+
+
+class TestDeferredHandlers:
+    async def test_non_critical_handler_runs_after_dispatch(self, executor):
+        results = []
+
+        @on(_TestEvent, critical=False)
+        async def handler(db, event):
+            results.append((db, event.value))
+
+        db = SimpleNamespace(info={})
+        await emit(db, _TestEvent(value=1))
+        assert results == []
+
+        dispatch_pending_events(db)
+        await executor.drain()
+
+        # the emitting session is over when the handler runs
+        assert results == [(None, 1)]
+        assert db.info == {}
+
+    async def test_critical_handler_still_runs_inline(self, executor):
+        results = []
+
+        @on(_TestEvent)
+        async def handler(db, event):
+            results.append(db)
+
+        db = SimpleNamespace(info={})
+        await emit(db, _TestEvent(value=1))
+
+        assert results == [db]
+
+    async def test_discarded_session_runs_nothing(self, executor):
+        results = []
+
+        @on(_TestEvent, critical=False)
+        async def handler(db, event):
+            results.append(event.value)
+
+        await emit(SimpleNamespace(info={}), _TestEvent(value=1))
+        await executor.drain()
+
+        assert results == []
+
+    async def test_failing_handler_is_retried(self, executor):
+        attempts = []
+
+        @on(_TestEvent, critical=False)
+        async def flaky(db, event):
+            attempts.append(event.value)
+            if len(attempts) < 3:
+                msg = "flaky"
+                raise RuntimeError(msg)
+
+        db = SimpleNamespace(info={})
+        await emit(db, _TestEvent(value=1))
+        dispatch_pending_events(db)
+        await executor.drain()
+
+        assert attempts == [1, 1, 1]
+
+    async def test_handler_is_given_up_after_max_attempts(self, executor, caplog):
+        attempts = []
+
+        @on(_TestEvent, critical=False)
+        async def failing(db, event):
+            attempts.append(event.value)
+            msg = "always failing"
+            raise RuntimeError(msg)
+
+        @on(_TestEvent, critical=False)
+        async def after(db, event):
+            attempts.append("after")
+
+        db = SimpleNamespace(info={})
+        await emit(db, _TestEvent(value=1))
+        dispatch_pending_events(db)
+        await executor.drain()
+
+        assert attempts == [1, 1, 1, "after"]
+        assert "always failing" in caplog.text
+
+    async def test_handle_reports_given_up_handlers(self):
+        executor = EventHandlerExecutor(concurrency=1, max_attempts=2, retry_delay=0)
+
+        async def succeeding(db, event):
+            pass
+
+        async def failing(db, event):
+            msg = "always failing"
+            raise RuntimeError(msg)
+
+        event = _TestEvent(value=1)
+        assert await executor.handle(event, [succeeding]) is True
+        assert await executor.handle(event, [failing, succeeding]) is False
+
+    async def test_concurrency_is_bounded(self):
+        executor = EventHandlerExecutor(concurrency=2, max_attempts=1, retry_delay=0)
+        running = 0
+        max_running = 0
+
+        async def handler(db, event):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        for value in range(5):
+            executor.submit(_TestEvent(value=value), [handler])
+        assert len(executor) == 5
+
+        await executor.drain()
+
+        assert max_running == 2
+        assert len(executor) == 0
+
+
+class TestBatchEvents:
+    async def test_identical_events_are_handled_once(self):
+        results = []
+
+        @on(_TestEvent, critical=False)
+        async def handler(db, event):
+            results.append(event.value)
+
+        async with batch_events():
+            await emit(None, _TestEvent(value=1))
+            await emit(None, _TestEvent(value=1))
+            await emit(None, _TestEvent(value=2))
+            assert results == []
+
+        assert results == [1, 2]
+
+    async def test_coalesce_key(self):
+        results = []
+
+        @on(_TestEvent, critical=False, coalesce=lambda event: event.value % 2)
+        async def handler(db, event):
+            results.append(event.value)
+
+        async with batch_events():
+            for value in range(5):
+                await emit(None, _TestEvent(value=value))
+
+        assert results == [0, 1]
+
+    async def test_critical_handler_is_not_batched(self):
+        results = []
+
+        @on(_TestEvent)
+        async def handler(db, event):
+            results.append(event.value)
+
+        async with batch_events():
+            await emit(None, _TestEvent(value=1))
+            await emit(None, _TestEvent(value=1))
+            assert results == [1, 1]
+
+    async def test_nested_scope_joins_outer(self):
+        results = []
+
+        @on(_TestEvent, critical=False)
+        async def handler(db, event):
+            results.append(event.value)
+
+        async with batch_events():
+            async with batch_events():
+                await emit(None, _TestEvent(value=1))
+            assert results == []
+            await emit(None, _TestEvent(value=1))
+
+        assert results == [1]
+
+    async def test_exception_discards_batch(self):
+        results = []
+
+        @on(_TestEvent, critical=False)
+        async def handler(db, event):
+            results.append(event.value)
+
+        async def failing_unit_of_work():
+            async with batch_events():
+                await emit(None, _TestEvent(value=1))
+                msg = "rollback"
+                raise RuntimeError(msg)
+
+        with pytest.raises(RuntimeError, match="rollback"):
+            await failing_unit_of_work()
+
+        assert results == []
+
+    async def test_batch_is_deferred_with_executor(self, executor):
+        results = []
+
+        @on(_TestEvent, critical=False, coalesce=lambda event: None)
+        async def handler(db, event):
+            results.append(event.value)
+
+        db = SimpleNamespace(info={})
+        async with batch_events():
+            await emit(db, _TestEvent(value=1))
+            await emit(db, _TestEvent(value=2))
+
+        dispatch_pending_events(db)
+        await executor.drain()
+
+        assert results == [1]
+
+
+def test_decode_event():
+    @on(_TestEvent, critical=False)
+    async def handler(db, event):
+        pass
+
+    name = event_type_name(_TestEvent)
+    assert decode_event(name, {"value": 3}) == _TestEvent(value=3)
+    assert decode_event("unknown.Event", {}) is None
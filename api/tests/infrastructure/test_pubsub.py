@@ -0,0 +1,86 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from broadcaster import Broadcast
+
+from babytroc.domains.chat.schemas.pubsub import (
+    PubsubMessageNewChatMessage,
+    PubsubMessageTypeAdapter,
+    PubsubMessageUpdatedChatMessage,
+)
+from babytroc.infrastructure.pubsub import (
+    event_id_key,
+    flush_pending_notifications,
+    notify_user_after_commit,
+    user_channel,
+)
+
+
+@pytest.fixture
+async def broadcast():
+    async with Broadcast("memory://") as broadcast:
+        yield broadcast
+
+
+async def publish_and_receive(broadcast, db, user_id: int) -> list:
+    async with broadcast.subscribe(channel=user_channel(user_id)) as subscriber:
+        await flush_pending_notifications(db)
+
+        messages = []
+        try:
+            while True:
+                async with asyncio.timeout(0.2):
+                    event = await subscriber.get()
+                messages.append(PubsubMessageTypeAdapter.validate_json(event.message))
+        except TimeoutError:
+            pass
+
+    return messages
+
+
+class TestFlushPendingNotifications:
+    async def test_published_in_order(self, broadcast):
+        db = SimpleNamespace(info={})
+        notify_user_after_commit(
+            db, broadcast, 1, PubsubMessageNewChatMessage(chat_message_id=1)
+        )
+        notify_user_after_commit(
+            db, broadcast, 1, PubsubMessageNewChatMessage(chat_message_id=2)
+        )
+
+        messages = await publish_and_receive(broadcast, db, 1)
+
+        assert [msg.chat_message_id for msg in messages] == [1, 2]
+
+    async def test_updated_chat_message_deduplicated(self, broadcast):
+        db = SimpleNamespace(info={})
+        for user_id in (1, 2):
+            for _ in range(3):
+                notify_user_after_commit(
+                    db,
+                    broadcast,
+                    user_id,
+                    PubsubMessageUpdatedChatMessage(chat_message_id=7),
+                )
+        notify_user_after_commit(
+            db, broadcast, 1, PubsubMessageUpdatedChatMessage(chat_message_id=8)
+        )
+
+        messages = await publish_and_receive(broadcast, db, 1)
+
+        assert [msg.chat_message_id for msg in messages] == [7, 8]
+
+    async def test_pending_notifications_cleared(self, broadcast):
+        db = SimpleNamespace(info={})
+        notify_user_after_commit(
+            db, broadcast, 1, PubsubMessageNewChatMessage(chat_message_id=1)
+        )
+        await flush_pending_notifications(db)
+
+        assert await publish_and_receive(broadcast, db, 1) == []
+
+
+def test_event_id_key_orders_stream_ids():
+    assert event_id_key("10-2") > event_id_key("9-15")
+    assert event_id_key("10-2") > event_id_key("10-1")
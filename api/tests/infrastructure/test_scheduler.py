@@ -0,0 +1,119 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from redis.asyncio import Redis
+
+from babytroc.infrastructure.scheduler import (
+    JobContext,
+    MaintenanceScheduler,
+    _ScheduledJob,
+    get_job_runs,
+)
+
+
+@pytest.fixture
+async def redis_client():
+    client = Redis(host="localhost", port=6379, db=12)
+    await client.flushdb()
+    yield client
+    await client.flushdb()
+    await client.aclose()
+
+
+def make_scheduler(redis_client, *jobs, config=None):
+    context = JobContext(
+        config=config,
+        session_maker=None,  # type: ignore[arg-type]
+        redis=redis_client,
+    )
+    return MaintenanceScheduler(context, tick=1, jobs=jobs)
+
+
+class TestMaintenanceScheduler:
+    async def test_job_runs_once_per_interval_in_cluster(self, redis_client):
+        calls = []
+
+        async def purge(context):
+            calls.append(context)
+            return {"deleted": 3}
+
+        scheduled = _ScheduledJob(name="purge", fn=purge, interval=timedelta(hours=1))
+
+        # two workers
+        first = make_scheduler(redis_client, scheduled)
+        second = make_scheduler(redis_client, scheduled)
+
+        runs = await first.run_due_jobs()
+        assert [run.counts for run in runs] == [{"deleted": 3}]
+
+        assert await second.run_due_jobs() == []
+        assert await first.run_due_jobs() == []
+        assert len(calls) == 1
+
+    async def test_run_is_recorded(self, redis_client):
+        async def purge(context):
+            return {"deleted": 2, "scanned": 5}
+
+        scheduler = make_scheduler(
+            redis_client,
+            _ScheduledJob(name="purge", fn=purge, interval=timedelta(hours=1)),
+        )
+        (run,) = await scheduler.run_due_jobs()
+
+        runs = await get_job_runs(redis_client)
+        assert runs == {"purge": run}
+        assert runs["purge"].counts == {"deleted": 2, "scanned": 5}
+        assert runs["purge"].duration >= 0
+        assert runs["purge"].error is None
+
+    async def test_failed_job_is_retried_on_next_tick(self, redis_client):
+        attempts = []
+
+        async def flaky(context):
+            attempts.append(context)
+            if len(attempts) == 1:
+                msg = "boom"
+                raise RuntimeError(msg)
+
+        scheduler = make_scheduler(
+            redis_client,
+            _ScheduledJob(name="flaky", fn=flaky, interval=timedelta(hours=1)),
+        )
+
+        (failed,) = await scheduler.run_due_jobs()
+        assert failed.error is not None
+        assert (await get_job_runs(redis_client))["flaky"].error is not None
+
+        (succeeded,) = await scheduler.run_due_jobs()
+        assert succeeded.error is None
+        assert succeeded.counts == {}
+        assert len(attempts) == 2
+
+    async def test_interval_from_config(self, redis_client):
+        calls = []
+
+        async def purge(context):
+            calls.append(context)
+
+        scheduled = _ScheduledJob(
+            name="purge",
+            fn=purge,
+            interval=lambda config: config.purge_interval,
+        )
+
+        disabled = make_scheduler(
+            redis_client,
+            scheduled,
+            config=SimpleNamespace(purge_interval=timedelta(0)),
+        )
+        assert await disabled.run_due_jobs() == []
+
+        enabled = make_scheduler(
+            redis_client,
+            scheduled,
+            config=SimpleNamespace(purge_interval=timedelta(minutes=5)),
+        )
+        assert len(await enabled.run_due_jobs()) == 1
+        assert 0 < await redis_client.pttl("babytroc:maintenance:lock:purge") <= 300_000
+        assert len(calls) == 1
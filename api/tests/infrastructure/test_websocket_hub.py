@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+from redis.asyncio import Redis
+
+from babytroc.infrastructure.pubsub import user_channel
+from babytroc.infrastructure.websocket_hub import WebSocketHub
+
+pytestmark = pytest.mark.timeout(30)
+
+
+def make_hub(redis_client: Redis | None = None, *, queue_size: int = 4):
+    return WebSocketHub(
+        redis_client,  # type: ignore[arg-type]
+        queue_size=queue_size,
+        send_timeout=1,
+        reconnect_delay=0.01,
+    )
+
+
+async def receive(connection, count: int) -> list[str]:
+    payloads = []
+    async with asyncio.timeout(5):
+        async for payload in connection:
+            payloads.append(payload)
+            if len(payloads) == count:
+                break
+    return payloads
+
+
+class TestWebSocketHubDispatch:
+    async def test_dispatch_to_every_connection_of_user(self):
+        hub = make_hub()
+        with hub.connect(1) as tab_1, hub.connect(1) as tab_2, hub.connect(2) as other:
+            hub.dispatch(1, "a")
+            assert await receive(tab_1, 1) == ["a"]
+            assert await receive(tab_2, 1) == ["a"]
+            assert other.push("sentinel")
+            assert await receive(other, 1) == ["sentinel"]
+
+    async def test_disconnect_unregisters(self):
+        hub = make_hub()
+        with hub.connect(1):
+            assert len(hub) == 1
+        assert len(hub) == 0
+        hub.dispatch(1, "a")
+
+    async def test_slow_consumer_is_evicted(self):
+        hub = make_hub(queue_size=2)
+        with hub.connect(1) as slow, hub.connect(1) as fast:
+            for payload in ("a", "b"):
+                hub.dispatch(1, payload)
+                assert await receive(fast, 1) == [payload]
+
+            hub.dispatch(1, "c")
+
+            assert slow.evicted
+            assert not fast.evicted
+            assert len(hub) == 1
+            assert [payload async for payload in slow] == []
+            assert await receive(fast, 1) == ["c"]
+
+
+@pytest.fixture
+async def redis_client():
+    client = Redis(host="localhost", port=6379, db=13)
+    yield client
+    await client.aclose()
+
+
+class TestWebSocketHubSubscription:
+    async def test_published_notifications_are_dispatched(self, redis_client):
+        hub = make_hub(redis_client)
+        listener = asyncio.create_task(hub.run())
+        await asyncio.sleep(0.1)
+
+        try:
+            with hub.connect(1) as connection:
+                await redis_client.publish(user_channel(2), "other")
+                await redis_client.publish(user_channel(1), "mine")
+
+                assert await receive(connection, 1) == ["mine"]
+
+        finally:
+            listener.cancel()
+
+    async def test_resubscribes_after_dispatch_failure(
+        self,
+        redis_client,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        hub = make_hub(redis_client)
+        dispatch_message = hub._dispatch_message
+        failures = [RuntimeError("malformed notification")]
+
+        def flaky_dispatch_message(message):
+            if failures:
+                raise failures.pop()
+            dispatch_message(message)
+
+        monkeypatch.setattr(hub, "_dispatch_message", flaky_dispatch_message)
+        listener = asyncio.create_task(hub.run())
+        await asyncio.sleep(0.1)
+
+        try:
+            with hub.connect(1) as connection:
+                await redis_client.publish(user_channel(1), "lost")
+                await asyncio.sleep(0.1)
+                await redis_client.publish(user_channel(1), "mine")
+
+                assert await receive(connection, 1) == ["mine"]
+
+        finally:
+            listener.cancel()
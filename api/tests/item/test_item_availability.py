@@ -64,3 +64,38 @@ class TestItemAvailabilityWithLoans:
         item = ItemRead.model_validate(resp.json())
 
         assert item.available is True
+
+    async def test_availability_filter_during_active_loan(
+        self,
+        alice_client: AsyncClient,
+        alice_new_item: ItemRead,
+        bob_new_loan_of_alice_new_item: LoanRead,
+    ):
+        """Filtering on availability should follow the active loans."""
+
+        resp = await alice_client.get("/api/v1/me/items", params={"av": "y"})
+        resp.raise_for_status()
+        assert alice_new_item.id not in [item["id"] for item in resp.json()]
+
+        resp = await alice_client.get("/api/v1/me/items", params={"av": "n"})
+        resp.raise_for_status()
+        assert alice_new_item.id in [item["id"] for item in resp.json()]
+
+    async def test_item_available_after_borrower_deleted(
+        self,
+        alice_client: AsyncClient,
+        bob_client: AsyncClient,
+        alice_new_item: ItemRead,
+        bob_new_loan_of_alice_new_item: LoanRead,
+    ):
+        """An item should become available again when its loan is deleted."""
+
+        # the loan is deleted in cascade
+        resp = await bob_client.delete("/api/v1/me")
+        resp.raise_for_status()
+
+        resp = await alice_client.get(f"/api/v1/me/items/{alice_new_item.id}")
+        resp.raise_for_status()
+        item = ItemRead.model_validate(resp.json())
+
+        assert item.available is True
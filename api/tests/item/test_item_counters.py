@@ -0,0 +1,149 @@
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from babytroc.domains.item.jobs import reconcile_counters as reconcile_counters_job
+from babytroc.domains.item.models import Item
+from babytroc.domains.item.schemas.read import ItemRead
+from babytroc.domains.item.services.counters import reconcile_counters
+from babytroc.domains.user.models import User
+from babytroc.domains.user.schemas.private import UserPrivateRead
+from babytroc.infrastructure.scheduler import JobContext
+
+
+class TestItemCounters:
+    """Test the likes and items counters maintained on write."""
+
+    async def test_owner_likes_count(
+        self,
+        client: AsyncClient,
+        bob_client: AsyncClient,
+        alice: UserPrivateRead,
+        alice_items: list[ItemRead],
+    ):
+        resp = await client.get(f"/api/v1/users/{alice.id}")
+        resp.raise_for_status()
+        initial_likes = resp.json()["likes_count"]
+
+        resp = await bob_client.post(f"/api/v1/me/liked/{alice_items[0].id}")
+        resp.raise_for_status()
+
+        resp = await client.get(f"/api/v1/users/{alice.id}")
+        resp.raise_for_status()
+        assert resp.json()["likes_count"] == initial_likes + 1
+
+        resp = await bob_client.delete(f"/api/v1/me/liked/{alice_items[0].id}")
+        resp.raise_for_status()
+
+        # removing a like that does not exist leaves the counters untouched
+        resp = await bob_client.delete(f"/api/v1/me/liked/{alice_items[0].id}")
+        resp.raise_for_status()
+
+        resp = await client.get(f"/api/v1/users/{alice.id}")
+        resp.raise_for_status()
+        assert resp.json()["likes_count"] == initial_likes
+
+    async def test_item_deleted(
+        self,
+        client: AsyncClient,
+        alice_client: AsyncClient,
+        bob_client: AsyncClient,
+        alice: UserPrivateRead,
+        alice_items: list[ItemRead],
+    ):
+        item = alice_items[0]
+
+        resp = await bob_client.post(f"/api/v1/me/liked/{item.id}")
+        resp.raise_for_status()
+
+        resp = await client.get(f"/api/v1/users/{alice.id}")
+        resp.raise_for_status()
+        before = resp.json()
+
+        resp = await alice_client.delete(f"/api/v1/me/items/{item.id}")
+        resp.raise_for_status()
+
+        resp = await client.get(f"/api/v1/users/{alice.id}")
+        resp.raise_for_status()
+        after = resp.json()
+
+        assert after["items_count"] == before["items_count"] - 1
+        assert after["likes_count"] == before["likes_count"] - 1
+
+    async def test_liker_deleted(
+        self,
+        alice_client: AsyncClient,
+        bob_client: AsyncClient,
+        alice_items: list[ItemRead],
+    ):
+        item = alice_items[0]
+
+        resp = await bob_client.post(f"/api/v1/me/liked/{item.id}")
+        resp.raise_for_status()
+
+        resp = await alice_client.get(f"/api/v1/me/items/{item.id}")
+        resp.raise_for_status()
+        likes_count = resp.json()["likes_count"]
+
+        # the likes of bob are deleted in cascade
+        resp = await bob_client.delete("/api/v1/me")
+        resp.raise_for_status()
+
+        resp = await alice_client.get(f"/api/v1/me/items/{item.id}")
+        resp.raise_for_status()
+        assert resp.json()["likes_count"] == likes_count - 1
+
+    async def test_reconcile_counters(
+        self,
+        client: AsyncClient,
+        database_sessionmaker: async_sessionmaker,
+        alice: UserPrivateRead,
+        alice_items: list[ItemRead],
+    ):
+        item = alice_items[0]
+
+        # introduce drift
+        async with database_sessionmaker.begin() as session:
+            await session.execute(
+                update(Item).values(likes_count=42).where(Item.id == item.id)
+            )
+            await session.execute(
+                update(User).values(items_count=42).where(User.id == alice.id)
+            )
+
+        async with database_sessionmaker.begin() as session:
+            reconciled = await reconcile_counters(session)
+
+        assert reconciled.items == 1
+        assert reconciled.users >= 1
+
+        async with database_sessionmaker.begin() as session:
+            assert await reconcile_counters(session) == (0, 0)
+
+        resp = await client.get(f"/api/v1/users/{alice.id}")
+        resp.raise_for_status()
+        assert resp.json()["items_count"] == len(alice_items)
+
+    async def test_reconcile_counters_job(
+        self,
+        app: FastAPI,
+        database_sessionmaker: async_sessionmaker,
+        alice: UserPrivateRead,
+        alice_items: list[ItemRead],
+    ):
+        async with database_sessionmaker.begin() as session:
+            await session.execute(
+                update(User).values(items_count=42).where(User.id == alice.id)
+            )
+
+        counts = await reconcile_counters_job(
+            JobContext(
+                config=app.state.config,
+                session_maker=database_sessionmaker,
+                redis=app.state.redis,
+            )
+        )
+
+        assert counts["items"] == 0
+        assert counts["users"] >= 1
@@ -66,6 +66,18 @@ class TestItemLikeOperations:
         resp.raise_for_status()
         assert resp.json()["likes_count"] == count_after_like - 1
 
-    # NOTE: GET /me/liked/{item_id} triggers a SQLAlchemy auto-correlation
-    # error with the deferred likes_count column property. This is a
-    # pre-existing bug to fix separately.
+    async def test_get_liked_item(
+        self,
+        bob_client: AsyncClient,
+        alice_items: list[ItemRead],
+    ):
+        """Get a liked item, including its likes count."""
+        item = alice_items[0]
+
+        resp = await bob_client.post(f"/api/v1/me/liked/{item.id}")
+        resp.raise_for_status()
+
+        resp = await bob_client.get(f"/api/v1/me/liked/{item.id}")
+        resp.raise_for_status()
+        assert resp.json()["id"] == item.id
+        assert resp.json()["likes_count"] >= 1
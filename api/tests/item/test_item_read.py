@@ -372,6 +372,38 @@ class TestItemsReadFilterWords:
 
         assert item_ids == expected_item_ids
 
+    @pytest.mark.parametrize("words", [["senatt"], ["Sénatt"], ["senatt", "xxxyyyzzz"]])
+    async def test_list_item_with_misspelled_french_word_senat(
+        self,
+        client: AsyncClient,
+        words: list[str],
+        some_items_with_french_names: list[ItemRead],
+    ):
+        """Filter item with misspelled words like 'senat'."""
+
+        expected_item_ids = {
+            item.id: item.name
+            for item in some_items_with_french_names
+            if "senat" in unidecode(item.name.lower())
+        }
+
+        # get client items list
+        item_ids = {
+            item["id"]: item["name"]
+            async for page in iter_paginated_endpoint(
+                url="/api/v1/items",
+                client=client,
+                params={
+                    "av": "a",
+                    "n": 256,
+                    "q": words,
+                },
+            )
+            for item in page
+        }
+
+        assert item_ids == expected_item_ids
+
     @pytest.mark.parametrize(
         "words", [["lecon"], ["leçon"], ["Leçon"], ["Lecon", "xxxyyyzzz"]]
     )
@@ -0,0 +1,43 @@
+import pytest
+from httpx import AsyncClient
+
+from babytroc.domains.item.search import words_tsquery
+
+
+class TestWordsTsquery:
+    """Test the full-text query built from search words."""
+
+    def test_single_word(self):
+        assert words_tsquery(["senat"]) == "(senat:*)"
+
+    def test_words_are_alternatives(self):
+        assert words_tsquery(["senat", "bleu"]) == "(senat:*) | (bleu:*)"
+
+    def test_word_tokens_are_required(self):
+        assert words_tsquery(["bien-être"]) == "(bien:* & être:*)"
+
+    def test_operators_are_dropped(self):
+        assert words_tsquery(["a|b", "!c", "d:*&"]) == (
+            "(a:* & b:*) | (c:*) | (d:*)"
+        )
+
+    def test_no_token(self):
+        assert words_tsquery(["!!", "&"]) == ""
+
+
+@pytest.mark.db_template("french_named_items")
+@pytest.mark.usefixtures("some_items_with_french_names")
+class TestItemsSearch:
+    """Test items search edge cases."""
+
+    async def test_search_without_token(
+        self,
+        client: AsyncClient,
+    ):
+        resp = await client.get(
+            url="/api/v1/items",
+            params={"av": "a", "q": ["!!"]},
+        )
+        resp.raise_for_status()
+
+        assert resp.json() == []
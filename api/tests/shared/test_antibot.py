@@ -1,14 +1,17 @@
 import pytest
 from pydantic import ValidationError
 
+from babytroc.infrastructure.cap import CapVerifier
 from babytroc.infrastructure.config import CapConfig
 from babytroc.shared.antibot import AntiBotMixin, verify_antibot
 from babytroc.shared.errors import BadRequestError
 
-CAP_CONFIG = CapConfig(
-    api_url="https://cap.example.com",
-    site_key="site",
-    secret_key="secret",
+CAP_VERIFIER = CapVerifier(
+    CapConfig(
+        api_url="https://cap.example.com",
+        site_key="site",
+        secret_key="secret",
+    ),
 )
 
 
@@ -40,34 +43,34 @@ def test_mixin_rejects_cap_token_too_long():
 # --- verify_antibot ---
 
 async def test_verify_antibot_passes_when_clean(monkeypatch: pytest.MonkeyPatch):
-    async def _ok(_config, _token):
+    async def _ok(_verifier, _token):
         return True
     monkeypatch.setattr("babytroc.shared.antibot.verify_cap_token", _ok)
-    await verify_antibot(_payload(), CAP_CONFIG)  # should not raise
+    await verify_antibot(_payload(), CAP_VERIFIER)  # should not raise
 
 
 async def test_verify_antibot_rejects_filled_honeypot():
     with pytest.raises(BadRequestError) as exc:
-        await verify_antibot(_payload(website="x"), CAP_CONFIG)
+        await verify_antibot(_payload(website="x"), CAP_VERIFIER)
     assert exc.value.message == "INVALID_SUBMISSION"
 
 
 async def test_verify_antibot_rejects_when_cap_fails(monkeypatch: pytest.MonkeyPatch):
-    async def _fail(_config, _token):
+    async def _fail(_verifier, _token):
         return False
     monkeypatch.setattr("babytroc.shared.antibot.verify_cap_token", _fail)
     with pytest.raises(BadRequestError) as exc:
-        await verify_antibot(_payload(), CAP_CONFIG)
+        await verify_antibot(_payload(), CAP_VERIFIER)
     assert exc.value.message == "INVALID_SUBMISSION"
 
 
 async def test_verify_antibot_runs_honeypot_before_cap(monkeypatch: pytest.MonkeyPatch):
     cap_called = False
-    async def _spy(_config, _token):
+    async def _spy(_verifier, _token):
         nonlocal cap_called
         cap_called = True
         return True
     monkeypatch.setattr("babytroc.shared.antibot.verify_cap_token", _spy)
     with pytest.raises(BadRequestError):
-        await verify_antibot(_payload(website="x"), CAP_CONFIG)
+        await verify_antibot(_payload(website="x"), CAP_VERIFIER)
     assert cap_called is False
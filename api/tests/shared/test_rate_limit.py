@@ -1,11 +1,13 @@
+import asyncio
 from datetime import timedelta
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi import Request
+from redis.asyncio import Redis
 
 from babytroc.shared.errors import TooManyRequestsError
-from babytroc.shared.rate_limit import RateLimiter
+from babytroc.shared.rate_limit import LocalTokenBuckets, RateLimiter
 
 
 def _make_request(host: str = "1.2.3.4") -> Request:
@@ -21,6 +23,15 @@ def _make_request(host: str = "1.2.3.4") -> Request:
     return Request(scope=scope)
 
 
+def _make_redis(*, allowed: bool, retry_after_ms: int = 0) -> MagicMock:
+    """Build a Redis mock whose sliding window script returns the given verdict."""
+    redis = MagicMock()
+    script = AsyncMock(return_value=[int(allowed), retry_after_ms])
+    script.registered_client = redis
+    redis.register_script.return_value = script
+    return redis
+
+
 class TestRateLimiter:
     def test_init_stores_params(self):
         rl = RateLimiter(
@@ -34,10 +45,8 @@ class TestRateLimiter:
         assert rl.auth_limit == 10
         assert rl.window == timedelta(seconds=60)
 
-    async def test_anon_first_hit_sets_expiry(self):
-        redis = AsyncMock()
-        redis.incr = AsyncMock(return_value=1)
-        redis.expire = AsyncMock()
+    async def test_anon_uses_ip_key_and_anon_limit(self):
+        redis = _make_redis(allowed=True)
         rl = RateLimiter(
             key_prefix="contact",
             anon_limit=5,
@@ -45,13 +54,27 @@ class TestRateLimiter:
             window=timedelta(seconds=60),
         )
         await rl(request=_make_request("9.9.9.9"), redis=redis, client_id=None)
-        redis.incr.assert_awaited_once_with("ratelimit:contact:ip:9.9.9.9")
-        redis.expire.assert_awaited_once_with("ratelimit:contact:ip:9.9.9.9", 60)
+        script = redis.register_script.return_value
+        script.assert_awaited_once()
+        assert script.await_args.kwargs["keys"] == ["ratelimit:contact:ip:9.9.9.9"]
+        window_ms, limit, _ = script.await_args.kwargs["args"]
+        assert (window_ms, limit) == (60_000, 5)
+
+    async def test_auth_uses_user_key_and_auth_limit(self):
+        redis = _make_redis(allowed=True)
+        rl = RateLimiter(
+            key_prefix="contact",
+            anon_limit=5,
+            auth_limit=10,
+            window=timedelta(seconds=60),
+        )
+        await rl(request=_make_request(), redis=redis, client_id=42)
+        script = redis.register_script.return_value
+        assert script.await_args.kwargs["keys"] == ["ratelimit:contact:user:42"]
+        assert script.await_args.kwargs["args"][1] == 10
 
-    async def test_anon_subsequent_hit_skips_expire(self):
-        redis = AsyncMock()
-        redis.incr = AsyncMock(return_value=2)
-        redis.expire = AsyncMock()
+    async def test_script_registered_once(self):
+        redis = _make_redis(allowed=True)
         rl = RateLimiter(
             key_prefix="contact",
             anon_limit=5,
@@ -59,12 +82,12 @@ class TestRateLimiter:
             window=timedelta(seconds=60),
         )
         await rl(request=_make_request(), redis=redis, client_id=None)
-        redis.expire.assert_not_called()
+        await rl(request=_make_request(), redis=redis, client_id=None)
+        redis.register_script.assert_called_once()
+        assert redis.register_script.return_value.await_count == 2
 
-    async def test_anon_over_limit_raises_429(self):
-        redis = AsyncMock()
-        redis.incr = AsyncMock(return_value=6)
-        redis.expire = AsyncMock()
+    async def test_over_limit_raises_429_with_retry_after(self):
+        redis = _make_redis(allowed=False, retry_after_ms=1500)
         rl = RateLimiter(
             key_prefix="contact",
             anon_limit=5,
@@ -74,50 +97,129 @@ class TestRateLimiter:
         with pytest.raises(TooManyRequestsError) as excinfo:
             await rl(request=_make_request(), redis=redis, client_id=None)
         assert excinfo.value.message == "RATE_LIMITED"
+        assert excinfo.value.headers == {"Retry-After": "2"}
 
-    async def test_auth_uses_user_key_and_auth_limit(self):
-        redis = AsyncMock()
-        redis.incr = AsyncMock(return_value=10)
-        redis.expire = AsyncMock()
+    async def test_local_buckets_reject_without_redis(self):
+        redis = _make_redis(allowed=True)
         rl = RateLimiter(
             key_prefix="contact",
-            anon_limit=5,
+            anon_limit=2,
             auth_limit=10,
             window=timedelta(seconds=60),
         )
-        # 10 == auth_limit → still allowed (strict greater-than triggers 429)
-        await rl(request=_make_request(), redis=redis, client_id=42)
-        redis.incr.assert_awaited_once_with("ratelimit:contact:user:42")
+        await rl(request=_make_request(), redis=redis, client_id=None)
+        await rl(request=_make_request(), redis=redis, client_id=None)
+        with pytest.raises(TooManyRequestsError) as excinfo:
+            await rl(request=_make_request(), redis=redis, client_id=None)
+        assert excinfo.value.headers == {"Retry-After": "30"}
+        assert redis.register_script.return_value.await_count == 2
 
-    async def test_auth_over_limit_raises_429(self):
-        redis = AsyncMock()
-        redis.incr = AsyncMock(return_value=11)
+    async def test_zero_limit_rejects_without_redis(self):
+        redis = _make_redis(allowed=True)
         rl = RateLimiter(
             key_prefix="contact",
-            anon_limit=5,
+            anon_limit=0,
             auth_limit=10,
             window=timedelta(seconds=60),
         )
         with pytest.raises(TooManyRequestsError):
-            await rl(request=_make_request(), redis=redis, client_id=42)
+            await rl(request=_make_request(), redis=redis, client_id=None)
+        redis.register_script.assert_not_called()
 
     async def test_anon_and_auth_keys_are_isolated(self):
         """Same IP, different user_id, must not share counters."""
-        redis = AsyncMock()
-        redis.incr = AsyncMock(return_value=1)
-        redis.expire = AsyncMock()
+        redis = _make_redis(allowed=True)
         rl = RateLimiter(
             key_prefix="contact",
-            anon_limit=5,
-            auth_limit=10,
+            anon_limit=1,
+            auth_limit=1,
             window=timedelta(seconds=60),
         )
         await rl(request=_make_request("1.1.1.1"), redis=redis, client_id=None)
         await rl(request=_make_request("1.1.1.1"), redis=redis, client_id=7)
-        keys = [c.args[0] for c in redis.incr.await_args_list]
+        script = redis.register_script.return_value
+        keys = [c.kwargs["keys"][0] for c in script.await_args_list]
         assert keys == ["ratelimit:contact:ip:1.1.1.1", "ratelimit:contact:user:7"]
 
 
+class TestLocalTokenBuckets:
+    def test_allows_up_to_capacity(self):
+        buckets = LocalTokenBuckets(capacity=3, period=timedelta(seconds=30))
+        assert [buckets.consume("a", now=0) for _ in range(3)] == [0, 0, 0]
+        assert buckets.consume("a", now=0) == pytest.approx(10)
+
+    def test_refills_over_period(self):
+        buckets = LocalTokenBuckets(capacity=3, period=timedelta(seconds=30))
+        for _ in range(3):
+            buckets.consume("a", now=0)
+        assert buckets.consume("a", now=10) == 0
+        assert buckets.consume("a", now=10) > 0
+
+    def test_never_rejects_within_limit(self):
+        """Evenly spaced requests at the limit rate are always allowed."""
+        buckets = LocalTokenBuckets(capacity=5, period=timedelta(seconds=60))
+        assert all(buckets.consume("a", now=i * 12) == 0 for i in range(100))
+
+    def test_keys_are_isolated(self):
+        buckets = LocalTokenBuckets(capacity=1, period=timedelta(seconds=60))
+        assert buckets.consume("a", now=0) == 0
+        assert buckets.consume("b", now=0) == 0
+        assert buckets.consume("a", now=0) > 0
+
+    def test_least_recently_used_keys_are_evicted(self):
+        buckets = LocalTokenBuckets(
+            capacity=1, period=timedelta(seconds=60), max_keys=2
+        )
+        buckets.consume("a", now=0)
+        buckets.consume("b", now=0)
+        buckets.consume("c", now=0)
+        assert len(buckets) == 2
+        # "a" was evicted, hence has a full bucket again
+        assert buckets.consume("a", now=0) == 0
+
+
+@pytest.fixture
+async def redis_client():
+    client = Redis(host="localhost", port=6379, db=14)
+    await client.flushdb()
+    yield client
+    await client.flushdb()
+    await client.aclose()
+
+
+class TestRateLimiterRedis:
+    """Run the sliding window script against a real Redis."""
+
+    async def test_sliding_window(
+        self,
+        redis_client: Redis,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        rl = RateLimiter(
+            key_prefix="test",
+            anon_limit=2,
+            auth_limit=2,
+            window=timedelta(milliseconds=500),
+        )
+        # bypass the local buckets to exercise the script
+        monkeypatch.setattr(
+            rl._anon_buckets,
+            "consume",
+            lambda key, *, now=None: 0,
+        )
+
+        await rl(request=_make_request(), redis=redis_client, client_id=None)
+        await rl(request=_make_request(), redis=redis_client, client_id=None)
+        with pytest.raises(TooManyRequestsError) as excinfo:
+            await rl(request=_make_request(), redis=redis_client, client_id=None)
+        assert excinfo.value.headers == {"Retry-After": "1"}
+
+        await asyncio.sleep(0.6)
+        await rl(request=_make_request(), redis=redis_client, client_id=None)
+        assert await redis_client.zcard("ratelimit:test:ip:1.2.3.4") == 1
+        assert 0 < await redis_client.pttl("ratelimit:test:ip:1.2.3.4") <= 500
+
+
 class TestMakeRateLimitDep:
     def test_factory_returns_awaitable_dep(self):
         from inspect import iscoroutinefunction
@@ -132,7 +234,7 @@ class TestMakeRateLimitDep:
 
     async def test_factory_caches_limiter_on_app_state(self):
         from datetime import timedelta
-        from unittest.mock import AsyncMock, MagicMock
+        from unittest.mock import MagicMock
 
         from babytroc.infrastructure.config import RateLimitConfig
         from babytroc.shared.rate_limit import make_rate_limit_dep
@@ -161,9 +263,7 @@ class TestMakeRateLimitDep:
             "app": app,
         }
         request = Request(scope=scope)
-        redis = AsyncMock()
-        redis.incr = AsyncMock(return_value=1)
-        redis.expire = AsyncMock()
+        redis = _make_redis(allowed=True)
 
         dep = make_rate_limit_dep(
             key_prefix="signup",
@@ -175,5 +275,6 @@ class TestMakeRateLimitDep:
 
         # Second call reuses the cached limiter (no exception)
         await dep(request=request, redis=redis, client_id=None)
-        # Both calls should have incremented redis (2 total calls to incr)
-        assert redis.incr.await_count == 2
+        # Both calls should have run the script (registered once)
+        redis.register_script.assert_called_once()
+        assert redis.register_script.return_value.await_count == 2
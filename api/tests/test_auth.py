@@ -7,23 +7,40 @@ import jwt
 import pytest
 from fastapi import status
 from httpx_ws import aconnect_ws
+from sqlalchemy import insert
 
+from babytroc.domains.auth.models import (
+    AuthAccountPasswordResetAuthorization,
+    AuthRefreshToken,
+)
 from babytroc.domains.auth.schemas.availability import AuthAccountAvailability
 from babytroc.domains.auth.services.refresh_token import (
+    create_refresh_token,
     list_account_password_reset_authorizations,
+    list_refresh_tokens,
+    purge_expired_refresh_tokens,
+)
+from babytroc.domains.auth.services.refresh_token_store import (
+    read_stored_refresh_token,
+)
+from babytroc.domains.auth.services.reset import (
+    purge_expired_account_password_reset_authorizations,
 )
 from babytroc.domains.chat.schemas.websocket import (
     WebsocketMessageUpdatedAccountValidation,
 )
 from babytroc.domains.user.services import get_user_validation_code_by_email
+from babytroc.infrastructure.database import run_after_commit_callbacks
 from tests.fixtures.clients import create_client
 from tests.fixtures.websockets import WebSocketRecorder
 
 if TYPE_CHECKING:
+    from fastapi import FastAPI
     from httpx import AsyncClient
     from httpx_ws import AsyncWebSocketSession
     from sqlalchemy.ext.asyncio import async_sessionmaker
 
+    from babytroc.domains.user.schemas.private import UserPrivateRead
     from tests.fixtures.users import UserData
 
 
@@ -338,6 +355,54 @@ class TestAuthPasswordReset:
             )
         ).raise_for_status()
 
+    async def test_purge_expired_password_reset_authorizations(
+        self,
+        database_sessionmaker: async_sessionmaker,
+        app_config,
+        alice: UserPrivateRead,
+    ):
+        """Expired or invalidated authorizations should be deleted."""
+
+        expired_date = (
+            datetime.now(UTC)
+            - app_config.auth.account_password_reset_authorization_duration
+            - timedelta(minutes=1)
+        )
+
+        async with database_sessionmaker.begin() as db:
+            await db.execute(
+                insert(AuthAccountPasswordResetAuthorization).values(
+                    user_id=alice.id,
+                    creation_date=expired_date,
+                )
+            )
+            await db.execute(
+                insert(AuthAccountPasswordResetAuthorization).values(
+                    user_id=alice.id,
+                    invalidated=True,
+                )
+            )
+            await db.execute(
+                insert(AuthAccountPasswordResetAuthorization).values(
+                    user_id=alice.id,
+                )
+            )
+
+        async with database_sessionmaker.begin() as db:
+            purged = await purge_expired_account_password_reset_authorizations(
+                db,
+                config=app_config.auth,
+            )
+            authorizations = await list_account_password_reset_authorizations(db)
+
+        assert purged >= 2
+        assert authorizations
+        assert not any(authorization.invalidated for authorization in authorizations)
+        assert all(
+            authorization.creation_date > expired_date
+            for authorization in authorizations
+        )
+
     async def test_password_reset_wrong_email(
         self,
         client: AsyncClient,
@@ -441,3 +506,106 @@ class TestAuthTokenEdgeCases:
             headers={"Authorization": f"Bearer {bad_token}"},
         )
         assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.usefixtures("alice")
+class TestAuthRefreshToken:
+    """Test refresh token verification, revocation and purge."""
+
+    async def test_refresh_without_redis_record(
+        self,
+        app: FastAPI,
+        alice_client: AsyncClient,
+    ):
+        """Refresh token unknown to Redis should be verified from the database."""
+
+        await app.state.redis.flushdb()
+
+        resp = await alice_client.post("/api/v1/auth/refresh")
+        resp.raise_for_status()
+
+    async def test_refresh_token_recorded_after_commit(
+        self,
+        app: FastAPI,
+        database_sessionmaker: async_sessionmaker,
+        app_config,
+        alice: UserPrivateRead,
+    ):
+        """Refresh token should be recorded in Redis only once committed."""
+
+        redis = app.state.redis
+
+        async with database_sessionmaker.begin() as db:
+            token = await create_refresh_token(
+                db, redis, alice.id, config=app_config.auth
+            )
+            record, _ = await read_stored_refresh_token(redis, token)
+            assert record is None
+        await run_after_commit_callbacks(db)
+
+        record, _ = await read_stored_refresh_token(redis, token)
+        assert record is not None
+        assert record.user_id == alice.id
+
+    async def test_refresh_revoked_token(
+        self,
+        app: FastAPI,
+        alice_client: AsyncClient,
+    ):
+        """Refresh token revoked by logout should return 401."""
+
+        refresh_token = alice_client.cookies["refresh_token"].strip('"')
+
+        (await alice_client.post("/api/v1/auth/logout")).raise_for_status()
+
+        resp = await alice_client.post(
+            "/api/v1/auth/refresh",
+            headers={"refresh_token": refresh_token},
+        )
+        assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+        # still revoked in the database
+        await app.state.redis.flushdb()
+
+        resp = await alice_client.post(
+            "/api/v1/auth/refresh",
+            headers={"refresh_token": refresh_token},
+        )
+        assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_purge_expired_refresh_tokens(
+        self,
+        database_sessionmaker: async_sessionmaker,
+        app_config,
+        alice: UserPrivateRead,
+    ):
+        """Expired refresh tokens should be deleted, valid ones kept."""
+
+        expired_date = (
+            datetime.now(UTC)
+            - app_config.auth.refresh_token_duration
+            - timedelta(minutes=1)
+        )
+
+        async with database_sessionmaker.begin() as db:
+            await db.execute(
+                insert(AuthRefreshToken).values(
+                    token="expired-token",
+                    user_id=alice.id,
+                    creation_date=expired_date,
+                )
+            )
+            await db.execute(
+                insert(AuthRefreshToken).values(
+                    token="valid-token",
+                    user_id=alice.id,
+                )
+            )
+
+        async with database_sessionmaker.begin() as db:
+            purged = await purge_expired_refresh_tokens(db, config=app_config.auth)
+            tokens = {token.token for token in await list_refresh_tokens(db)}
+
+        assert purged >= 1
+        assert "expired-token" not in tokens
+        assert "valid-token" in tokens
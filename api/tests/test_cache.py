@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from redis.asyncio import Redis
 
@@ -51,6 +53,31 @@ class TestCache:
         assert await cache.get("babytroc:test:pattern:2") is None
         assert await cache.get("babytroc:test:other") == "c"
 
+    async def test_invalidate_tags(self, cache):
+        await cache.set("babytroc:test:tagged:1", "a", ttl=60, tags=["t1"])
+        await cache.set("babytroc:test:tagged:2", "b", ttl=60, tags=["t1", "t2"])
+        await cache.set("babytroc:test:tagged:3", "c", ttl=60, tags=["t2"])
+        await cache.set("babytroc:test:untagged", "d", ttl=60)
+        await cache.invalidate_tags("t1")
+        assert await cache.get("babytroc:test:tagged:1") is None
+        assert await cache.get("babytroc:test:tagged:2") is None
+        assert await cache.get("babytroc:test:tagged:3") == "c"
+        assert await cache.get("babytroc:test:untagged") == "d"
+
+    async def test_invalidate_tags_resets_tag(self, cache):
+        await cache.set("babytroc:test:tagged:1", "a", ttl=60, tags=["t1"])
+        await cache.invalidate_tags("t1")
+        await cache.set("babytroc:test:tagged:2", "b", ttl=60, tags=["t1"])
+        await cache.set("babytroc:test:tagged:1", "a", ttl=60)
+        await cache.invalidate_tags("t1")
+        assert await cache.get("babytroc:test:tagged:1") == "a"
+        assert await cache.get("babytroc:test:tagged:2") is None
+
+    async def test_tag_outlives_members(self, cache, redis_client):
+        await cache.set("babytroc:test:tagged:1", "a", ttl=600, tags=["t1"])
+        await cache.set("babytroc:test:tagged:2", "b", ttl=60, tags=["t1"])
+        assert await redis_client.ttl("babytroc:tag:t1") > 60
+
     async def test_get_or_set_miss(self, cache):
         async def factory():
             return '{"computed": true}'
@@ -70,3 +97,112 @@ class TestCache:
 
         result = await cache.get_or_set("babytroc:test:cached", ttl=60, factory=factory)
         assert result == '{"cached": true}'
+
+    async def test_get_or_set_coalesces_concurrent_misses(self, cache):
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "computed"
+
+        results = await asyncio.gather(
+            *(
+                cache.get_or_set("babytroc:test:stampede", ttl=60, factory=factory)
+                for _ in range(10)
+            )
+        )
+        assert results == ["computed"] * 10
+        assert calls == 1
+
+    async def test_get_or_set_waiter_takes_over_cancelled_computation(self, cache):
+        started = asyncio.Event()
+        first_factory_cancelled = False
+
+        async def first_factory():
+            nonlocal first_factory_cancelled
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                first_factory_cancelled = True
+                raise
+            return "first"
+
+        async def second_factory():
+            return "second"
+
+        first = asyncio.create_task(
+            cache.get_or_set("babytroc:test:cancel", ttl=60, factory=first_factory)
+        )
+        await started.wait()
+        second = asyncio.create_task(
+            cache.get_or_set("babytroc:test:cancel", ttl=60, factory=second_factory)
+        )
+        await asyncio.sleep(0.05)
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        assert await second == "second"
+        assert first_factory_cancelled
+        assert await cache.get("babytroc:test:cancel") == "second"
+
+    async def test_get_or_set_waits_for_lock_holder(self, redis_client):
+        worker_1 = RedisCache(redis_client)
+        worker_2 = RedisCache(redis_client)
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.1)
+            return "computed"
+
+        results = await asyncio.gather(
+            worker_1.get_or_set("babytroc:test:lock", ttl=60, factory=factory),
+            worker_2.get_or_set("babytroc:test:lock", ttl=60, factory=factory),
+        )
+        assert results == ["computed", "computed"]
+        assert calls == 1
+
+    async def test_get_or_set_serves_stale_value_while_refreshing(
+        self,
+        redis_client,
+        cache,
+    ):
+        await cache.set("babytroc:test:stale", "old", ttl=5)
+        await redis_client.set("babytroc:lock:babytroc:test:stale", "other", px=5000)
+
+        async def factory():
+            msg = "should not be called"
+            raise AssertionError(msg)
+
+        result = await cache.get_or_set("babytroc:test:stale", ttl=60, factory=factory)
+        assert result == "old"
+
+    async def test_get_or_set_refreshes_stale_value(self, cache):
+        await cache.set("babytroc:test:stale", "old", ttl=5)
+
+        async def factory():
+            return "new"
+
+        result = await cache.get_or_set("babytroc:test:stale", ttl=60, factory=factory)
+        assert result == "new"
+        assert await cache.get("babytroc:test:stale") == "new"
+
+    async def test_get_or_set_does_not_cache_errors(self, cache):
+        async def failing():
+            msg = "boom"
+            raise RuntimeError(msg)
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_set("babytroc:test:error", ttl=60, factory=failing)
+
+        async def factory():
+            return "computed"
+
+        result = await cache.get_or_set("babytroc:test:error", ttl=60, factory=factory)
+        assert result == "computed"
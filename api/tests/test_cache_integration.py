@@ -2,12 +2,21 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from babytroc.infrastructure.cache_keys import key_categories, key_regions, key_user
+import pytest
+
+from babytroc.infrastructure.cache_keys import (
+    ITEMS_LIST_MAX_CACHED_PAGES,
+    key_categories,
+    key_regions,
+    key_user,
+)
+from babytroc.shared.pagination_utils import iter_paginated_endpoint
 
 if TYPE_CHECKING:
     from fastapi import FastAPI
     from httpx import AsyncClient
 
+    from babytroc.domains.item.schemas.read import ItemRead
     from babytroc.domains.user.schemas.private import UserPrivateRead
     from babytroc.infrastructure.cache_client import Cache
 
@@ -98,6 +107,108 @@ class TestCacheIntegrationUsers:
         assert cached is not None
 
 
+class TestCacheIntegrationItemsListFlags:
+    """Test that client flags are overlaid on the shared cached items list."""
+
+    async def test_items_list_flags_overlaid(
+        self,
+        client: AsyncClient,
+        alice_client: AsyncClient,
+        bob_client: AsyncClient,
+        alice_items: list[ItemRead],
+    ):
+        item = alice_items[-1]
+
+        # populate the cache anonymously
+        resp = await client.get("/api/v1/items")
+        resp.raise_for_status()
+        assert all(i["liked"] is None for i in resp.json())
+
+        resp = await bob_client.post(f"/api/v1/me/liked/{item.id}")
+        resp.raise_for_status()
+        resp = await bob_client.post(f"/api/v1/me/saved/{item.id}")
+        resp.raise_for_status()
+
+        resp = await bob_client.get("/api/v1/items")
+        resp.raise_for_status()
+        previews = {i["id"]: i for i in resp.json()}
+        assert previews[item.id]["liked"] is True
+        assert previews[item.id]["saved"] is True
+        assert previews[item.id]["owned"] is False
+
+        resp = await alice_client.get("/api/v1/items")
+        resp.raise_for_status()
+        previews = {i["id"]: i for i in resp.json()}
+        assert previews[item.id]["liked"] is False
+        assert previews[item.id]["owned"] is True
+
+        # the shared page stays anonymous
+        resp = await client.get("/api/v1/items")
+        resp.raise_for_status()
+        assert all(i["owned"] is None for i in resp.json())
+
+
+@pytest.mark.db_template("many_items")
+@pytest.mark.usefixtures("many_items")
+class TestCacheIntegrationItemsListPages:
+    """Test that pages past the first one are cached, up to a bound."""
+
+    async def test_items_list_pages_cached(
+        self,
+        client: AsyncClient,
+        app: FastAPI,
+    ):
+        params = {"n": 2}
+
+        pages = [
+            [item["id"] for item in items]
+            async for items in iter_paginated_endpoint(
+                client=client,
+                url="/api/v1/items",
+                params=params,
+            )
+        ]
+        assert len(pages) > ITEMS_LIST_MAX_CACHED_PAGES + 1, "poor data for testing"
+
+        page_keys = [
+            key
+            async for key in app.state.redis.scan_iter(match="babytroc:items:list:*")
+            if b":page:" in key
+        ]
+        assert len(page_keys) == ITEMS_LIST_MAX_CACHED_PAGES
+
+        # same pages when served from the cache
+        assert pages == [
+            [item["id"] for item in items]
+            async for items in iter_paginated_endpoint(
+                client=client,
+                url="/api/v1/items",
+                params=params,
+            )
+        ]
+
+    async def test_items_list_pages_not_cached_for_unissued_cursor(
+        self,
+        client: AsyncClient,
+        app: FastAPI,
+    ):
+        resp = await client.get("/api/v1/items", params={"n": 2})
+        resp.raise_for_status()
+        first_id = resp.json()[0]["id"]
+
+        # a cursor no cached page issued does not take a page slot
+        resp = await client.get("/api/v1/items", params={"n": 2, "cid": first_id})
+        resp.raise_for_status()
+        assert resp.json()
+
+        page_keys = [
+            key
+            async for key in app.state.redis.scan_iter(match="babytroc:items:list:*")
+            if b":page:" in key
+        ]
+        assert page_keys == []
+
+
 class TestCacheIntegrationItemsInvalidation:
     """Test item cache invalidation via cache pattern operations."""
 
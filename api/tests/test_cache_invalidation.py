@@ -1,12 +1,21 @@
 import pytest
 from redis.asyncio import Redis
 
+import babytroc.domains.item.handlers  # registers the cache invalidation handlers
+import babytroc.infrastructure.cache
+from babytroc.domains.item.events import ItemCreated
 from babytroc.domains.item.services.cache import (
-    invalidate_item_created,
     invalidate_item_deleted,
     invalidate_item_updated,
+    invalidate_items_list,
+    invalidate_owner_item_created,
 )
 from babytroc.infrastructure.cache_client import RedisCache
+from babytroc.infrastructure.cache_keys import (
+    key_items_list,
+    namespace_items_list,
+)
+from babytroc.infrastructure.events import batch_events, emit
 
 
 @pytest.fixture
@@ -24,40 +33,90 @@ def cache(redis_client):
     return RedisCache(redis_client)
 
 
+async def items_list_key(cache: RedisCache) -> str:
+    generation = await cache.get_generation(namespace_items_list())
+    return key_items_list(generation, words=("stroller",))
+
+
+class TestGenerationInvalidation:
+    async def test_generation_defaults_to_zero(self, cache):
+        assert await cache.get_generation(namespace_items_list()) == 0
+
+    async def test_bump_generation(self, cache):
+        key = await items_list_key(cache)
+        await cache.set(key, "data", ttl=60)
+
+        await cache.bump_generation(namespace_items_list())
+
+        assert await cache.get_generation(namespace_items_list()) == 1
+        assert await items_list_key(cache) != key
+        assert await cache.get(await items_list_key(cache)) is None
+
+
 class TestItemInvalidation:
     async def test_invalidate_item_created(self, cache):
-        await cache.set("babytroc:items:list:abc123", "data", ttl=60)
-        await cache.set("babytroc:user:1:items:def456", "data", ttl=60)
+        await cache.set(await items_list_key(cache), "data", ttl=60)
         await cache.set("babytroc:user:1", '{"stars": 0}', ttl=60)
 
-        await invalidate_item_created(cache, owner_id=1)
+        await invalidate_items_list(cache)
+        await invalidate_owner_item_created(cache, owner_id=1)
 
-        assert await cache.get("babytroc:items:list:abc123") is None
-        assert await cache.get("babytroc:user:1:items:def456") is None
+        assert await cache.get(await items_list_key(cache)) is None
         assert await cache.get("babytroc:user:1") is None
 
     async def test_invalidate_item_updated(self, cache):
         await cache.set("babytroc:item:42", "data", ttl=60)
-        await cache.set("babytroc:items:list:abc123", "data", ttl=60)
-        await cache.set("babytroc:user:1:items:def456", "data", ttl=60)
+        await cache.set(await items_list_key(cache), "data", ttl=60)
 
         await invalidate_item_updated(cache, item_id=42, owner_id=1)
 
         assert await cache.get("babytroc:item:42") is None
-        assert await cache.get("babytroc:items:list:abc123") is None
-        assert await cache.get("babytroc:user:1:items:def456") is None
+        assert await cache.get(await items_list_key(cache)) is None
 
     async def test_invalidate_item_deleted(self, cache):
         await cache.set("babytroc:item:42", "data", ttl=60)
-        await cache.set("babytroc:items:list:abc123", "data", ttl=60)
-        await cache.set("babytroc:user:1:items:def456", "data", ttl=60)
-        await cache.set("babytroc:user:1:loans:ghi789", "data", ttl=60)
+        await cache.set(await items_list_key(cache), "data", ttl=60)
         await cache.set("babytroc:user:1:chats", "data", ttl=60)
+        await cache.set("babytroc:user:1", "data", ttl=60)
 
         await invalidate_item_deleted(cache, item_id=42, owner_id=1)
 
         assert await cache.get("babytroc:item:42") is None
-        assert await cache.get("babytroc:items:list:abc123") is None
-        assert await cache.get("babytroc:user:1:items:def456") is None
-        assert await cache.get("babytroc:user:1:loans:ghi789") is None
+        assert await cache.get(await items_list_key(cache)) is None
         assert await cache.get("babytroc:user:1:chats") is None
+        assert await cache.get("babytroc:user:1") is None
+
+
+class TestBatchedInvalidation:
+    @pytest.fixture(autouse=True)
+    def _use_cache(self, cache, monkeypatch):
+        monkeypatch.setattr(
+            babytroc.infrastructure.cache, "_cache", cache, raising=False
+        )
+
+    async def test_items_list_invalidated_once_per_batch(self, cache):
+        async with batch_events():
+            for item_id, owner_id in [(1, 1), (2, 1), (3, 2)]:
+                await emit(None, ItemCreated(item_id=item_id, owner_id=owner_id))
+
+            # invalidated when leaving the scope
+            assert await cache.get_generation(namespace_items_list()) == 0
+
+        assert await cache.get_generation(namespace_items_list()) == 1
+
+    async def test_each_owner_invalidated(self, cache):
+        await cache.set("babytroc:user:1", '{"stars": 0}', ttl=60)
+        await cache.set("babytroc:user:2", '{"stars": 0}', ttl=60)
+
+        async with batch_events():
+            await emit(None, ItemCreated(item_id=1, owner_id=1))
+            await emit(None, ItemCreated(item_id=2, owner_id=2))
+
+        assert await cache.get("babytroc:user:1") is None
+        assert await cache.get("babytroc:user:2") is None
+
+    async def test_unbatched_events_invalidate_each(self, cache):
+        await emit(None, ItemCreated(item_id=1, owner_id=1))
+        await emit(None, ItemCreated(item_id=2, owner_id=1))
+
+        assert await cache.get_generation(namespace_items_list()) == 2
@@ -1,4 +1,9 @@
-from babytroc.infrastructure.cache_keys import cache_key_hash
+from babytroc.infrastructure.cache_keys import (
+    cache_key_hash,
+    key_items_list,
+    key_items_list_page,
+    key_items_list_page_depth,
+)
 
 
 class TestCacheKeyHash:
@@ -25,3 +30,19 @@ class TestCacheKeyHash:
     def test_length(self):
         h = cache_key_hash(a=1)
         assert len(h) == 16
+
+
+class TestItemsListKeys:
+    def test_pages_differ_by_cursor(self):
+        k1 = key_items_list_page(0, {"cid": 10}, limit=32)
+        k2 = key_items_list_page(0, {"cid": 20}, limit=32)
+        k3 = key_items_list_page(0, {"cid": 10, "cwm": 50}, limit=32)
+        assert len({k1, k2, k3}) == 3
+
+    def test_pages_share_query_prefix(self):
+        first = key_items_list(3, limit=32)
+        page = key_items_list_page(3, {"cid": 10}, limit=32)
+        depth = key_items_list_page_depth(3, {"cid": 10}, limit=32)
+        assert page.startswith(f"{first}:")
+        assert depth.startswith(f"{first}:")
+        assert depth != page
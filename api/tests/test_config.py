@@ -7,8 +7,11 @@ from babytroc.infrastructure.config import (
     CapConfig,
     Config,
     ContactConfig,
+    EventsConfig,
+    MaintenanceConfig,
     MissingEnvironmentVariableError,
     RateLimitConfig,
+    WebSocketConfig,
 )
 
 
@@ -55,6 +58,24 @@ class TestCapConfig:
         assert cfg.api_url == "https://cap.example.com"
         assert cfg.site_key == "site-123"
         assert cfg.secret_key == "secret-xyz"
+        assert cfg.max_concurrency == 20
+        assert cfg.timeout == 5.0
+        assert cfg.result_cache_ttl == timedelta(seconds=30)
+
+    def test_from_env_reads_client_settings(self):
+        env = {
+            "CAP_API_URL": "https://cap.example.com",
+            "CAP_SITE_KEY": "site-123",
+            "CAP_SECRET_KEY": "secret-xyz",
+            "CAP_MAX_CONCURRENCY": "4",
+            "CAP_TIMEOUT_SECONDS": "2.5",
+            "CAP_RESULT_CACHE_TTL_SECONDS": "0",
+        }
+        with patch.dict("os.environ", env, clear=True):
+            cfg = CapConfig.from_env()
+        assert cfg.max_concurrency == 4
+        assert cfg.timeout == 2.5
+        assert cfg.result_cache_ttl == timedelta(0)
 
     def test_from_env_requires_all_vars(self):
         with (
@@ -141,3 +162,63 @@ class TestConfigRateLimits:
         assert cfg.item_create.auth == 30
         assert cfg.image_upload.anon == 60
         assert cfg.image_upload.auth == 60
+
+
+class TestWebSocketConfig:
+    def test_from_env_uses_defaults(self):
+        with patch.dict("os.environ", {}, clear=True):
+            cfg = WebSocketConfig.from_env()
+        assert cfg.queue_size == 64
+        assert cfg.send_timeout == 10
+        assert cfg.event_log_max_length == 256
+        assert cfg.event_log_ttl == 86400
+
+    def test_from_env_reads_env_overrides(self):
+        env = {
+            "WEBSOCKET_QUEUE_SIZE": "8",
+            "WEBSOCKET_SEND_TIMEOUT_SECONDS": "2.5",
+            "WEBSOCKET_EVENT_LOG_MAX_LENGTH": "16",
+            "WEBSOCKET_EVENT_LOG_TTL_SECONDS": "60",
+        }
+        with patch.dict("os.environ", env, clear=True):
+            cfg = WebSocketConfig.from_env()
+        assert cfg.queue_size == 8
+        assert cfg.send_timeout == 2.5
+        assert cfg.event_log_max_length == 16
+        assert cfg.event_log_ttl == 60
+
+
+class TestEventsConfig:
+    def test_from_env_uses_defaults(self):
+        with patch.dict("os.environ", {}, clear=True):
+            cfg = EventsConfig.from_env()
+        assert cfg.handler_concurrency == 16
+        assert cfg.handler_max_attempts == 3
+        assert cfg.handler_retry_delay == 0.5
+        assert cfg.outbox_relay_interval == 0
+
+    def test_from_env_reads_env_overrides(self):
+        env = {
+            "EVENTS_HANDLER_CONCURRENCY": "4",
+            "EVENTS_HANDLER_MAX_ATTEMPTS": "5",
+            "EVENTS_HANDLER_RETRY_DELAY_SECONDS": "0.1",
+            "EVENTS_OUTBOX_RELAY_INTERVAL_SECONDS": "30",
+        }
+        with patch.dict("os.environ", env, clear=True):
+            cfg = EventsConfig.from_env()
+        assert cfg.handler_concurrency == 4
+        assert cfg.handler_max_attempts == 5
+        assert cfg.handler_retry_delay == 0.1
+        assert cfg.outbox_relay_interval == 30
+
+
+class TestMaintenanceConfig:
+    def test_from_env_uses_defaults(self):
+        with patch.dict("os.environ", {}, clear=True):
+            cfg = MaintenanceConfig.from_env()
+        assert cfg.tick == 30
+
+    def test_from_env_reads_env_overrides(self):
+        with patch.dict("os.environ", {"MAINTENANCE_TICK_SECONDS": "0"}, clear=True):
+            cfg = MaintenanceConfig.from_env()
+        assert cfg.tick == 0
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 import pytest
 
 from babytroc.infrastructure.config import Config, ImageConfig
@@ -6,6 +8,9 @@ IMAGE_ENV_VARS = (
     "IMAGE_MAX_UPLOAD_BYTES",
     "IMAGE_MAX_PIXELS",
     "IMAGE_MAX_CONCURRENT_PROCESSING_PER_WORKER",
+    "IMAGE_MAX_QUEUED_PROCESSING_PER_WORKER",
+    "IMAGE_ORPHAN_GRACE_PERIOD_HOURS",
+    "IMAGE_GC_INTERVAL_MINUTES",
 )
 
 
@@ -22,6 +27,9 @@ def test_image_config_defaults():
     assert config.max_upload_bytes == 5 * 1024 * 1024
     assert config.max_pixels == 16_000_000
     assert config.max_concurrent_processing_per_worker == 4
+    assert config.max_queued_processing_per_worker == 8
+    assert config.orphan_grace_period == timedelta(hours=24)
+    assert config.gc_interval == timedelta(hours=1)
 
 
 @pytest.mark.usefixtures("_clear_image_env")
@@ -29,12 +37,18 @@ def test_image_config_env_overrides(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setenv("IMAGE_MAX_UPLOAD_BYTES", "10485760")
     monkeypatch.setenv("IMAGE_MAX_PIXELS", "8000000")
     monkeypatch.setenv("IMAGE_MAX_CONCURRENT_PROCESSING_PER_WORKER", "8")
+    monkeypatch.setenv("IMAGE_MAX_QUEUED_PROCESSING_PER_WORKER", "16")
+    monkeypatch.setenv("IMAGE_ORPHAN_GRACE_PERIOD_HOURS", "2")
+    monkeypatch.setenv("IMAGE_GC_INTERVAL_MINUTES", "0")
 
     config = ImageConfig.from_env(test=False)
 
     assert config.max_upload_bytes == 10_485_760
     assert config.max_pixels == 8_000_000
     assert config.max_concurrent_processing_per_worker == 8
+    assert config.max_queued_processing_per_worker == 16
+    assert config.orphan_grace_period == timedelta(hours=2)
+    assert not config.gc_interval
 
 
 @pytest.mark.usefixtures("_clear_image_env")
@@ -1,26 +1,85 @@
 import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import PIL.Image
+import pytest
 
 from babytroc.infrastructure.image_processing import (
-    get_image_processing_semaphore,
-    init_image_processing_dependency,
+    ImageEngine,
+    ImageEngineSaturatedError,
+    create_image_engine,
+    get_image_engine,
+    init_image_engine_dependency,
 )
+from babytroc.shared.image import generate_webp_variants
+
+
+def _png() -> BytesIO:
+    fp = BytesIO()
+    PIL.Image.new("RGB", (300, 200), color="red").save(fp, format="PNG")
+    fp.seek(0)
+    return fp
+
+
+def test_init_and_get_returns_same_engine():
+    engine = ImageEngine(ThreadPoolExecutor(max_workers=1), max_pending=1)
+    init_image_engine_dependency(engine)
+    assert get_image_engine() is engine
+
+
+async def test_run_returns_result():
+    engine = ImageEngine(ThreadPoolExecutor(max_workers=1), max_pending=1)
+    try:
+        assert await engine.run(max, 1, 3) == 3
+        assert len(engine) == 0
+    finally:
+        engine.shutdown()
+
+
+async def test_run_rejects_when_saturated():
+    engine = ImageEngine(ThreadPoolExecutor(max_workers=1), max_pending=2)
+    try:
+        running = [asyncio.create_task(engine.run(time.sleep, 0.2)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert len(engine) == 2
+
+        t0 = time.monotonic()
+        with pytest.raises(ImageEngineSaturatedError):
+            await engine.run(time.sleep, 0.2)
+        # rejected without waiting for a free slot
+        assert time.monotonic() - t0 < 0.1
+
+        await asyncio.gather(*running)
+        assert len(engine) == 0
+    finally:
+        engine.shutdown()
+
 
+async def test_run_propagates_exception():
+    engine = ImageEngine(ThreadPoolExecutor(max_workers=1), max_pending=1)
+    try:
+        with pytest.raises(PIL.UnidentifiedImageError):
+            await engine.run(generate_webp_variants, BytesIO(b"not an image"))
+    finally:
+        engine.shutdown()
 
-def test_init_and_get_returns_same_semaphore():
-    sem = asyncio.Semaphore(3)
-    init_image_processing_dependency(sem)
-    assert get_image_processing_semaphore() is sem
 
+async def test_process_engine_generates_variants():
+    engine = create_image_engine(processes=1, queue_size=0, max_pixels=1_000_000)
+    try:
+        variants = await engine.run(generate_webp_variants, _png())
+    finally:
+        engine.shutdown()
 
-def test_init_overwrites_previous_semaphore():
-    init_image_processing_dependency(asyncio.Semaphore(1))
-    new_sem = asyncio.Semaphore(5)
-    init_image_processing_dependency(new_sem)
-    assert get_image_processing_semaphore() is new_sem
+    assert set(variants) == {128, 256, 512, 1024}
 
 
-async def test_semaphore_is_usable_as_async_context_manager():
-    init_image_processing_dependency(asyncio.Semaphore(2))
-    sem = get_image_processing_semaphore()
-    async with sem:
-        assert sem._value == 1
+async def test_process_engine_applies_pixel_limit():
+    engine = create_image_engine(processes=1, queue_size=0, max_pixels=1_000)
+    try:
+        with pytest.raises(PIL.Image.DecompressionBombError):
+            await engine.run(generate_webp_variants, _png())
+    finally:
+        engine.shutdown()
@@ -71,3 +71,57 @@ def test_configure_pillow_pixel_limit_sets_pil_global():
         assert PIL.Image.MAX_IMAGE_PIXELS == 12_345
     finally:
         PIL.Image.MAX_IMAGE_PIXELS = original
+
+
+def _jpeg(width: int, height: int, **save_kwargs) -> BytesIO:
+    img = PIL.Image.new("RGB", (width, height), color="orange")
+    fp = BytesIO()
+    img.save(fp, format="JPEG", **save_kwargs)
+    fp.seek(0)
+    return fp
+
+
+def test_draft_size_keeps_largest_dimension():
+    from babytroc.shared.image import draft_size
+
+    assert draft_size(PIL.Image.new("RGB", (4000, 3000)), 1024) == (1024, 768)
+    assert draft_size(PIL.Image.new("RGB", (3000, 4000)), 1024) == (768, 1024)
+
+
+def test_generate_webp_variants_draft_jpeg():
+    fp = _jpeg(4000, 3000)
+
+    variants = generate_webp_variants(fp)
+
+    for size, data in variants.items():
+        result = PIL.Image.open(data)
+        assert max(result.size) == size
+        assert result.size[0] * 3 == pytest.approx(result.size[1] * 4, abs=4)
+
+
+def test_generate_webp_variants_draft_matches_full_decode_size():
+    drafted = generate_webp_variants(_jpeg(4000, 3000), draft=True)
+    decoded = generate_webp_variants(_jpeg(4000, 3000), draft=False)
+
+    for size in drafted:
+        assert (
+            PIL.Image.open(drafted[size]).size == PIL.Image.open(decoded[size]).size
+        )
+
+
+def test_generate_webp_variants_draft_applies_exif_orientation():
+    exif = PIL.Image.Exif()
+    exif[0x0112] = 6  # rotate 90 cw
+    fp = _jpeg(4000, 3000, exif=exif.tobytes())
+
+    variants = generate_webp_variants(fp)
+
+    assert PIL.Image.open(variants[1024]).size == (768, 1024)
+
+
+def test_generate_webp_variants_rejects_truncated_jpeg():
+    data = _jpeg(1000, 800, quality=95).getvalue()
+    fp = BytesIO(data[: len(data) // 2])
+
+    with pytest.raises(OSError):  # noqa: PT011
+        generate_webp_variants(fp)
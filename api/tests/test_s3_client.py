@@ -1,8 +1,13 @@
 from io import BytesIO
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from babytroc.infrastructure.config import S3Config
-from babytroc.infrastructure.storage import delete_image_variants, upload_image_variants
+from babytroc.infrastructure.storage import (
+    S3Client,
+    delete_image_variants,
+    delete_objects,
+    upload_image_variants,
+)
 
 TEST_S3_CONFIG = S3Config(
     endpoint_url="http://minio:9000",
@@ -21,16 +26,12 @@ async def test_upload_image_variants():
         1024: BytesIO(b"webp1024"),
     }
 
+    s3 = S3Client(TEST_S3_CONFIG)
     mock_s3_client = AsyncMock()
 
-    with patch("babytroc.infrastructure.storage._get_s3_client") as mock_get:
-        mock_ctx = AsyncMock()
-        mock_ctx.__aenter__ = AsyncMock(return_value=mock_s3_client)
-        mock_ctx.__aexit__ = AsyncMock(return_value=False)
-        mock_get.return_value = mock_ctx
-
+    with patch.object(s3, "get", AsyncMock(return_value=mock_s3_client)):
         await upload_image_variants(
-            config=TEST_S3_CONFIG,
+            s3=s3,
             name="abc123",
             variants=variants,
         )
@@ -53,16 +54,13 @@ async def test_upload_image_variants():
 
 
 async def test_delete_image_variants():
+    s3 = S3Client(TEST_S3_CONFIG)
     mock_s3_client = AsyncMock()
+    mock_s3_client.delete_objects.return_value = {}
 
-    with patch("babytroc.infrastructure.storage._get_s3_client") as mock_get:
-        mock_ctx = AsyncMock()
-        mock_ctx.__aenter__ = AsyncMock(return_value=mock_s3_client)
-        mock_ctx.__aexit__ = AsyncMock(return_value=False)
-        mock_get.return_value = mock_ctx
-
+    with patch.object(s3, "get", AsyncMock(return_value=mock_s3_client)):
         await delete_image_variants(
-            config=TEST_S3_CONFIG,
+            s3=s3,
             name="abc123",
         )
 
@@ -76,3 +74,51 @@ async def test_delete_image_variants():
         "abc123_512.webp",
         "abc123_1024.webp",
     }
+
+
+async def test_delete_objects_in_batches():
+    s3 = S3Client(TEST_S3_CONFIG)
+    mock_s3_client = AsyncMock()
+    mock_s3_client.delete_objects.side_effect = [
+        {},
+        {"Errors": [{"Key": "key-1500", "Code": "InternalError"}]},
+        {},
+    ]
+    keys = [f"key-{i}" for i in range(2500)]
+
+    with patch.object(s3, "get", AsyncMock(return_value=mock_s3_client)):
+        failed = await delete_objects(s3, keys)
+
+    assert failed == ["key-1500"]
+
+    batches = [
+        [obj["Key"] for obj in call.kwargs["Delete"]["Objects"]]
+        for call in mock_s3_client.delete_objects.call_args_list
+    ]
+    assert [len(batch) for batch in batches] == [1000, 1000, 500]
+    assert [key for batch in batches for key in batch] == keys
+
+
+async def test_s3_client_is_opened_once_and_reused():
+    s3 = S3Client(TEST_S3_CONFIG)
+
+    mock_s3_client = AsyncMock()
+    mock_ctx = MagicMock()
+    mock_ctx.__aenter__ = AsyncMock(return_value=mock_s3_client)
+    mock_ctx.__aexit__ = AsyncMock(return_value=False)
+
+    with patch.object(s3._session, "client", return_value=mock_ctx) as mock_open:
+        assert await s3.get() is mock_s3_client
+        assert await s3.get() is mock_s3_client
+        assert mock_open.call_count == 1
+
+        pool_config = mock_open.call_args.kwargs["config"]
+        assert pool_config.max_pool_connections == TEST_S3_CONFIG.max_pool_connections
+
+        await s3.close()
+        mock_ctx.__aexit__.assert_awaited_once()
+
+        # reopened on next use
+        await s3.get()
+        assert mock_open.call_count == 2
+        await s3.close()
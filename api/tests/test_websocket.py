@@ -4,12 +4,16 @@ from fastapi import FastAPI
 from httpx import AsyncClient
 from httpx_ws import AsyncWebSocketSession, WebSocketUpgradeError, aconnect_ws
 
+from babytroc.domains.chat.schemas.pubsub import PubsubMessageNewChatMessage
+from babytroc.domains.chat.schemas.read import ChatMessageRead
 from babytroc.domains.chat.schemas.websocket import (
+    WebSocketMessageEventsLost,
     WebSocketMessageNewChatMessage,
     WebSocketMessageUpdatedChatMessage,
 )
 from babytroc.domains.loan.schemas.read import LoanRequestRead
 from babytroc.domains.user.schemas.private import UserPrivateRead
+from babytroc.infrastructure.pubsub import get_broadcast, notify_user
 from tests.fixtures.clients import create_client
 from tests.fixtures.websockets import WebSocketRecorder
 
@@ -150,6 +154,75 @@ class TestWebSocketRelay:
             )
 
 
+    async def test_websocket_relays_embedded_message(
+        self,
+        alice_websocket: AsyncWebSocketSession,
+        bob_client: AsyncClient,
+        bob_new_loan_request_for_alice_new_item: LoanRequestRead,
+    ):
+        """The relayed message is the one returned to the sender."""
+        chat_id = bob_new_loan_request_for_alice_new_item.chat_id
+
+        # drain pending messages from fixture setup
+        try:
+            while True:
+                await alice_websocket.receive_text(timeout=0.5)
+        except TimeoutError:
+            pass
+
+        recorder = WebSocketRecorder(alice_websocket)
+        async with recorder:
+            resp = await bob_client.post(
+                f"/api/v1/me/chats/{chat_id}/messages",
+                json={"text": "embedded"},
+            )
+            resp.raise_for_status()
+
+        sent = ChatMessageRead.model_validate(resp.json())
+        assert [
+            msg.message
+            for msg in recorder.messages
+            if isinstance(msg, WebSocketMessageNewChatMessage)
+        ] == [sent]
+
+    async def test_websocket_relays_message_without_embedded_message(
+        self,
+        alice: UserPrivateRead,
+        alice_websocket: AsyncWebSocketSession,
+        bob_client: AsyncClient,
+        bob_new_loan_request_for_alice_new_item: LoanRequestRead,
+    ):
+        """A notification carrying only the message id is still relayed."""
+        chat_id = bob_new_loan_request_for_alice_new_item.chat_id
+
+        resp = await bob_client.post(
+            f"/api/v1/me/chats/{chat_id}/messages",
+            json={"text": "not embedded"},
+        )
+        resp.raise_for_status()
+        sent = ChatMessageRead.model_validate(resp.json())
+
+        # drain pending messages
+        try:
+            while True:
+                await alice_websocket.receive_text(timeout=0.5)
+        except TimeoutError:
+            pass
+
+        recorder = WebSocketRecorder(alice_websocket)
+        async with recorder:
+            await notify_user(
+                get_broadcast(),
+                alice.id,
+                PubsubMessageNewChatMessage(chat_message_id=sent.id),
+            )
+
+        assert [
+            msg.message
+            for msg in recorder.messages
+            if isinstance(msg, WebSocketMessageNewChatMessage)
+        ] == [sent]
+
 @pytest.mark.usefixtures("items")
 class TestWebSocketIsolation:
     """Test WebSocket channel isolation."""
@@ -197,3 +270,108 @@ class TestWebSocketIsolation:
             f"Bob should not receive messages, got: "
             f"{[type(m).__name__ for m in recorder_bob.messages]}"
         )
+
+
+class TestWebSocketReplay:
+    """Test the replay of the events missed while disconnected."""
+
+    async def test_websocket_replays_missed_events(
+        self,
+        alice_client: AsyncClient,
+        bob_client: AsyncClient,
+        bob_new_loan_request_for_alice_new_item: LoanRequestRead,
+    ):
+        """Events published while disconnected are sent on reconnection."""
+        chat_id = bob_new_loan_request_for_alice_new_item.chat_id
+
+        websocket: AsyncWebSocketSession
+        async with aconnect_ws("/api/v1/me/websocket", alice_client) as websocket:
+            recorder = WebSocketRecorder(websocket, timeout=1)
+            async with recorder:
+                resp = await bob_client.post(
+                    f"/api/v1/me/chats/{chat_id}/messages",
+                    json={"text": "before disconnection"},
+                )
+                resp.raise_for_status()
+
+        last_event_id = recorder.messages[-1].event_id
+        assert last_event_id is not None
+
+        resp = await bob_client.post(
+            f"/api/v1/me/chats/{chat_id}/messages",
+            json={"text": "while disconnected"},
+        )
+        resp.raise_for_status()
+        missed = ChatMessageRead.model_validate(resp.json())
+
+        async with aconnect_ws(
+            f"/api/v1/me/websocket?last_event_id={last_event_id}",
+            alice_client,
+        ) as websocket:
+            recorder = WebSocketRecorder(websocket, timeout=1)
+            async with recorder:
+                pass
+
+        assert [
+            msg.message
+            for msg in recorder.messages
+            if isinstance(msg, WebSocketMessageNewChatMessage)
+        ] == [missed]
+        assert all(msg.event_id != last_event_id for msg in recorder.messages)
+
+    async def test_websocket_unknown_last_event_id(
+        self,
+        alice_client: AsyncClient,
+        bob_client: AsyncClient,
+        bob_new_loan_request_for_alice_new_item: LoanRequestRead,
+    ):
+        """Events following an event no longer logged are reported as lost."""
+        chat_id = bob_new_loan_request_for_alice_new_item.chat_id
+
+        resp = await bob_client.post(
+            f"/api/v1/me/chats/{chat_id}/messages",
+            json={"text": "logged"},
+        )
+        resp.raise_for_status()
+
+        websocket: AsyncWebSocketSession
+        async with aconnect_ws(
+            "/api/v1/me/websocket?last_event_id=1-0",
+            alice_client,
+        ) as websocket:
+            recorder = WebSocketRecorder(websocket, timeout=1)
+            async with recorder:
+                pass
+
+        assert [type(msg) for msg in recorder.messages] == [WebSocketMessageEventsLost]
+
+    async def test_websocket_expired_event_log(
+        self,
+        alice_client: AsyncClient,
+    ):
+        """No events are reported lost if no event was logged in the meantime."""
+
+        # alice has no logged event, as if her log expired
+        websocket: AsyncWebSocketSession
+        async with aconnect_ws(
+            "/api/v1/me/websocket?last_event_id=1-0",
+            alice_client,
+        ) as websocket:
+            recorder = WebSocketRecorder(websocket, timeout=1)
+            async with recorder:
+                pass
+
+        assert recorder.messages == []
+
+    async def test_websocket_malformed_last_event_id(
+        self,
+        alice_client: AsyncClient,
+    ):
+        """Connection with a malformed event id should be rejected."""
+
+        with pytest.raises(WebSocketUpgradeError):
+            async with aconnect_ws(
+                "/api/v1/me/websocket?last_event_id=latest",
+                alice_client,
+            ):
+                pass
@@ -5,16 +5,24 @@ const BASE_RECONNECT_DELAY_MS = 1_000;
 export type WebSocketMessageTypes = {
 	new_chat_message: {
 		type: "new_chat_message";
+		event_id: string | null;
 		message: ChatMessage;
 	};
 	updated_chat_message: {
 		type: "updated_chat_message";
+		event_id: string | null;
 		message: ChatMessage;
 	};
 	updated_account_validation: {
 		type: "updated_account_validation";
+		event_id: string | null;
 		validated: boolean;
 	};
+	// events missed while disconnected cannot be replayed
+	events_lost: {
+		type: "events_lost";
+		event_id: null;
+	};
 };
 
 type ConnectionState = "connected" | "disconnected" | "reconnecting";
@@ -24,13 +32,25 @@ const connectionState = ref<ConnectionState>("disconnected");
 const reconnectGeneration = ref(0);
 let reconnectTimer: ReturnType<typeof setTimeout> | undefined;
 let reconnectAttempt = 0;
+// id of the last received event, events following it are replayed on reconnect
+let lastEventId: string | undefined;
 
 function createWebSocket(): WebSocket {
 	const loc = window.location;
 	const proto = loc.protocol === "https:" ? "wss:" : "ws:";
-	const url = `${proto}//${loc.host}${WEBSOCKET_PATH}`;
+	const query = lastEventId
+		? `?last_event_id=${encodeURIComponent(lastEventId)}`
+		: "";
+	const url = `${proto}//${loc.host}${WEBSOCKET_PATH}${query}`;
 	const ws = new WebSocket(url);
 
+	ws.addEventListener("message", (event: MessageEvent) => {
+		const { type, event_id } = JSON.parse(event.data);
+		if (event_id) lastEventId = event_id;
+		// lost events are refetched, replay restarts from the next event
+		else if (type === "events_lost") lastEventId = undefined;
+	});
+
 	ws.addEventListener("open", () => {
 		connectionState.value = "connected";
 		reconnectAttempt = 0;
@@ -78,6 +98,7 @@ const websocketRefCounter = new RefCounter<WebSocket>(
 		clearTimeout(reconnectTimer);
 		reconnectTimer = undefined;
 		reconnectAttempt = 0;
+		lastEventId = undefined;
 		ws.close();
 		connectionState.value = "disconnected";
 	},